@@ -10,6 +10,8 @@ in various modules.
 
 # 2019-12-?? tc Initial
 # 2019-12-03 tc Added ExcBadStrToConvert
+# 2026-10-18 tc Added solution engines
+# 2026-10-18 tc Added ExcMultipleSolutions
 
 import math
 
@@ -27,6 +29,12 @@ RCB_TYPE_BLK = 2
 ALL_RCB_TYPES = (RCB_TYPE_ROW, RCB_TYPE_COL, RCB_TYPE_BLK)
 RCB_NAME  =     ("row",        "col",       "blk"        ) # indexed by rcb_type_X
 
+# Solution engines, i.e. how Board.solve() goes about it
+ENGINE_SEARCH = "search" # deduction, then depth first search when stuck
+ENGINE_DLX    = "dlx"    # Knuth's Dancing Links exact cover. See dlx.py
+
+ALL_ENGINES = (ENGINE_SEARCH, ENGINE_DLX)
+
 # Exceptions we can toss
 # The general approach is to raise an exception if the error is a result of user input.
 # Otherwise, we assert things to perform sanity checks
@@ -35,6 +43,11 @@ class ExcUnsolvable(Exception) :
         self.message="Puzzle is NOT solvable"
 
 
+class ExcMultipleSolutions(Exception) :
+    def __init__(self) :
+        self.message="Puzzle has more than one solution"
+
+
 class ExcBadPuzzleInput(Exception) :
     ''' Something wrong with puzzle given to be solved.
     Raiser should pass in error msg to contructor
@@ -0,0 +1,302 @@
+#!/usr/bin/env python3
+# dinkum/sudoku/batch.py
+''' Solves lots of sudoku puzzles at once with numpy.
+
+K puzzles are held as a K x NUM_CELLS numpy array of uint16
+possible value bitmasks (see dinkum.sudoku.bitmask).  Naked singles
+and hidden singles are run on every board at the same time with
+numpy operations, there is no per-cell python code in the loop.
+
+Easy and medium puzzles are finished by this propagation alone.
+batch_solve() hands the rest to the scalar Board.solve().
+
+numpy is an optional dependency.  This module imports without it,
+but the batch_xxx() functions need it.  Check have_numpy().
+
+Some useful functions:
+    have_numpy()               True if numpy is installed
+    lines_to_values(lines)     81 char strings ==> K x NUM_CELLS values
+    batch_propagate(values)    singles on every board ==> (masks, status)
+    masks_to_board(masks[k])   Board of board k, with what propagation ruled out
+    batch_solve(values)        propagate, then search ==> (solutions, status)
+
+status is one of:
+    BATCH_SOLVED      Every cell solved
+    BATCH_UNSOLVABLE  Found a contradiction
+    BATCH_UNFINISHED  Propagation ran out of singles
+'''
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc index arrays come from dinkum.sudoku.geometry
+# 2026-10-18 tc batch_solve() Boards share a StrategyScheduler
+# 2026-10-18 tc Added masks_to_board(), batch_solve() Boards keep what propagation ruled out
+
+try :
+    import numpy as np
+except ImportError :
+    np = None  # batch_xxx() will assert, see have_numpy()
+
+from dinkum.sudoku         import * # All package wide def's
+from dinkum.sudoku.bitmask import *
+from dinkum.sudoku.board   import Board, BoardState
+from dinkum.sudoku.geometry import UNIT_CELLS, CELL_UNITS
+from dinkum.sudoku.strategies import StrategyScheduler
+
+# What batch_propagate() says about each board
+BATCH_SOLVED     = 0
+BATCH_UNSOLVABLE = 1
+BATCH_UNFINISHED = 2
+
+
+def have_numpy() :
+    ''' Returns True if numpy is available, i.e. the batch functions work '''
+    return np is not None
+
+
+if np is not None :
+    # The board layout as numpy index arrays. See dinkum.sudoku.geometry
+    #    _unit_cells  [unit_num][idx] ==> cell_num of idx'th cell in unit
+    #    _cell_units  [cell_num]      ==> the 3 unit_nums cell is in
+    _unit_cells = np.array(UNIT_CELLS, dtype=np.intp)
+    _cell_units = np.array(CELL_UNITS, dtype=np.intp)
+
+    # bitmask tables as numpy lookups, indexed by mask
+    _np_popcount   = np.array( [ popcount(m) for m in range(ALL_VALUES_MASK+1) ], dtype=np.uint8)
+    _np_sole_value = np.array( [ sole_value(m) if is_single_value(m) else 0
+                                 for m in range(ALL_VALUES_MASK+1) ], dtype=np.uint8)
+
+
+def lines_to_values(lines) :
+    ''' Converts iterable of lines, each NUM_CELLS chars of 1-9 in raster
+    order with . or 0 as blanks, into a K x NUM_CELLS numpy array of values.
+    0 is an unsolved cell.
+
+    raises ExcBadPuzzleInput on any line of the wrong length or with
+    any other char.
+    '''
+    assert have_numpy(), "batch functions require numpy"
+
+    lines = list(lines)
+    text  = ''.join(lines).replace('.', '0').encode('ascii', 'replace')
+    if any( len(line) != NUM_CELLS for line in lines ) :
+        raise ExcBadPuzzleInput( "Every line must be %d chars" % NUM_CELLS)
+
+    values = np.frombuffer(text, dtype=np.uint8).reshape(len(lines), NUM_CELLS) - ord('0')
+    if (values > RCB_SIZE).any() :   # uint8, so below '0' wraps above RCB_SIZE
+        raise ExcBadPuzzleInput( "Only . and 0 thru %d allowed" % RCB_SIZE)
+
+    return values
+
+
+def batch_propagate(values) :
+    ''' Runs naked singles and hidden singles on every board in values,
+    a K x NUM_CELLS array-like of cell values (0 is unsolved), until no
+    board changes.
+
+    Returns tuple:
+        masks   K x NUM_CELLS uint16 array of possible values bitmasks.
+                Solved cells have a single value mask.
+        status  K array of BATCH_SOLVED/UNSOLVABLE/UNFINISHED
+    '''
+    assert have_numpy(), "batch functions require numpy"
+
+    values = np.asarray(values, dtype=np.uint16).reshape(-1, NUM_CELLS)
+    masks  = np.where(values != 0, np.left_shift(1, values, dtype=np.uint16), ALL_VALUES_MASK).astype(np.uint16)
+    bad    = np.zeros(len(masks), dtype=bool)  # contradiction found
+
+    while True :
+        last_masks = masks
+
+        # Values solved in each unit.  If the single masks in a unit
+        # sum to more than they or to, a value is duplicated
+        singles       = np.where(_np_popcount[masks] == 1, masks, 0)
+        unit_singles  = singles[:, _unit_cells]                       # K x units x RCB_SIZE
+        unit_solved   = np.bitwise_or.reduce(unit_singles, axis=2)
+        bad          |= (unit_singles.sum(axis=2, dtype=np.uint32) != unit_solved).any(axis=1)
+
+        # Naked singles: solved values leave the possibles of their peers
+        peer_solved = np.bitwise_or.reduce(unit_solved[:, _cell_units], axis=2)
+        masks       = np.where(singles != 0, masks, masks & ~peer_solved)
+
+        # Hidden singles: a value only one cell in a unit can provide.
+        unit_masks = masks[:, _unit_cells]
+        seen_once  = np.zeros(unit_masks.shape[:2], dtype=np.uint16)
+        seen_more  = np.zeros_like(seen_once)
+        for idx in range(RCB_SIZE) :
+            seen_more |= seen_once & unit_masks[:, :, idx]
+            seen_once |= unit_masks[:, :, idx]
+
+        # Every value must be provided somewhere in a unit
+        bad |= (seen_once != ALL_VALUES_MASK).any(axis=1)
+
+        hidden      = seen_once & ~seen_more
+        cell_hidden = np.bitwise_or.reduce(hidden[:, _cell_units], axis=2) & masks
+        masks       = np.where(cell_hidden != 0, cell_hidden, masks)
+
+        # A cell with no possibles, or that must be 2 hidden values
+        # at once, means no solution
+        num_possibles = _np_popcount[masks]
+        bad |= (num_possibles == 0).any(axis=1)
+        bad |= (_np_popcount[cell_hidden] > 1).any(axis=1)
+
+        # Anything change?  Only boards still in play count
+        if np.array_equal(masks[~bad], last_masks[~bad]) :
+            break
+
+    # Tell um how each board did
+    status = np.where( (num_possibles == 1).all(axis=1), BATCH_SOLVED, BATCH_UNFINISHED)
+    status[bad] = BATCH_UNSOLVABLE
+    return (masks, status)
+
+
+def masks_to_cell_values(masks) :
+    ''' Returns K x NUM_CELLS uint8 array of the values of masks,
+    as returned by batch_propagate().  Unsolved cells are 0.
+    '''
+    assert have_numpy(), "batch functions require numpy"
+    return _np_sole_value[masks]
+
+
+def masks_to_board(masks, name=None, desc="") :
+    ''' Returns a Board of one board's NUM_CELLS masks, i.e. a row of
+    what batch_propagate() returns.  It's possibles are the masks, so
+    what propagation ruled out isn't found again.
+    '''
+    assert have_numpy(), "batch functions require numpy"
+    masks  = np.asarray(masks, dtype=np.uint16)
+    values = _np_sole_value[masks]
+    masks  = np.where(values != 0, 0, masks).astype(np.uint16)  # Solved cells have no possibles
+    return Board( BoardState( values.tobytes(), masks.tobytes() ), name, desc )
+
+
+def batch_solve(values, engine=ENGINE_SEARCH) :
+    ''' Solves every board in values, a K x NUM_CELLS array-like of
+    cell values (0 is unsolved).
+
+    batch_propagate() does what it can.  Each board it couldn't
+    finish is handed to Board.solve(engine), with the possibles
+    propagation left it.  Those Boards share
+    a StrategyScheduler, so they all profit from what it learns.
+
+    Returns tuple:
+        solutions  K x NUM_CELLS uint8 array of solved values.
+                   A row of 0's if the board is unsolvable.
+        status     K array of BATCH_SOLVED or BATCH_UNSOLVABLE
+    '''
+    (masks, status) = batch_propagate(values)
+    solutions = masks_to_cell_values(masks)
+
+    # Let a Board search for what's left
+    scheduler = StrategyScheduler()
+    for board_num in np.flatnonzero(status == BATCH_UNFINISHED) :
+        board = masks_to_board(masks[board_num], "batch-%d" % board_num)
+        board.scheduler = scheduler
+        if board.solve(engine) :
+            solutions[board_num] = [ cell.value for cell in board.cells ]
+            status[board_num]    = BATCH_SOLVED
+        else :
+            status[board_num]    = BATCH_UNSOLVABLE
+
+    solutions[status == BATCH_UNSOLVABLE] = 0
+    return (solutions, status)
+
+
+# Test code
+import unittest
+
+@unittest.skipUnless(have_numpy(), "numpy not installed")
+class Test_batch(unittest.TestCase):
+
+    # globe_mon_2019_12_02, Solvable by singles
+    easy     = "..16.54...28...76.....8....6..8.4..5.72...94.1..2.9..8....5.....57...31...91.62.."
+    easy_ans = "731695482528413769964782531693874125872561943145239678216357894457928316389146257"
+
+    # kato, needs more than singles
+    kato     = "..61....8.8..9..3.2....54..4....18...3..7..4...79....3..84....6.2..5..8.1....25.."
+    kato_ans = "346127958785694132219385467462531879931278645857946213598413726624759381173862594"
+
+    # Needs a search
+    hard = "8..........36......7..9.2...5...7.......457.....1...3...1....68..85...1..9....4.."
+
+    # Nothing is in conflict at the start, but no solution
+    no_soln = "..61..7.8.8..9..3.2....54..4....18...3..7..4...79....3..84....6.2..5..8.1....25.."
+
+    # Duplicated given
+    dup = "116100008080090030200005400400001800030070040007900003008400006020050080100002500"
+
+    def test_geometry(self) :
+        self.assertEqual( _unit_cells.shape, (len(ALL_RCB_TYPES) * RCB_SIZE, RCB_SIZE) )
+        self.assertEqual( _cell_units.shape, (NUM_CELLS, len(ALL_RCB_TYPES)) )
+
+        # Every cell is in its units
+        for cell_num in range(NUM_CELLS) :
+            for unit_num in _cell_units[cell_num] :
+                self.assertIn( cell_num, _unit_cells[unit_num] )
+
+        # row 0, col 0 and blk 0
+        self.assertEqual( list(_unit_cells[0]),            list(range(RCB_SIZE)) )
+        self.assertEqual( list(_unit_cells[RCB_SIZE]),     list(range(0, NUM_CELLS, RCB_SIZE)) )
+        self.assertEqual( list(_unit_cells[2*RCB_SIZE]),   [0,1,2, 9,10,11, 18,19,20] )
+
+    def test_lines_to_values(self) :
+        values = lines_to_values( [self.kato, self.kato_ans] )
+        self.assertEqual( values.shape, (2, NUM_CELLS) )
+        self.assertEqual( values[0][:4].tolist(), [0,0,6,1] )
+        self.assertEqual( ''.join(map(str, values[1])), self.kato_ans )
+
+        with self.assertRaises(ExcBadPuzzleInput) :
+            lines_to_values( [ self.kato[:-1] ] )
+        with self.assertRaises(ExcBadPuzzleInput) :
+            lines_to_values( [ self.kato.replace('.', 'x') ] )
+
+    def test_propagate(self) :
+        values = lines_to_values( [self.easy, self.kato, self.kato_ans, self.dup, self.no_soln] )
+        (masks, status) = batch_propagate(values)
+
+        # no_soln takes a search to see
+        self.assertEqual( status.tolist(), [ BATCH_SOLVED, BATCH_UNFINISHED, BATCH_SOLVED,
+                                             BATCH_UNSOLVABLE, BATCH_UNFINISHED ] )
+        self.assertEqual( ''.join(map(str, masks_to_cell_values(masks)[0])), self.easy_ans )
+
+        # An unfinished board never rules out more than a Board deduces.
+        # Board knows more techniques, so it may rule out less
+        board = Board( values[1].reshape(RCB_SIZE, RCB_SIZE).tolist() )
+        board.solve_by_deduction()
+        for (mask, cell) in zip(masks[1].tolist(), board.cells) :
+            board_mask = cell.possibles_mask or value_to_mask(cell.value)
+            self.assertEqual( mask & board_mask, board_mask )
+
+        # A Board of it keeps what was ruled out
+        board = masks_to_board(masks[1], "kato")
+        self.assertEqual( board.name, "kato" )
+        self.assertEqual( [ cell.value for cell in board.cells ], masks_to_cell_values(masks)[1].tolist() )
+        for (mask, cell) in zip(masks[1].tolist(), board.cells) :
+            self.assertEqual( cell.possibles_mask, 0 if cell.value else mask )
+        self.assertLess( sum( [ popcount(cell.possibles_mask) for cell in board.cells ] ),
+                         sum( [ popcount(cell.possibles_mask) for cell in Board(self.kato.replace('.', '0')).cells ] ) )
+        board.sanity_check()
+
+    def test_solve(self) :
+        values = lines_to_values( [self.hard, self.kato, self.no_soln, self.easy, self.dup] )
+        (solutions, status) = batch_solve(values)
+        self.assertEqual( status.tolist(), [ BATCH_SOLVED, BATCH_SOLVED, BATCH_UNSOLVABLE,
+                                             BATCH_SOLVED, BATCH_UNSOLVABLE ] )
+        self.assertEqual( ''.join(map(str, solutions[1])), self.kato_ans )
+        self.assertEqual( ''.join(map(str, solutions[3])), self.easy_ans )
+        self.assertFalse( solutions[2].any() )
+        self.assertFalse( solutions[4].any() )
+
+        # Same answer as a Board
+        board = Board( values[0].reshape(RCB_SIZE, RCB_SIZE).tolist() )
+        board.solve()
+        self.assertEqual( solutions[0].tolist(), [ cell.value for cell in board.cells ] )
+
+    def test_empty_batch(self) :
+        (solutions, status) = batch_solve( np.zeros( (0, NUM_CELLS), dtype=np.uint8) )
+        self.assertEqual( len(solutions), 0 )
+        self.assertEqual( len(status), 0 )
+
+
+if __name__ == "__main__" :
+    # Run the unittests
+    unittest.main()
@@ -0,0 +1,307 @@
+#!/usr/bin/env python3
+# dinkum/sudoku/benchmark.py
+''' Benchmarks Board() construction and Board.solve(), and
+compares benchmarks to tell if the solver got slower.
+
+run_benchmark() times every puzzle with every engine.  For each it
+does num_warmup untimed runs, then num_samples timed runs.  A run is:
+    construct    Board(puzzle spec)
+    solve        Board.solve(engine) of that Board
+Each is timed on it's own with time.perf_counter(), with the garbage
+collector off, so a collection doesn't land on some random sample.
+
+It returns a {} that json.dump() can write:
+    { "format":  BENCHMARK_FORMAT,
+      "python":  python version,  "platform": platform.platform(),
+      "num_warmup": .., "num_samples": ..,
+      "results": { puzzle name: { engine: { "construct": Summary dict,
+                                            "solve":     Summary dict } } } }
+A Summary has the samples (secs) and their n, mean, median, p95,
+stddev and min.
+
+compare() checks a benchmark against a baseline one.  A phase of a
+puzzle/engine is a regression if it's median went up by more than
+min_change (a fraction) AND a two sided Mann-Whitney U test of the
+samples says that's unlikely to be chance, i.e. it's p value is less
+than alpha.  The U test only looks at the ranks of the samples, so the
+odd slow sample from the OS doesn't throw it off like it would a t test.
+Improvements are found the same way.
+
+Some useful functions:
+    run_benchmark(puzzles, engines)  ==> benchmark {}
+    compare(baseline, benchmark)     ==> [] of Comparison
+    summarize(samples)               ==> Summary
+    mann_whitney_p(xs, ys)           ==> p value that xs and ys differ
+'''
+
+# 2026-10-18 tc Initial
+
+from dinkum.sudoku       import * # All package wide def's
+from dinkum.sudoku.board import Board
+
+import collections
+import gc
+import math
+import platform
+import time
+
+# Bumped if what run_benchmark() returns changes
+BENCHMARK_FORMAT = 1
+
+# What's timed
+PHASE_CONSTRUCT = "construct"
+PHASE_SOLVE     = "solve"
+ALL_PHASES      = (PHASE_CONSTRUCT, PHASE_SOLVE)
+
+# What compare() decides
+VERDICT_SAME        = "same"
+VERDICT_REGRESSION  = "regression"
+VERDICT_IMPROVEMENT = "improvement"
+
+
+class Summary(collections.namedtuple('Summary', 'n mean median p95 stddev min samples')) :
+    ''' Statistics of timing samples in secs, see summarize() '''
+    __slots__ = ()
+
+    def to_dict(self) :
+        ''' Returns us as a {} for json '''
+        return self._asdict()
+
+    @classmethod
+    def from_dict(cls, summary_dict) :
+        ''' Returns the Summary to_dict() made summary_dict from '''
+        return summarize(summary_dict["samples"])
+
+
+class Comparison(collections.namedtuple('Comparison',
+                                        'puzzle_name engine phase baseline_median median change p_value verdict')) :
+    ''' What compare() returns for each puzzle/engine/phase:
+        change   fractional change in median, e.g. 0.10 is 10% slower
+        p_value  of the Mann-Whitney U test of the samples
+        verdict  one of VERDICT_*
+    '''
+    __slots__ = ()
+
+    def __str__(self) :
+        ''' e.g. "kato_puzzle search solve 1234.5 usecs (+12.3%, p=0.0001) regression" '''
+        return "%s %s %s %.1f usecs (%+.1f%%, p=%.4f) %s" % (
+            self.puzzle_name, self.engine, self.phase, self.median * 1.0e6,
+            self.change * 100.0, self.p_value, self.verdict)
+
+
+def percentile(sorted_samples, fraction) :
+    ''' Returns the fraction (0.0 to 1.0) percentile of sorted_samples,
+    interpolating between the two closest ones.
+    '''
+    assert sorted_samples, "No samples"
+    position = (len(sorted_samples) - 1) * fraction
+    below = int(math.floor(position))
+    above = min(below + 1, len(sorted_samples) - 1)
+    return sorted_samples[below] + (sorted_samples[above] - sorted_samples[below]) * (position - below)
+
+
+def summarize(samples) :
+    ''' Returns the Summary of [] of samples, which can't be empty '''
+    samples = list(samples)
+    ordered = sorted(samples)
+    n       = len(samples)
+    mean    = sum(samples) / n
+    stddev  = math.sqrt( sum( [ (sample - mean) ** 2 for sample in samples ] ) / (n - 1) ) if n > 1 else 0.0
+    return Summary(n, mean, percentile(ordered, 0.5), percentile(ordered, 0.95),
+                   stddev, ordered[0], samples)
+
+
+def mann_whitney_p(xs, ys) :
+    ''' Returns the two sided p value of the Mann-Whitney U test that
+    samples xs and ys come from the same distribution.  Small means
+    they probably don't.
+
+    Uses the normal approximation with tie and continuity corrections,
+    good enough for more than about 8 samples each.
+    '''
+    (n1, n2) = (len(xs), len(ys))
+    n = n1 + n2
+    if not n1 or not n2 :
+        return 1.0
+
+    # Rank everything together, ties get the average rank
+    combined = sorted( [ (x, 0) for x in xs ] + [ (y, 1) for y in ys ] )
+    rank_sum_xs = 0.0
+    tie_total   = 0   # sum of t**3 - t over groups of t ties
+    start = 0
+    while start < n :
+        end = start
+        while end + 1 < n and combined[end + 1][0] == combined[start][0] :
+            end += 1
+        num_tied = end - start + 1
+        rank = (start + end) / 2.0 + 1
+        rank_sum_xs += rank * sum( [ 1 for (value, which) in combined[start:end+1] if which == 0 ] )
+        tie_total   += num_tied ** 3 - num_tied
+        start = end + 1
+
+    u    = rank_sum_xs - n1 * (n1 + 1) / 2.0
+    mean = n1 * n2 / 2.0
+    variance = n1 * n2 / 12.0 * ( (n + 1) - tie_total / float(n * (n - 1)) )
+    if variance <= 0 :
+        return 1.0   # Everything is the same
+
+    z = max( abs(u - mean) - 0.5, 0.0 ) / math.sqrt(variance)
+    return math.erfc( z / math.sqrt(2.0) )
+
+
+def time_puzzle(puzzle_spec, engine, num_warmup=3, num_samples=30) :
+    ''' Returns {} key: PHASE_*  value: [] of num_samples secs
+    it took to construct a Board from puzzle_spec and solve it with
+    engine.  Does num_warmup runs first which aren't timed.
+    '''
+    samples = dict( [ (phase, []) for phase in ALL_PHASES ] )
+    gc_was_enabled = gc.isenabled()
+    gc.collect()
+    gc.disable()
+    try :
+        for run_num in range(num_warmup + num_samples) :
+            start_time = time.perf_counter()
+            board = Board(puzzle_spec)
+            constructed_time = time.perf_counter()
+            board.solve(engine)
+            solved_time = time.perf_counter()
+
+            if run_num >= num_warmup :
+                samples[PHASE_CONSTRUCT].append(constructed_time - start_time)
+                samples[PHASE_SOLVE    ].append(solved_time - constructed_time)
+    finally :
+        if gc_was_enabled :
+            gc.enable()
+
+    return samples
+
+
+def run_benchmark(puzzles, engines=ALL_ENGINES, num_warmup=3, num_samples=30, progress=None) :
+    ''' Returns a benchmark {} of timing every puzzle with every engine.
+    See module doc.
+
+    puzzles is an iterable of (name, puzzle spec), anything Board() takes.
+    progress, if not None, is called with (name, engine) before each.
+    '''
+    assert num_samples >= 1, "Need at least 1 sample"
+
+    results = collections.OrderedDict()
+    for (name, puzzle_spec) in puzzles :
+        results[name] = collections.OrderedDict()
+        for engine in engines :
+            if progress :
+                progress(name, engine)
+            samples = time_puzzle(puzzle_spec, engine, num_warmup, num_samples)
+            results[name][engine] = collections.OrderedDict(
+                [ (phase, summarize(samples[phase]).to_dict()) for phase in ALL_PHASES ] )
+
+    return collections.OrderedDict( [ ("format",      BENCHMARK_FORMAT),
+                                      ("python",      platform.python_version()),
+                                      ("platform",    platform.platform()),
+                                      ("num_warmup",  num_warmup),
+                                      ("num_samples", num_samples),
+                                      ("results",     results) ] )
+
+
+def compare(baseline, benchmark, alpha=0.01, min_change=0.10) :
+    ''' Returns [] of Comparison of every puzzle/engine/phase in both
+    benchmark {}'s, baseline and benchmark.  See module doc for
+    alpha and min_change.
+    '''
+    comparisons = []
+    for (name, engines) in benchmark["results"].items() :
+        for (engine, phases) in engines.items() :
+            for (phase, summary_dict) in phases.items() :
+                try :
+                    baseline_dict = baseline["results"][name][engine][phase]
+                except KeyError :
+                    continue  # Nothing to compare to
+
+                before = Summary.from_dict(baseline_dict)
+                after  = Summary.from_dict(summary_dict)
+                change  = (after.median - before.median) / before.median if before.median else 0.0
+                p_value = mann_whitney_p(before.samples, after.samples)
+
+                verdict = VERDICT_SAME
+                if p_value < alpha and abs(change) > min_change :
+                    verdict = VERDICT_REGRESSION if change > 0 else VERDICT_IMPROVEMENT
+
+                comparisons.append( Comparison(name, engine, phase, before.median, after.median,
+                                               change, p_value, verdict) )
+    return comparisons
+
+
+# Test code
+import unittest
+import json
+import random
+
+class Test_benchmark(unittest.TestCase):
+
+    def test_summarize(self) :
+        summary = summarize( [3.0, 1.0, 2.0, 4.0, 100.0] )
+        self.assertEqual( summary.n,      5 )
+        self.assertEqual( summary.median, 3.0 )
+        self.assertEqual( summary.min,    1.0 )
+        self.assertEqual( summary.mean,   22.0 )
+        self.assertAlmostEqual( summary.p95, 80.8 )
+        self.assertAlmostEqual( summary.stddev, math.sqrt( (19**2 + 21**2 + 20**2 + 18**2 + 78**2) / 4.0 ) )
+        self.assertEqual( summary.samples, [3.0, 1.0, 2.0, 4.0, 100.0] )
+        self.assertEqual( Summary.from_dict( summary.to_dict() ), summary )
+        self.assertEqual( summarize( [7.0] ).stddev, 0.0 )
+
+    def test_mann_whitney(self) :
+        rng = random.Random(1)
+        same_xs = [ rng.gauss(1.0, 0.1) for i in range(30) ]
+        same_ys = [ rng.gauss(1.0, 0.1) for i in range(30) ]
+        slower  = [ rng.gauss(1.2, 0.1) for i in range(30) ]
+        self.assertGreater( mann_whitney_p(same_xs, same_ys), 0.01 )
+        self.assertLess   ( mann_whitney_p(same_xs, slower ), 0.001 )
+        self.assertEqual  ( mann_whitney_p([1.0] * 10, [1.0] * 10), 1.0 )
+
+        # Worked by hand: U=1, z=(10-1-0.5)/sqrt(4*5/12*10)
+        self.assertAlmostEqual( mann_whitney_p([1, 2, 3, 4], [3.5, 5, 6, 7, 8]), 0.0373, places=4 )
+        # With 3 pairs of ties: U=3, variance 30/12*(12 - 18/110)
+        self.assertAlmostEqual( mann_whitney_p([1, 2, 3, 4, 5], [3, 5, 6, 7, 8, 8]), 0.0345, places=4 )
+
+        # An outlier doesn't matter much
+        self.assertGreater( mann_whitney_p(same_xs, same_ys[:-1] + [1000.0]), 0.01 )
+
+    def test_run_and_compare(self) :
+        import dinkum.sudoku.board
+        puzzles = [ ("kato", dinkum.sudoku.board.Test_board.kato_spec_lrl) ]
+        benchmark = run_benchmark(puzzles, ALL_ENGINES, num_warmup=1, num_samples=5)
+        benchmark = json.loads( json.dumps(benchmark) )  # Survives json
+
+        self.assertEqual( benchmark["format"], BENCHMARK_FORMAT )
+        for engine in ALL_ENGINES :
+            for phase in ALL_PHASES :
+                summary = Summary.from_dict( benchmark["results"]["kato"][engine][phase] )
+                self.assertEqual( summary.n, 5 )
+                self.assertGreater( summary.min, 0.0 )
+
+        # Against itself, nothing changed
+        comparisons = compare(benchmark, benchmark)
+        self.assertEqual( len(comparisons), len(ALL_ENGINES) * len(ALL_PHASES) )
+        self.assertEqual( set( [ c.verdict for c in comparisons ] ), set( [VERDICT_SAME] ) )
+
+        # Twice as slow is a regression, twice as fast an improvement
+        slower = json.loads( json.dumps(benchmark) )
+        summary_dict = slower["results"]["kato"][ENGINE_DLX][PHASE_SOLVE]
+        slower["results"]["kato"][ENGINE_DLX][PHASE_SOLVE] = summarize(
+            [ 2 * (sample + summary_dict["median"]) for sample in summary_dict["samples"] ] ).to_dict()
+        verdicts = dict( [ ((c.engine, c.phase), c.verdict) for c in compare(benchmark, slower, alpha=0.05) ] )
+        self.assertEqual( verdicts[(ENGINE_DLX, PHASE_SOLVE)],    VERDICT_REGRESSION )
+        self.assertEqual( verdicts[(ENGINE_SEARCH, PHASE_SOLVE)], VERDICT_SAME )
+        self.assertEqual( compare(slower, benchmark, alpha=0.05)[ [ (c.engine, c.phase) for c in comparisons ].index(
+                              (ENGINE_DLX, PHASE_SOLVE) ) ].verdict, VERDICT_IMPROVEMENT )
+        self.assertIn( "regression", str( [ c for c in compare(benchmark, slower, alpha=0.05)
+                                            if c.verdict == VERDICT_REGRESSION ][0] ) )
+
+        # Not in the baseline isn't compared
+        self.assertEqual( compare( {"results" : {}}, benchmark ), [] )
+
+
+if __name__ == "__main__" :
+    # Run the unittests
+    unittest.main()
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+#filename: dinkum_sudoku_benchmark.py
+#path: sudoku/bin/
+#repo: http://github.com/dinkumsoftware/dinkum.git
+"""
+Benchmarks Board() construction and Board.solve() on the puzzles
+in module dinkum.sudoku.test_data.test_puzzles whose names are on
+the command line, all of them if none are.  See dinkum.sudoku.benchmark
+
+Each puzzle is run --warmup times untimed, then --num_samples times
+timed with every --engine.  The median, p95 and standard deviation of
+the construction and solve times are printed, and the whole benchmark,
+samples and all, is written as json to --output.
+
+The benchmark is compared to a baseline, by default:
+
+    dinkum/sudoku/test_data/benchmark_baseline.json
+
+A puzzle/engine/phase has regressed if it's median got more than
+--min_change slower, and a Mann-Whitney U test of the samples gives a
+p value below --alpha.  Use --update to make this benchmark the baseline.
+Baselines are only worth comparing on the same machine.
+
+EXIT STATUS
+    0  No regressions
+    1  Something regressed
+    2  Some kind of error on command line
+    3  Some kind of exception thrown
+
+"""
+
+# 2026-10-18 tc Initial
+
+import sys, os, traceback, argparse
+import textwrap    # dedent
+import json
+
+from dinkum.sudoku.test_data.test_puzzles import *
+from dinkum.sudoku.benchmark              import *
+from dinkum.utils.str_utils               import fixed_width_columns
+
+
+# What main() can return
+ret_val_good             = 0
+ret_val_regression       = 1
+ret_val_cmd_line_err     = 2
+ret_val_exception_raised = 3
+
+
+def main ():
+    ''' See module docstring ...
+    Benchmarks all puzzle_names on the cmd line.
+    If none listed, benchmarks them all.
+
+    --warmup       Untimed runs before the samples
+
+    --num_samples  Timed runs of each puzzle
+
+    --output       Where to write the json, - is stdout
+
+    --baseline     json file to compare against
+
+    --update       Write the benchmark to --baseline
+
+    Returns: 0  No regressions
+             1  Something regressed
+             2  Something wrong on cmd line
+    '''
+
+    # Specify and parse the command line arguments
+    parser = argparse.ArgumentParser(
+        # print document string "as is" on --help
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        description=textwrap.dedent(__doc__)
+    )
+
+    parser.add_argument("-w", "--warmup", type=int,
+                        help="Number of untimed runs of each puzzle first",
+                        default=3 )
+
+    parser.add_argument("-n", "--num_samples", type=int,
+                        help="Number of timed runs of each puzzle",
+                        default=30 )
+
+    parser.add_argument("-e", "--engines", nargs='+',
+                        help="Solution engines to benchmark",
+                        choices=ALL_ENGINES,
+                        default=list(ALL_ENGINES) )
+
+    parser.add_argument("-o", "--output",
+                        help="File to write the benchmark json to, - is stdout",
+                        default=None )
+
+    parser.add_argument("-b", "--baseline",
+                        help="Benchmark json to compare against",
+                        default=baseline_filename() )
+
+    parser.add_argument("-u", "--update",
+                        help="Write this benchmark to --baseline",
+                        action="store_true")
+
+    parser.add_argument("--alpha", type=float,
+                        help="Largest p value that's a real change",
+                        default=0.01 )
+
+    parser.add_argument("--min_change", type=float,
+                        help="Smallest fractional change in a median that matters",
+                        default=0.10 )
+
+    # puzzles names, every non-option on the command line
+    parser.add_argument('puzzle_names', metavar="puzzle_name",
+                        help="name(s) of puzzle in dinkum/sudoku/test_data/test_puzzles.py",
+                        nargs='*')
+
+    args = parser.parse_args()
+
+    # A little sanity checking
+    if args.warmup < 0 or args.num_samples < 2 :
+        print ("%s: --warmup must be >= 0 and --num_samples >= 2" % sys.argv[0],
+               file=sys.stderr)
+        return ret_val_cmd_line_err
+
+    puzzle_names = args.puzzle_names or [ sp.name for sp in all_known_puzzles ]
+    for puzzle_name in puzzle_names :
+        if puzzle_name not in all_known_puzzle_names :
+            print ("%s: Unknown puzzle name: %s" % (sys.argv[0], puzzle_name), file=sys.stderr)
+            return ret_val_cmd_line_err
+
+    # Progress goes to stderr, json may be on stdout
+    def progress(name, engine) :
+        print (".", end="", file=sys.stderr) ; sys.stderr.flush()
+
+    benchmark = run_benchmark( [ (name, all_known_puzzle_names[name].input_spec) for name in puzzle_names ],
+                               args.engines, args.warmup, args.num_samples, progress )
+    print (file=sys.stderr)
+
+    # What we measured
+    tokens_to_print = [ [ "puzzle", "engine", "phase", "median", "p95", "stddev" ] ]
+    for (name, engines) in benchmark["results"].items() :
+        for (engine, phases) in engines.items() :
+            for (phase, summary_dict) in phases.items() :
+                summary = Summary.from_dict(summary_dict)
+                tokens_to_print.append( [ name, engine, phase ] +
+                                        [ "%.1f usecs" % (secs * 1.0e6) for secs in
+                                          (summary.median, summary.p95, summary.stddev) ] )
+    for line in fixed_width_columns(tokens_to_print) :
+        print (line, file=sys.stderr)
+
+    if args.output :
+        write_benchmark(benchmark, args.output)
+
+    # How it compares
+    ret_val = ret_val_good
+    baseline = read_benchmark(args.baseline)
+    if baseline is None :
+        print ("\nno baseline benchmark in: %s" % args.baseline, file=sys.stderr)
+        print ("consider --update to write this benchmark there.", file=sys.stderr)
+    else :
+        print ("\ncompared to: %s" % args.baseline, file=sys.stderr)
+        for comparison in compare(baseline, benchmark, args.alpha, args.min_change) :
+            print ("  " + str(comparison), file=sys.stderr)
+            if comparison.verdict == VERDICT_REGRESSION :
+                ret_val = ret_val_regression
+
+    if args.update :
+        write_benchmark(benchmark, args.baseline)
+        print ("\nbenchmark written to: %s" % args.baseline, file=sys.stderr)
+
+    # tell um how it went
+    return ret_val
+
+
+def baseline_filename() :
+    ''' Returns the default --baseline, which lives
+    beside prior_stats_filename()
+    '''
+    return os.path.join( os.path.dirname( prior_stats_filename() ), "benchmark_baseline.json" )
+
+
+def read_benchmark(filename) :
+    ''' Returns the benchmark {} in json file filename,
+    None if there's no such file.
+    '''
+    try :
+        with open(filename) as json_file :
+            return json.load(json_file)
+    except FileNotFoundError :
+        return None
+
+
+def write_benchmark(benchmark, filename) :
+    ''' Writes benchmark {} as json to filename, - is stdout '''
+    if filename == '-' :
+        json.dump(benchmark, sys.stdout, indent=1)
+        sys.stdout.write('\n')
+        sys.stdout.flush()
+    else :
+        with open(filename, "w") as json_file :
+            json.dump(benchmark, json_file, indent=1)
+            json_file.write('\n')
+
+
+if __name__ == '__main__':
+    try:
+        # Invoke the actual program
+        # We pass back to OS whatever it returns
+        main_return = main()
+
+        # Pass back to the OS the proper exit code. 0 is good
+        sys.exit( main_return)
+
+    except KeyboardInterrupt as e: # Ctrl-C
+        raise e
+    except SystemExit as e: # sys.exit()
+        raise e
+    except Exception as e:
+        print ('ERROR: uncaught EXCEPTION. Msg after traceback.')
+        traceback.print_exc()    # stack dump (which prints err msg)
+        os._exit(ret_val_exception_raised)
@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+#filename: dinkum_sudoku_generate.py
+#path: sudoku/bin/
+#repo: http://github.com/dinkumsoftware/dinkum.git
+"""
+Generates sudoku puzzles, each with exactly one solution, using
+multiple worker processes.  See dinkum.sudoku.generator
+
+Output is one line per puzzle, in the format read by
+dinkum_sudoku_solve_batch, i.e. 81 characters in raster order
+with a 0 for each blank cell.  e.g.
+    006100008080090030200005400400001800030070040007900003008400006020050080100002500
+
+With --verbose, each line is followed by the solution, the
+number of clues, and the difficulty (if --difficulty was given):
+    <puzzle> <solution> <num_clues> <difficulty>
+
+The same --seed always makes the same puzzles, no matter
+what --jobs is.
+
+With --difficulty, only puzzles that hard are written.  Ones that
+miss are dropped and more are made.  If --max_misses are dropped
+we give up, with fewer than --num_puzzles written.
+
+EXIT STATUS
+    0  All puzzles generated
+    1  Fewer than --num_puzzles generated
+    2  Some kind of error on command line
+    3  Some kind of exception thrown
+
+"""
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc Added --max_misses.  Don't write puzzles that miss --difficulty
+
+import sys, os, traceback, argparse
+import textwrap    # dedent
+
+from dinkum.sudoku.geometry  import geometry_for_rcb_size
+from dinkum.sudoku.generator import *
+
+
+# What main() can return
+ret_val_good             = 0
+ret_val_some_missed      = 1
+ret_val_cmd_line_err     = 2
+ret_val_exception_raised = 3
+
+
+def main ():
+    ''' See module docstring ...
+    Writes --num_puzzles puzzles to stdout.
+
+    --jobs         Number of worker processes.  Defaults to # of cpus
+                   0 means generate in this process (no workers)
+
+    --seed         Makes the same puzzles every time
+
+    --clues        Most clues we want in a puzzle
+
+    --difficulty   How hard we want them
+
+    --symmetry     Blanks are placed symmetrically
+
+    --max_misses   Most puzzles to drop for missing --difficulty
+
+    Returns: 0  All puzzles generated
+             1  Fewer than --num_puzzles generated
+             2  Something wrong on cmd line
+    '''
+
+    # Specify and parse the command line arguments
+    parser = argparse.ArgumentParser(
+        # print document string "as is" on --help
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        description=textwrap.dedent(__doc__)
+    )
+
+    parser.add_argument("-n", "--num_puzzles", type=int,
+                        help="Number of puzzles to generate",
+                        default=10 )
+
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="Number of worker processes (default: number of cpus)",
+                        default=os.cpu_count() )
+
+    parser.add_argument("-c", "--chunk_size", type=int,
+                        help="Number of puzzles handed to a worker at a time",
+                        default=4 )
+
+    parser.add_argument("-s", "--seed",
+                        help="Random seed",
+                        default="0" )
+
+    parser.add_argument("--clues", type=int,
+                        help="Most clues wanted in a puzzle (default: as few as possible)",
+                        default=None )
+
+    parser.add_argument("-d", "--difficulty",
+                        help="How hard a puzzle to make",
+                        choices=DIFFICULTIES,
+                        default=None )
+
+    parser.add_argument("--symmetry",
+                        help="Place blanks symmetrically",
+                        choices=SYMMETRIES[1:],
+                        default=SYMMETRY_NONE )
+
+    parser.add_argument("--max_misses", type=int,
+                        help="Most puzzles to drop for missing --difficulty (default: 10 * --num_puzzles)",
+                        default=None )
+
+    parser.add_argument("--size", type=int,
+                        help="Board size, e.g. 9 for 9x9",
+                        default=9 )
+
+    parser.add_argument("-v", "--verbose",
+                        help="Follow each puzzle with it's solution, # of clues and difficulty",
+                        action="store_true")
+
+    args = parser.parse_args()
+
+    # A little sanity checking
+    if args.jobs < 0 or args.chunk_size < 1 or args.num_puzzles < 0 or \
+       (args.max_misses is not None and args.max_misses < 0) :
+        print ("%s: --jobs, --num_puzzles and --max_misses must be >= 0 and --chunk_size >= 1" % sys.argv[0],
+               file=sys.stderr)
+        return ret_val_cmd_line_err
+
+    try :
+        geometry = geometry_for_rcb_size(args.size)
+    except ExcBadPuzzleInput as exc :
+        print ("%s: %s" % (sys.argv[0], exc.message), file=sys.stderr)
+        return ret_val_cmd_line_err
+
+    puzzles = generate_puzzles(args.num_puzzles, args.seed, args.jobs, args.chunk_size, args.max_misses,
+                               geometry=geometry, symmetry=args.symmetry,
+                               target_clues=args.clues, difficulty=args.difficulty)
+    num_generated = 0
+    for generated in puzzles :
+        line = generated.puzzle
+        if args.verbose :
+            line += " %s %d %s" % (generated.solution, generated.num_clues, generated.difficulty or "")
+        sys.stdout.write(line.rstrip() + '\n')
+        num_generated += 1
+
+    sys.stdout.flush()
+
+    # tell um how it went
+    if num_generated < args.num_puzzles :
+        print ("%s: only %d of %d puzzles were %s, too many missed" %
+               (sys.argv[0], num_generated, args.num_puzzles, args.difficulty), file=sys.stderr)
+        return ret_val_some_missed
+    return ret_val_good
+
+
+if __name__ == '__main__':
+    try:
+        # Invoke the actual program
+        # We pass back to OS whatever it returns
+        main_return = main()
+
+        # Pass back to the OS the proper exit code. 0 is good
+        sys.exit( main_return)
+
+    except KeyboardInterrupt as e: # Ctrl-C
+        raise e
+    except SystemExit as e: # sys.exit()
+        raise e
+    except Exception as e:
+        print ('ERROR: uncaught EXCEPTION. Msg after traceback.')
+        traceback.print_exc()    # stack dump (which prints err msg)
+        os._exit(ret_val_exception_raised)
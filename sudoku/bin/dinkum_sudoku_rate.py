@@ -0,0 +1,245 @@
+#!/usr/bin/env python3
+#filename: dinkum_sudoku_rate.py
+#path: sudoku/bin/
+#repo: http://github.com/dinkumsoftware/dinkum.git
+"""
+Rates how hard sudoku puzzles are for a person to solve, using
+multiple worker processes.  See dinkum.sudoku.rating
+
+Puzzles are read from the files on the command line (or stdin),
+one per line, in the format read by dinkum_sudoku_solve_batch.
+i.e. 81 characters in raster order, a blank cell is either a . or 0.
+Blank lines are ignored.
+
+Output is one line per puzzle, in the order they were read:
+    <puzzle> <score> <category> <hardest strategy> <strategy>:<steps>,...
+    <puzzle> unsolvable         it has no solution
+    <puzzle> multiple solutions it has more than one solution
+    <puzzle> error: <msg>       the line couldn't be made into a puzzle
+e.g.
+    ..61....8.8..9..3. ... 86 hard x_wing hidden_singles:5,box_line_reduction:3,naked_triples:1,x_wing:1
+
+--summary writes the number of puzzles in each category, and their
+average score, to stderr when done.
+
+EXIT STATUS
+    0  All puzzles rated
+    1  Some puzzle couldn't be rated
+    2  Some kind of error on command line
+    3  Some kind of exception thrown
+
+"""
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc Boards made by Board.from_trusted() of line_values()
+# 2026-10-18 tc Puzzles without exactly one solution aren't rated
+
+import sys, os, traceback, argparse
+import textwrap    # dedent
+import collections
+import itertools
+import multiprocessing
+
+from dinkum.sudoku        import *
+from dinkum.sudoku.board  import Board
+from dinkum.sudoku.rating import *
+from dinkum.sudoku.puzzle_formats import line_values
+
+
+# What main() can return
+ret_val_good             = 0
+ret_val_some_not_rated   = 1
+ret_val_cmd_line_err     = 2
+ret_val_exception_raised = 3
+
+# What we output for puzzles that aren't rated
+unsolvable_str         = "unsolvable"
+multiple_solutions_str = "multiple solutions"
+error_prefix   = "error: "
+
+
+def main ():
+    ''' See module docstring ...
+    Rates every puzzle in the input files (or stdin)
+    and writes the ratings to stdout in input order.
+
+    --jobs       Number of worker processes.  Defaults to # of cpus
+                 0 means rate in this process (no workers)
+
+    --chunk_size Number of puzzles handed to a worker at a time
+
+    --summary    Write totals by category to stderr
+
+    Returns: 0  All puzzles rated
+             1  Some puzzle was NOT rated
+             2  Something wrong on cmd line
+    '''
+
+    # Specify and parse the command line arguments
+    parser = argparse.ArgumentParser(
+        # print document string "as is" on --help
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        description=textwrap.dedent(__doc__)
+    )
+
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="Number of worker processes (default: number of cpus)",
+                        default=os.cpu_count() )
+
+    parser.add_argument("-c", "--chunk_size", type=int,
+                        help="Number of puzzles handed to a worker at a time",
+                        default=64 )
+
+    parser.add_argument("-s", "--summary",
+                        help="Write the number of puzzles in each category to stderr",
+                        action="store_true")
+
+    parser.add_argument('puzzle_files', metavar="puzzle_file",
+                        help="file of puzzles, one per line.  - or omitted reads stdin",
+                        nargs='*', default=['-'])
+
+    args = parser.parse_args()
+
+    # A little sanity checking
+    if args.jobs < 0 or args.chunk_size < 1 :
+        print ("%s: --jobs must be >= 0 and --chunk_size >= 1" % sys.argv[0],
+               file=sys.stderr)
+        return ret_val_cmd_line_err
+
+    # Make sure we can read them all before we start
+    for filename in args.puzzle_files :
+        if filename != '-' and not os.access(filename, os.R_OK) :
+            print ("%s: Can't read: %s" % (sys.argv[0], filename), file=sys.stderr)
+            return ret_val_cmd_line_err
+
+    # key: category value: [num_puzzles, total score]
+    totals = collections.OrderedDict( [ (category, [0, 0]) for category in DIFFICULTIES ] )
+
+    we_rated_all_puzzles = True  # Forever the optimist
+    lines = itertools.chain.from_iterable( map(stripped_lines, args.puzzle_files) )
+    for output_lines in rate_chunks( chunked(lines, args.chunk_size), args.jobs ) :
+        for (line, rating) in output_lines :
+            if rating is None :
+                we_rated_all_puzzles = False
+            else :
+                totals[rating.category][0] += 1
+                totals[rating.category][1] += rating.score
+            sys.stdout.write(line + '\n')
+
+    sys.stdout.flush()
+
+    if args.summary :
+        for (category, (num_puzzles, total_score)) in totals.items() :
+            print ("%-10s %8d puzzles  average score: %8.1f" %
+                   (category, num_puzzles, total_score / num_puzzles if num_puzzles else 0.0),
+                   file=sys.stderr)
+
+    # tell um how it went
+    return ret_val_good if we_rated_all_puzzles else ret_val_some_not_rated
+
+
+def stripped_lines(filename) :
+    ''' generator which yields every non-blank line of filename
+    with it's whitespace stripped.  filename of - is stdin.
+    '''
+    with (sys.stdin if filename == '-' else open(filename)) as file :
+        for line in file :
+            line = line.strip()
+            if line :
+                yield line
+
+
+def chunked(iterable, chunk_size) :
+    ''' generator which yields [] of up to chunk_size items from iterable '''
+    iterator = iter(iterable)
+    while True :
+        chunk = list( itertools.islice(iterator, chunk_size) )
+        if not chunk :
+            return
+        yield chunk
+
+
+def rate_chunks(chunks, num_jobs) :
+    ''' generator which yields the rate_lines() results for every
+    chunk in iterable chunks, in the same order as chunks.
+
+    Uses num_jobs worker processes.  If num_jobs is 0, the
+    chunks are rated in this process.
+
+    No more than num_jobs*4 chunks are handed to the workers
+    without their results being collected, so we never read
+    far ahead of what's been written.
+    '''
+
+    if num_jobs == 0 :
+        for chunk in chunks :
+            yield rate_lines(chunk)
+        return
+
+    max_in_flight = num_jobs * 4
+    with multiprocessing.Pool(num_jobs) as pool :
+        in_flight = collections.deque()  # AsyncResult's in input order
+        for chunk in chunks :
+            in_flight.append( pool.apply_async(rate_lines, (chunk,)) )
+
+            # Wait for the oldest if we are too far ahead
+            if len(in_flight) >= max_in_flight :
+                yield in_flight.popleft().get()
+
+        # Drain what's left
+        while in_flight :
+            yield in_flight.popleft().get()
+
+
+def rate_lines(lines) :
+    ''' Returns [] of (output line, Rating) for every puzzle in lines.
+    Rating is None if it couldn't be rated.  See module doc for the format.
+
+    This is what runs in a worker process.
+    '''
+    return [ rate_line(line) for line in lines ]
+
+
+def rate_line(line) :
+    ''' Rates the puzzle in line (81 chars, . or 0 for blanks).
+    Returns (output line, Rating or None).  See module doc for the format.
+    '''
+    if len(line) != NUM_CELLS :
+        return (line + ' ' + error_prefix + "%d chars, should be %d" % (len(line), NUM_CELLS), None)
+
+    try:
+        board = Board.from_trusted( line_values(line), "rate" )
+
+        # A rating only means something for a proper puzzle
+        num_solutions = board.count_solutions(2)
+        if num_solutions == 0 :
+            return (line + ' ' + unsolvable_str, None)
+        if num_solutions > 1 :
+            return (line + ' ' + multiple_solutions_str, None)
+
+        rating = rate(board)
+    except ExcBadPuzzleInput as exc :
+        return (line + ' ' + error_prefix + exc.message, None)
+    except ExcUnsolvable :
+        return (line + ' ' + unsolvable_str, None)
+
+    return (line + ' ' + str(rating), rating)
+
+
+if __name__ == '__main__':
+    try:
+        # Invoke the actual program
+        # We pass back to OS whatever it returns
+        main_return = main()
+
+        # Pass back to the OS the proper exit code. 0 is good
+        sys.exit( main_return)
+
+    except KeyboardInterrupt as e: # Ctrl-C
+        raise e
+    except SystemExit as e: # sys.exit()
+        raise e
+    except Exception as e:
+        print ('ERROR: uncaught EXCEPTION. Msg after traceback.')
+        traceback.print_exc()    # stack dump (which prints err msg)
+        os._exit(ret_val_exception_raised)
@@ -0,0 +1,308 @@
+#!/usr/bin/env python3
+#filename: dinkum_sudoku_solve_batch.py
+#path: sudoku/bin/
+#repo: http://github.com/dinkumsoftware/dinkum.git
+"""
+Solves a stream of sudoku puzzles read from a file (or stdin)
+using multiple worker processes.  Solutions are written to stdout
+in the same order as the puzzles were read.
+
+Input is one puzzle per line, 81 characters in raster order.
+A blank cell is either a . or 0.  Blank lines are ignored.  e.g.
+    ..61....8.8..9..3.2....54..4....18...3..7..4...79....3..84....6.2..5..8.1....25..
+
+gzip, bz2 and xz compressed files are decompressed as they are read.
+--start and --stop pick out some of the puzzles, e.g. to split a big
+file between machines.  If every line is exactly 81 chars, the file is
+mmapped and nothing before --start is read.  See dinkum.sudoku.puzzle_file
+
+Output is one line per puzzle:
+    <81 digits>        the solution
+    unsolvable         no solution exists
+    error: <msg>       the input line couldn't be made into a puzzle
+
+If numpy is installed, each chunk is first run thru the vectorized
+naked/hidden single propagation in dinkum.sudoku.batch, which finishes
+most easy and medium puzzles.  Only the rest are solved one at a time
+with a Board.  --scalar skips the numpy step.
+
+Work is handed to the workers in chunks of --chunk_size puzzles.
+At most --jobs * 4 chunks are in flight at any one time, so memory
+use stays flat no matter how many puzzles are in the input.
+
+EXIT STATUS
+    0  All puzzles solved
+    1  Some puzzle wasn't solved (or had an error)
+    2  Some kind of error on command line
+    3  Some kind of exception thrown
+
+"""
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc numpy batch propagation, added --scalar
+# 2026-10-18 tc Boards in a process share a StrategyScheduler
+# 2026-10-18 tc Read with dinkum.sudoku.puzzle_file, added --start and --stop
+# 2026-10-18 tc Boards made by Board.from_trusted() of line_values()
+# 2026-10-18 tc A bad line in a fixed width file no longer stops the run
+# 2026-10-18 tc Boards numpy didn't finish keep what it ruled out
+
+import sys, os, traceback, argparse
+import textwrap    # dedent
+import collections
+import multiprocessing
+
+from dinkum.sudoku       import *
+from dinkum.sudoku.board import Board
+from dinkum.sudoku.batch import *
+from dinkum.sudoku.puzzle_file import read_puzzles
+from dinkum.sudoku.puzzle_formats import line_values
+from dinkum.sudoku.strategies import StrategyScheduler
+
+
+# What main() can return
+ret_val_good             = 0
+ret_val_some_not_solved  = 1
+ret_val_cmd_line_err     = 2
+ret_val_exception_raised = 3
+
+# What we output for puzzles that aren't solved
+unsolvable_str = "unsolvable"
+error_prefix   = "error: "
+
+# Every Board solved in this process shares it, so what it
+# learns about which deduction strategies pay off on one
+# puzzle is used on the next.  Each worker has it's own.
+scheduler = StrategyScheduler()
+
+
+def main ():
+    ''' See module docstring ...
+    Solves every puzzle in the input file (or stdin)
+    and writes the solutions to stdout in input order.
+
+    --jobs       Number of worker processes.  Defaults to # of cpus
+                 0 means solve in this process (no workers)
+
+    --chunk_size Number of puzzles handed to a worker at a time
+
+    --engine     Which Board.solve() engine to use
+
+    --scalar     Don't use numpy batch propagation
+
+    --start      Index of first puzzle to solve, 0 is the first
+
+    --stop       Index of puzzle after the last to solve
+
+    Returns: 0  All puzzles solved
+             1  Some puzzle was NOT solved.
+             2  Something wrong on cmd line
+    '''
+
+    # Specify and parse the command line arguments
+    parser = argparse.ArgumentParser(
+        # print document string "as is" on --help
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+        description=textwrap.dedent(__doc__)
+    )
+
+    parser.add_argument("-j", "--jobs", type=int,
+                        help="Number of worker processes (default: number of cpus)",
+                        default=os.cpu_count() )
+
+    parser.add_argument("-c", "--chunk_size", type=int,
+                        help="Number of puzzles handed to a worker at a time",
+                        default=64 )
+
+    parser.add_argument("-e", "--engine",
+                        help="Solution engine",
+                        choices=ALL_ENGINES,
+                        default=ENGINE_SEARCH )
+
+    parser.add_argument("-s", "--scalar",
+                        help="Solve every puzzle with a Board, even if numpy is installed",
+                        action="store_true")
+
+    parser.add_argument("--start", type=int,
+                        help="Index of the first puzzle to solve (default: 0)",
+                        default=0 )
+
+    parser.add_argument("--stop", type=int,
+                        help="Index of the puzzle after the last to solve (default: all)",
+                        default=None )
+
+    parser.add_argument('puzzle_file', metavar="puzzle_file",
+                        help="file of puzzles, one per line.  - or omitted reads stdin",
+                        nargs='?', default='-')
+
+    args = parser.parse_args()
+
+    # A little sanity checking
+    if args.jobs < 0 or args.chunk_size < 1 :
+        print ("%s: --jobs must be >= 0 and --chunk_size >= 1" % sys.argv[0],
+               file=sys.stderr)
+        return ret_val_cmd_line_err
+    if args.start < 0 or (args.stop is not None and args.stop < args.start) :
+        print ("%s: --start must be >= 0 and --stop >= --start" % sys.argv[0],
+               file=sys.stderr)
+        return ret_val_cmd_line_err
+
+    # Where the puzzles come from
+    try:
+        puzzles = read_puzzles(args.puzzle_file, args.start, args.stop)
+    except OSError as exc :
+        print ("%s: %s" % (sys.argv[0], exc), file=sys.stderr)
+        return ret_val_cmd_line_err
+
+    chunks = chunked_lines(puzzles, args.chunk_size)
+
+    we_solved_all_puzzles = True  # Forever the optimist
+    vectorize = have_numpy() and not args.scalar
+    for output_lines in solve_chunks(chunks, args.engine, vectorize, args.jobs) :
+        for line in output_lines :
+            we_solved_all_puzzles &= is_solution_line(line)
+            sys.stdout.write(line + '\n')
+
+    sys.stdout.flush()
+
+    # tell um how it went
+    return ret_val_good if we_solved_all_puzzles else ret_val_some_not_solved
+
+
+def chunked_lines(file, chunk_size) :
+    ''' generator which reads file (or any iterable of lines)
+    a line at a time and yields
+    [] of up to chunk_size non-blank lines with their whitespace stripped.
+    '''
+    chunk = []
+    for line in file :
+        line = line.strip()
+        if not line :
+            continue  # blank line
+
+        chunk.append(line)
+        if len(chunk) == chunk_size :
+            yield chunk
+            chunk = []
+
+    # Whatever is left over
+    if chunk :
+        yield chunk
+
+
+def solve_chunks(chunks, engine, vectorize, num_jobs) :
+    ''' generator which yields the solve_lines() results for every
+    chunk in iterable chunks, in the same order as chunks.
+
+    Uses num_jobs worker processes.  If num_jobs is 0, the
+    chunks are solved in this process.
+
+    No more than num_jobs*4 chunks are handed to the workers
+    without their results being collected, so we never read
+    far ahead of what's been written.
+    '''
+
+    if num_jobs == 0 :
+        for chunk in chunks :
+            yield solve_lines(chunk, engine, vectorize)
+        return
+
+    max_in_flight = num_jobs * 4
+    with multiprocessing.Pool(num_jobs) as pool :
+        in_flight = collections.deque()  # AsyncResult's in input order
+        for chunk in chunks :
+            in_flight.append( pool.apply_async(solve_lines, (chunk, engine, vectorize)) )
+
+            # Wait for the oldest if we are too far ahead
+            if len(in_flight) >= max_in_flight :
+                yield in_flight.popleft().get()
+
+        # Drain what's left
+        while in_flight :
+            yield in_flight.popleft().get()
+
+
+def solve_lines(lines, engine, vectorize) :
+    ''' Solves every puzzle in lines with engine.
+    Returns [] of output lines, one per line in lines.
+    See module doc for the format.
+
+    If vectorize, the well formed lines are first run thru
+    batch_propagate() all at once.  Lines it doesn't finish are
+    solved starting from the possibles it left.  The rest are
+    handed to solve_line().
+
+    This is what runs in a worker process.
+    '''
+    output_lines = [ None ] * len(lines)
+
+    if vectorize :
+        # Only well formed lines go to numpy, solve_line() reports the rest
+        line_nums = [ line_num for (line_num, line) in enumerate(lines)
+                      if len(line) == NUM_CELLS and line.strip(".0123456789") == "" ]
+        if line_nums :
+            (masks, status) = batch_propagate( lines_to_values( [ lines[n] for n in line_nums ] ) )
+            solutions = masks_to_cell_values(masks)
+            for (idx, line_num) in enumerate(line_nums) :
+                if status[idx] == BATCH_SOLVED :
+                    output_lines[line_num] = ''.join( map(str, solutions[idx].tolist()) )
+                elif status[idx] == BATCH_UNFINISHED :
+                    output_lines[line_num] = solve_board( masks_to_board(masks[idx], "batch"), engine )
+
+    # Whatever numpy didn't solve
+    for (line_num, line) in enumerate(lines) :
+        if output_lines[line_num] is None :
+            output_lines[line_num] = solve_line(line, engine)
+
+    return output_lines
+
+
+def solve_line(line, engine) :
+    ''' Solves the puzzle in line (81 chars, . or 0 for blanks) with
+    engine and returns the output line.  See module doc for the format.
+    '''
+    if len(line) != NUM_CELLS :
+        return error_prefix + "%d chars, should be %d" % (len(line), NUM_CELLS)
+
+    try:
+        board = Board.from_trusted( line_values(line), "batch" )
+    except ExcBadPuzzleInput as exc :
+        return error_prefix + exc.message
+    except ExcUnsolvable :
+        return unsolvable_str
+
+    return solve_board(board, engine)
+
+
+def solve_board(board, engine) :
+    ''' Solves Board board with engine and returns the output line.
+    See module doc for the format.
+    '''
+    board.scheduler = scheduler
+    if not board.solve(engine) :
+        return unsolvable_str
+
+    return ''.join( [ str(cell.value) for cell in board.cells ] )
+
+
+def is_solution_line(line) :
+    ''' returns True if line (as returned from solve_line()) is a solution '''
+    return not (line == unsolvable_str or line.startswith(error_prefix))
+
+
+if __name__ == '__main__':
+    try:
+        # Invoke the actual program
+        # We pass back to OS whatever it returns
+        main_return = main()
+
+        # Pass back to the OS the proper exit code. 0 is good
+        sys.exit( main_return)
+
+    except KeyboardInterrupt as e: # Ctrl-C
+        raise e
+    except SystemExit as e: # sys.exit()
+        raise e
+    except Exception as e:
+        print ('ERROR: uncaught EXCEPTION. Msg after traceback.')
+        traceback.print_exc()    # stack dump (which prints err msg)
+        os._exit(ret_val_exception_raised)
@@ -15,6 +15,15 @@ comparisons to prior solution times stored in:
 
 Use --update to write the current solve times to that file
 
+--profile runs the solves under cProfile, prints the --top functions
+sorted by --sort, and writes the profile to a pstats file that
+snakeviz, gprof2dot, python -m pstats, etc can read.  Solve times
+are inflated by the profiler while it's on.
+
+--memprofile solves each puzzle once more under tracemalloc and
+prints it's peak traced memory and the --top source lines which
+allocated the memory still held when solve() returned.
+
 EXIT STATUS
     0  All puzzles solved
     1  Some kind of error on command line
@@ -32,10 +41,13 @@ EXIT STATUS
 # 2019-12-19 tc check for negative --num_to_average
 #               Print dot's as solve puzzles
 # 2019-12-24 tc Confirm partial solutions are valid
+# 2026-10-18 tc Puzzles w/o a solution_spec aren't solved INCORRECTLY
+# 2026-10-18 tc Added --profile and --memprofile
 
 import sys, os, traceback, argparse
 import textwrap    # dedent
 import time
+import cProfile, pstats, tracemalloc
 
 from dinkum.sudoku.test_data.test_puzzles import *
 from dinkum.sudoku.labeled_printer        import labeled_board
@@ -49,6 +61,12 @@ ret_val_some_not_solved  = 1
 ret_val_cmd_line_err     = 2
 ret_val_exception_raised = 3
 
+# --profile with no file name writes here
+default_pstats_filename = "dinkum_sudoku_solve_known.pstats"
+
+# What --sort can be
+profile_sort_keys = ("tottime", "cumulative", "calls", "ncalls")
+
 
 
 def main ():
@@ -68,6 +86,11 @@ def main ():
                      Currently Defaults to 100 to reduce
                      jitter in timing measurements
 
+    --profile    Run solves under cProfile, print the hot functions
+                 and write a pstats file
+
+    --memprofile Print the top allocation sites of each puzzle
+
     Returns: 0  All puzzles solved
              1  Something wrong on cmd line
              2  Some puzzle was NOT solved.
@@ -95,6 +118,23 @@ def main ():
                         help="Number of times solve each puzzle for stat averages",
                         default=100 )
 
+    parser.add_argument("--profile", metavar="PSTATS_FILE",
+                        help="Profile the solves, write the profile to PSTATS_FILE (default: %(const)s)",
+                        nargs='?', const=default_pstats_filename, default=None )
+
+    parser.add_argument("--memprofile",
+                        help="Print the top allocation sites of each puzzle's solve",
+                        action="store_true")
+
+    parser.add_argument("--top", type=int,
+                        help="Number of functions/allocation sites to print with --profile/--memprofile",
+                        default=20 )
+
+    parser.add_argument("--sort",
+                        help="How --profile sorts functions",
+                        choices=profile_sort_keys,
+                        default="tottime" )
+
     # puzzles names, every non-option on the command line
     parser.add_argument('puzzle_names', metavar="puzzle_name",  # singular in -h, plural for [] generated
                         help="name(s) of puzzle in dinkum/sudoku/test_data/known_puzzles.py",
@@ -110,6 +150,11 @@ def main ():
                file=sys.stderr)
         args.num_to_average = 1
 
+    # The profiler slows the solves, those times aren't worth keeping
+    if args.profile and args.update :
+        print ("%s: --update can't be used with --profile" % sys.argv[0], file=sys.stderr)
+        return ret_val_cmd_line_err
+
     # They just want a listing?
     if args.list :
 
@@ -146,6 +191,11 @@ def main ():
     #      value: sudoku.Stats
     prior_solve_stats_dict = read_prior_stats()
 
+    # --profile  accumulates every solve()
+    # --memprofile lines to print, one entry per puzzle
+    profiler = cProfile.Profile() if args.profile else None
+    memprofile_lines_to_print = []
+
     # Attempt to solve
     for puzzle_name in puzzle_names_to_solve :
 
@@ -166,7 +216,14 @@ def main ():
         # Try to solve it
         # Note: solve() may be attempted multiple times in order
         #       to average some timing results
+        if profiler :
+            profiler.enable()
         (is_solved, solve_results_board) = solve(sp.input_board, args.num_to_average)
+        if profiler :
+            profiler.disable()
+
+        if args.memprofile :
+            memprofile_lines_to_print.append( memprofile(sp.input_board, args.top) )
 
         # keep track of whether any board wasn't solved
         we_solved_all_puzzles &= is_solved
@@ -181,9 +238,15 @@ def main ():
         #    verbose_lines string only printed to user with --verbose on cmd line
         # we pass in any prior statistics to allow change in any statistics to
         # be computed
+        # A puzzle without a solution_spec, e.g. empty, has no one right
+        # answer to compare against.  Any answer that solves it will do.
+        solution_board     = sp.solution_board if sp.solution_spec is not None else None
+        multiple_solutions = solution_board is None and sp.input_board.count_solutions() > 1
+
         (tokens, verbose_lines) = build_printed_output( solve_results_board,
-                                                        sp.solution_board,
-                                                        prior_solve_stats_dict.get(puzzle_name))
+                                                        solution_board,
+                                                        prior_solve_stats_dict.get(puzzle_name),
+                                                        multiple_solutions)
 
         # record lines for later printing
         tokens_to_print.append(tokens)
@@ -210,6 +273,14 @@ def main ():
         if args.verbose :
             print (only_verbose)
 
+    if profiler :
+        print ()
+        print_profile(profiler, args.profile, args.sort, args.top)
+
+    for lines in memprofile_lines_to_print :
+        print ()
+        print (lines, end="")
+
     # if we had no statistics to compare
     # tell them how to create statistics file
     if len(prior_solve_stats_dict) == 0 :
@@ -275,7 +346,50 @@ def solve(input_board, num_to_average) :
     return (is_solved, solve_results_board)
 
 
-def build_printed_output( board, solution_board, prior_stats=None) :
+def print_profile(profiler, pstats_filename, sort_key, num_functions) :
+    ''' Prints the num_functions hottest functions in cProfile.Profile
+    profiler, sorted by sort_key, and writes it to pstats_filename.
+    '''
+    profiler.dump_stats(pstats_filename)
+
+    stats = pstats.Stats(profiler, stream=sys.stdout)
+    stats.strip_dirs().sort_stats(sort_key).print_stats(num_functions)
+    print ("profile written to: %s" % pstats_filename)
+    print ("   view with: python3 -m pstats %s" % pstats_filename)
+
+
+def memprofile(input_board, num_sites) :
+    ''' Solves input_board once under tracemalloc.
+    Returns str (multi-line) of it's peak traced memory and the
+    num_sites source lines which allocated the most memory
+    still held when solve() returned.
+    '''
+    tracemalloc.start()
+    try :
+        before = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+
+        board_to_solve = Board( input_board, name=input_board.name )
+        board_to_solve.solve()
+
+        (current_bytes, peak_bytes) = tracemalloc.get_traced_memory()
+        after = tracemalloc.take_snapshot()
+    finally :
+        tracemalloc.stop()
+
+    # Leave out tracemalloc's own allocations
+    trace_filters = [ tracemalloc.Filter(False, tracemalloc.__file__) ]
+    differences = after.filter_traces(trace_filters).compare_to( before.filter_traces(trace_filters), "lineno" )
+
+    lines = "%s: peak %d KiB\n" % (input_board.name, peak_bytes // 1024)
+    for difference in [ d for d in differences if d.size_diff > 0 ][:num_sites] :
+        frame = difference.traceback[0]
+        lines += "  %8.1f KiB %8d blocks  %s:%d\n" % (difference.size_diff / 1024.0, difference.count_diff,
+                                                    os.path.basename(frame.filename), frame.lineno)
+    return lines
+
+
+def build_printed_output( board, solution_board, prior_stats=None, multiple_solutions=False) :
     '''We build the lines to be printed for the user, returning:
     (tokens, verbose_lines)
             tokens        [] of what is always printed to user about this puzzle
@@ -288,7 +402,10 @@ def build_printed_output( board, solution_board, prior_stats=None) :
     or not.
 
     solution_board is used to confirm that board is either partially or fully correct
+    It may be None if there is no known solution.
     prior_stats is used to allow change in any statistic to be computed.
+    multiple_solutions says the puzzle has more than one solution,
+    board is noted as being one of them.
     '''
     # what we return
     tokens = []
@@ -308,8 +425,9 @@ def build_printed_output( board, solution_board, prior_stats=None) :
     # Name
     tokens.append ( board.name )
 
-    # solution state (4 choices)
+    # solution state (5 choices)
     #   solved
+    #   solved (one of many)
     #   solved INCORRECTLY
     #   UNSOLVED!
     #   UNSOLVED! WITH ERRORS
@@ -318,6 +436,8 @@ def build_printed_output( board, solution_board, prior_stats=None) :
         solve_str = "solved"
         if solution_board and board != solution_board :
             solve_str += " INCORRECTLY!"
+        elif multiple_solutions :
+            solve_str += " (one of many)"
     else :
         solve_str = "UNSOLVED!"
         if solution_board and not board.is_subset_of(solution_board) :
@@ -0,0 +1,130 @@
+#!/usr/bin/env python3
+# dinkum/sudoku/bitmask.py
+''' Helpers for representing a set of cell values as a
+bitmask, i.e. a single int.
+
+Value v is represented by bit (1 << v).  With RCB_SIZE of 9,
+bits 1 thru 9 are used and bit 0 is always clear.  e.g.
+    set([1,3,9])  <==>  0b1000001010
+Bigger boards just use more bits, e.g. 1 thru 16 for 16x16.
+
+This lets us replace set() operations with integer operations:
+    union          a | b
+    intersection   a & b
+    difference     a & ~b
+    len()          popcount(a)
+    single value?  is_single_value(a)
+
+Some useful names:
+    ALL_VALUES_MASK           every legal cell value on a 9x9 board
+    all_values_mask(rcb_size) every legal cell value on an rcb_size board
+    value_to_mask(value)      a single value ==> mask
+    values_to_mask(values)    iterable of values ==> mask
+    mask_to_values(mask)      mask ==> tuple of values in ascending order
+    popcount(mask)            number of values in mask
+    is_single_value(mask)     True if exactly one value in mask
+    sole_value(mask)          The value in a single value mask
+'''
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc masks bigger than 9x9 are computed, not looked up
+
+from dinkum.sudoku import *  # Get package wide constants from __init__.py
+
+def all_values_mask(rcb_size) :
+    ''' returns mask of every legal cell value, i.e. bits 1..rcb_size '''
+    return ((1 << (rcb_size+1)) - 1) & ~1
+
+# Every legal cell value on a 9x9 board, i.e. bits 1..RCB_SIZE
+ALL_VALUES_MASK = all_values_mask(RCB_SIZE)
+
+# Precomputed answers for every possible 9x9 mask.
+# Indexed by mask.  Small enough (2**(RCB_SIZE+1) entries) to build at import
+# Bigger masks, e.g. from 16x16 boards, are computed when asked for.
+_mask_values_table = []
+for _mask in range(ALL_VALUES_MASK+1) :
+    _mask_values_table.append( tuple( [ v for v in range(1, RCB_SIZE+1) if _mask & (1 << v) ] ) )
+_popcount_table = [ len(values) for values in _mask_values_table ]
+_table_size     = len(_mask_values_table)
+
+
+def value_to_mask(value) :
+    ''' returns the mask which holds the single "value" '''
+    return 1 << value
+
+def values_to_mask(values) :
+    ''' returns the mask which holds every value in iterable "values" '''
+    mask = 0
+    for value in values :
+        mask |= 1 << value
+    return mask
+
+def mask_to_values(mask) :
+    ''' returns a tuple of the values in mask in ascending order.
+    The returned tuple may be shared, don't try to modify it.
+    '''
+    if mask < _table_size :
+        return _mask_values_table[mask]
+    return tuple( [ v for v in range(1, mask.bit_length()) if mask & (1 << v) ] )
+
+def popcount(mask) :
+    ''' returns number of values in mask '''
+    if mask < _table_size :
+        return _popcount_table[mask]
+    return bin(mask).count('1')
+
+def is_single_value(mask) :
+    ''' returns True if mask holds exactly one value '''
+    return mask != 0 and (mask & (mask-1)) == 0
+
+def sole_value(mask) :
+    ''' returns the value held by a single value mask.
+    Results are meaningless if is_single_value(mask) isn't True.
+    '''
+    return mask.bit_length() - 1
+
+
+# Test code
+import unittest
+
+class Test_bitmask(unittest.TestCase):
+
+    def test_all_values_mask(self) :
+        self.assertEqual( mask_to_values(ALL_VALUES_MASK), tuple(range(1, RCB_SIZE+1)) )
+        self.assertEqual( popcount(ALL_VALUES_MASK), RCB_SIZE )
+        self.assertFalse( ALL_VALUES_MASK & 1 )  # bit 0 unused
+
+    def test_round_trip(self) :
+        for values in [ [], [1], [9], [1,3,9], [2,4,5,6,7,8], range(1, RCB_SIZE+1) ] :
+            mask = values_to_mask(values)
+            self.assertEqual( mask_to_values(mask), tuple(values) )
+            self.assertEqual( popcount(mask), len(values) )
+
+    def test_single_value(self) :
+        for value in range(1, RCB_SIZE+1) :
+            mask = value_to_mask(value)
+            self.assertTrue  ( is_single_value(mask) )
+            self.assertEqual ( sole_value(mask), value )
+
+        self.assertFalse( is_single_value(0) )
+        self.assertFalse( is_single_value(values_to_mask([3,4])) )
+        self.assertFalse( is_single_value(ALL_VALUES_MASK) )
+
+    def test_big_masks(self) :
+        # e.g. 25x25 boards
+        self.assertEqual( all_values_mask(RCB_SIZE), ALL_VALUES_MASK )
+        big = all_values_mask(25)
+        self.assertEqual( mask_to_values(big), tuple(range(1, 26)) )
+        self.assertEqual( popcount(big), 25 )
+
+        values = [2, 9, 10, 16, 25]
+        mask = values_to_mask(values)
+        self.assertEqual( mask_to_values(mask), tuple(values) )
+        self.assertEqual( popcount(mask), len(values) )
+        self.assertTrue ( is_single_value(value_to_mask(25)) )
+        self.assertEqual( sole_value(value_to_mask(25)), 25 )
+
+
+if __name__ == "__main__" :
+    # Run the unittests
+    unittest.main()
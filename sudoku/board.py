@@ -26,44 +26,243 @@ sudoku board full of Cells with values.
 #                             use RCB.build_unsolved_cell_possibles()
 #                             when needed.
 # 2020-02-01 tc Went to exhaustive trials
+# 2026-10-18 tc solve_by_deduction() works on Cell/RCB bitmasks
+# 2026-10-18 tc solve() does a depth first search with an undo trail
+# 2026-10-18 tc solve(engine) to pick ENGINE_SEARCH or ENGINE_DLX
+# 2026-10-18 tc num_changes counter replaces deepcopy snapshot in _deduce()
+# 2026-10-18 tc rcbs populated from dinkum.sudoku.geometry tables
+# 2026-10-18 tc Added snapshot(), restore(), clone() and BoardState
+# 2026-10-18 tc Per Board geometry, boards other than 9x9
+# 2026-10-18 tc _deduce() runs the strategies in dinkum.sudoku.strategies
+# 2026-10-18 tc strategies ordered by a StrategyScheduler
+# 2026-10-18 tc Added count_solutions() and solutions()
+# 2026-10-18 tc solve() consults solution_cache
+# 2026-10-18 tc collect_stats fills in per technique and search Stats
+# 2026-10-18 tc Added from_trusted() and assume_valid
+# 2026-10-18 tc Added to_bytes(), from_bytes() and __reduce__()
+# 2026-10-18 tc undo_trail() and solve_a_cell() don't build cell.rcbs
+# 2026-10-18 tc trusted_state() and masks_typecode() are public
+# 2026-10-18 tc trusted_state() raises ExcUnsolvable on a cell with no possibles
+# 2026-10-18 tc solve_cells_with_single_possible_value() raises ExcUnsolvable on a cell with no possibles
+# 2026-10-18 tc solve() doesn't use solution_cache if possibles were removed
+# 2026-10-18 tc __init__ doesn't sanity_check() the RCBs built from geometry tables
 
 from dinkum.sudoku.rcb   import *
 from dinkum.sudoku.cell  import *
 from dinkum.sudoku.stats import *
+from dinkum.sudoku.geometry import *
+from dinkum.sudoku.dlx   import dlx_solve, dlx_solutions
+from dinkum.sudoku.strategies import DEFAULT_STRATEGIES, StrategyScheduler
 
 import time
+import collections
+import array
 
-def str_to_list_of_rows(s) :
+def str_to_list_of_rows(s, geometry=None) :
     ''' translate s to list of row-lists suitable for input to Board()
     and return it.
 
-    s should contain a boards worth (81) of digits in range 0-9 inclusive.
-    Whitespace is ignored as well as any non-digits.  The values are in
-    raster order.
+    s should contain a boards worth (e.g. 81) of values in raster order.
+    For boards up to 9x9 the values are the digits 0-9 inclusive.  Whitespace
+    is ignored as well as any non-digits.  Bigger boards also use letters,
+    A is 10, B is 11, ... in either case.
+
+    If geometry is None, the board size is picked from the number
+    of values in s.  See str_to_geometry().
 
     Not much error checking is done. Presumably someone else is
     error checking the returned list of row-lists.
 
     Raises ExcBadStrToConvert if there aren't exactly a boards worth of
-    digits in s.
+    values in s.
     '''
 
+    if geometry is None :
+        geometry = str_to_geometry(s)
+    rcb_size = geometry.rcb_size
+
     # Disappear the white space
-    digits = [ int(c) for c in s if c.isdigit() ]
+    if rcb_size <= 9 :
+        values = [ int(c) for c in s if c.isdigit() ]
+    else :
+        values = [ v for v in map(char_to_value, s) if v is not None ]
 
     # Verify the count
-    if len(digits) != (RCB_SIZE)*(RCB_SIZE) :
+    if len(values) != geometry.num_cells :
         raise ExcBadStrToConvert  # Oops
 
     # Put them in their place
     list_of_rows=[]
-    for row_num in range(RCB_SIZE) :
-        offset = row_num * RCB_SIZE # which digit starts this row
-        list_of_rows.append ( digits[offset:offset+RCB_SIZE] )
+    for row_num in range(rcb_size) :
+        offset = row_num * rcb_size # which value starts this row
+        list_of_rows.append ( values[offset:offset+rcb_size] )
 
     return list_of_rows
 
 
+def str_to_geometry(s) :
+    ''' Returns the Geometry of the board in string s, as
+    given to str_to_list_of_rows().  If the digits in s make
+    a board of 9x9 or smaller, that's it.  Otherwise digits
+    and letters must make a bigger board.
+
+    Raises ExcBadStrToConvert if neither does.
+    '''
+    num_digits = sum( [ c.isdigit() for c in s ] )
+    if num_digits == NUM_CELLS :
+        return DEFAULT_GEOMETRY  # The usual case
+
+    try :
+        geometry = geometry_for_num_cells(num_digits)
+        if geometry.rcb_size <= 9 :
+            return geometry
+    except ExcBadPuzzleInput :
+        pass
+
+    try :
+        geometry = geometry_for_num_cells( sum( [ char_to_value(c) is not None for c in s ] ) )
+        if geometry.rcb_size > 9 :
+            return geometry
+    except ExcBadPuzzleInput :
+        pass
+
+    raise ExcBadStrToConvert
+
+
+class BoardState(collections.namedtuple('BoardState', 'values possibles_masks')) :
+    ''' An immutable, compact copy of the Cells of a Board.
+    See Board.snapshot() and Board.restore()
+
+        values           bytes of every cell.value in raster order
+        possibles_masks  bytes of every cell.possibles_mask in raster
+                         order, 2 bytes each in native byte order
+                         (4 bytes for boards bigger than 15x15)
+    '''
+    __slots__ = ()
+
+
+def masks_typecode(geometry) :
+    ''' array typecode that holds a possibles_mask for geometry '''
+    return 'H' if geometry.rcb_size < 16 else 'I'
+
+
+def _flattened_rows(list_of_rows, rcb_size) :
+    ''' Returns [] of every value in list_of_rows in raster order.
+    raise ExcBadPuzzleInput if it's not rcb_size rows of rcb_size.
+    '''
+    if len(list_of_rows) != rcb_size :
+        raise ExcBadPuzzleInput( "Wrong number of rows: %d" % len(list_of_rows) )
+
+    values = []
+    for (row_num, row) in enumerate(list_of_rows) :
+        if len(row) != rcb_size :
+            raise ExcBadPuzzleInput( "Row %d: Wrong size: %d" % (row_num, len(row)))
+        values.extend(row)
+    return values
+
+
+# Bits in the flags byte of Board.to_bytes()
+_PACKED_HAS_POSSIBLES = 0x01
+_PACKED_HEADER_SIZE   = 3    # flags, blk_height, blk_width
+
+def _pack_values(values, rcb_size) :
+    ''' Returns bytes of values, 2 to a byte (high nibble first)
+    if they fit in a nibble, else 1 to a byte
+    '''
+    if rcb_size > 15 :
+        return bytes(values)
+    values = list(values)
+    if len(values) % 2 :
+        values.append(0)
+    return bytes( [ (values[i] << 4) | values[i+1] for i in range(0, len(values), 2) ] )
+
+def _packed_values_size(geometry) :
+    num_cells = geometry.num_cells
+    return num_cells if geometry.rcb_size > 15 else (num_cells + 1) // 2
+
+def _unpack_values(data, geometry) :
+    ''' Returns bytes of the values _pack_values() packed into data '''
+    if geometry.rcb_size > 15 :
+        return bytes(data)
+    values = bytearray()
+    for byte in data :
+        values.append(byte >> 4)
+        values.append(byte & 0x0f)
+    return bytes( values[:geometry.num_cells] )
+
+def _pack_masks(masks, rcb_size) :
+    ''' Returns bytes of possibles masks, rcb_size bits each.
+    Bit 0 of a mask is never set, so it's dropped.
+    '''
+    packed = 0
+    for mask in masks :
+        packed = (packed << rcb_size) | (mask >> 1)
+    return packed.to_bytes( _packed_masks_size(len(masks), rcb_size), 'big' )
+
+def _packed_masks_size(num_masks, rcb_size) :
+    return (num_masks * rcb_size + 7) // 8
+
+def _unpack_masks(data, geometry) :
+    ''' Returns array of the masks _pack_masks() packed into data '''
+    rcb_size = geometry.rcb_size
+    packed   = int.from_bytes(data, 'big')
+    low_bits = (1 << rcb_size) - 1
+    masks = array.array( masks_typecode(geometry), [0] * geometry.num_cells )
+    for cell_num in range(geometry.num_cells - 1, -1, -1) :
+        masks[cell_num] = (packed & low_bits) << 1
+        packed >>= rcb_size
+    return masks
+
+def _unpickled_board(packed, name, desc, solve_stats, collect_stats) :
+    ''' Returns the Board Board.__reduce__() pickled '''
+    board = Board.from_bytes(packed, name, desc)
+    board.solve_stats   = solve_stats
+    board.collect_stats = collect_stats
+    return board
+
+
+def trusted_state(values, geometry) :
+    ''' Returns the BoardState of a Board with every cell's value
+    from values, [] in raster order with 0 for unsolved.  The
+    possibles are what Board(list of rows) would give them.
+
+    Duplicates are found in one pass, with a bitmask of
+    the values in each row, col and blk.
+
+    raise ExcBadPuzzleInput on a bad or duplicated value
+    raise ExcUnsolvable if an unsolved cell can't be anything
+    '''
+    rcb_size        = geometry.rcb_size
+    all_cell_values = geometry.all_cell_values
+    cell_units      = geometry.cell_units
+
+    # Values solved in each unit, indexed by unit_num
+    unit_masks = [0] * (len(ALL_RCB_TYPES) * rcb_size)
+    for (cell_num, value) in enumerate(values) :
+        if value :
+            if value not in all_cell_values :
+                raise ExcBadPuzzleInput( "Bad value: %d at (row,col) (%d,%d)" %
+                                         (value, cell_num // rcb_size, cell_num % rcb_size))
+            value_mask = 1 << value
+            for (rcb_type, unit_num) in enumerate(cell_units[cell_num]) :
+                if unit_masks[unit_num] & value_mask :
+                    raise ExcBadPuzzleInput( "cell#%d at (%d,%d) value:%d is duplicated in cell's %s" %
+                                             (cell_num, cell_num // rcb_size, cell_num % rcb_size,
+                                              value, RCB_NAME[rcb_type]) )
+                unit_masks[unit_num] |= value_mask
+
+    # An unsolved cell can be anything not solved in it's units
+    all_values_mask = geometry.all_values_mask
+    masks = array.array( masks_typecode(geometry), [0] * geometry.num_cells )
+    for (cell_num, (row_unit, col_unit, blk_unit)) in enumerate(cell_units) :
+        if not values[cell_num] :
+            masks[cell_num] = all_values_mask & ~(unit_masks[row_unit] | unit_masks[col_unit] | unit_masks[blk_unit])
+            if not masks[cell_num] :
+                raise ExcUnsolvable()   # It's units hold every value
+
+    return BoardState( bytes(values), masks.tobytes() )
+
+
 class Board :
     ''' Holds the representation of of a sudoku board.
     Has a solve() which will solve the Board by altering
@@ -72,6 +271,8 @@ class Board :
     Various data:
       name            Name of the board, set in constructor
       description     Description of the board, set in constructor
+      geometry        Layout of the board, i.e. it's size and the
+                      shape of it's blks.  See dinkum.sudoku.geometry
     
 
       cells           List of all Cells in raster order,
@@ -87,12 +288,49 @@ class Board :
                       statistics about solve(), e.g.
                       how long to solve, etc
 
+      trail           [] of (Cell, value, possibles_mask) recorded before
+                      every Cell change while solve() is searching.
+                      None when not searching.  See undo_trail()
+
+      num_changes     count of every Cell value/possibles change.
+                      Only goes up.  Compare two readings to tell if
+                      the board changed in between.
+
+      strategies      [] of deduction Strategy's solve_by_deduction()
+                      uses.  See dinkum.sudoku.strategies
+                      Defaults to all of them.
+
+      scheduler       StrategyScheduler which picks the order strategies
+                      are tried in.  If None (the default) each solve()
+                      gets a new one for strategies.  Set it to share one
+                      between Boards, e.g. a batch of puzzles.
+
+      collect_stats   If True, solve() and solve_by_deduction() fill in
+                      the per technique and search counters of
+                      solve_stats.  Default False, which costs nothing.
+                      See dinkum.sudoku.stats
+
+      solution_cache  SolutionCache solve() looks in first, and
+                      records it's solution in.  None (the default)
+                      is no cache.  See dinkum.sudoku.cache
+                      It's keyed by cell values, so it isn't used if
+                      any possibles have been removed that the values
+                      don't account for.
+
     Board()[row][col] can be used to get Cell at (row,col)
 
     Some useful functions (there are others)
       solve()              Trys to solve the board with guessing
       solve_by_deduction() Trys to solve the board without guessing
+      count_solutions()    How many solutions, stops counting at a limit
+      solutions()          generator of every solution
       solve_cells          solves(sets) a bunch of cells
+      from_trusted(values) A new Board, with less checking than Board()
+      snapshot()           Returns a compact, immutable copy of the Cells
+      restore(state)       Puts the Cells back the way snapshot() saw them
+      clone()              A copy of the Board, including possibles
+      to_bytes()           Packs the Board into a few bytes
+      from_bytes(packed)   A new Board from to_bytes()
 
     A Board can be specified to Board() as a list of row, e.g
         [ [1,2,3,4,5,6,7,8,9],
@@ -109,6 +347,12 @@ class Board :
             ...
 
     It can also be passed another Board, i.e. copy constructor
+
+    Boards needn't be 9x9.  The size comes from the number of rows
+    (or values in the string) and the blks are as square as can be,
+    e.g. 4x4 has 2x2 blks, 6x6 has 2x3 blks, 16x16 has 4x4 blks.
+    Values bigger than 9 are written as letters in strings, A is 10,...
+    Pass geometry to Board() for some other blk shape.
     '''
 
     # Class variables
@@ -116,15 +360,21 @@ class Board :
                          # in copy constructor.
                          # key: base board name value: # times copied
                          # see _pick_name_and_desc()
+    num_allocated   = 0  # How many Boards were ever constructed
+                         # see Stats.num_boards_allocated
 
 
-    def __init__(self, board_spec=None, name=None, desc="") :
+    def __init__(self, board_spec=None, name=None, desc="", geometry=None, assume_valid=False) :
         ''' constructor of a Board
         board_spec is list of row-lists --or--
         a string of values              --or--
-        a Board
+        a Board                         --or--
+        a BoardState, as returned by snapshot()
         If board_spec is None, an empty board will be created.
 
+        A BoardState is trusted.  It is restored as is, with
+        no error checking.  See restore()
+
         name is used as the name of the board.
         If name is None, a unique name will be chosen, something on
         the order of:
@@ -133,6 +383,14 @@ class Board :
         desc is description of the board, i.e. it's source or
         characteristics.  It defaults to empty string.
 
+        geometry is the Geometry of the board.  If None, it's picked
+        from board_spec.  An empty board is 9x9.
+
+        assume_valid says board_spec came from code known to make good
+        boards.  The values are still checked for duplicates, but in one
+        quick pass with bitmasks, and the sanity checks of the Board and
+        it's RCBs are skipped.  See from_trusted()
+
         raise ExcBadPuzzleInput if "arr" is bad
         various assertion failures if things aren't right.
         '''
@@ -140,28 +398,51 @@ class Board :
         # Deal with the name/description and statistics
         (self.name, self.description) = self._pick_name_and_desc(name, desc, board_spec)
         self.solve_stats  = Stats()
+        self.trail        = None # Not searching
+        self.num_changes  = 0    # Bumped on every Cell value/possibles change
+                                 # See Cell.record_change()
+        self.strategies   = board_spec.strategies if isinstance(board_spec, Board) else DEFAULT_STRATEGIES
+        self.scheduler    = board_spec.scheduler  if isinstance(board_spec, Board) else None
+        self.solution_cache = board_spec.solution_cache if isinstance(board_spec, Board) else None
+        self.collect_stats  = board_spec.collect_stats  if isinstance(board_spec, Board) else False
+        Board.num_allocated += 1
         
         # Convert board_spec into list of rows
         # Need to translate string into list of rows?
         if isinstance(board_spec, str) :
             try:
-                list_of_rows = str_to_list_of_rows(board_spec)
+                list_of_rows = str_to_list_of_rows(board_spec, geometry)
             except ExcBadStrToConvert :
                 raise ExcBadPuzzleInput( "Not an exact boards worth of digits in arr as string" )
 
         # Need to translate Board into list of rows?
         elif isinstance(board_spec, Board) :
             list_of_rows = board_spec.output()
+            geometry     = geometry or board_spec.geometry
         else :
             list_of_rows = board_spec
 
+        # How big are we?
+        if geometry is None :
+            if isinstance(board_spec, BoardState) :
+                geometry = geometry_for_num_cells( len(board_spec.values) )
+            elif list_of_rows :
+                try :
+                    geometry = geometry_for_rcb_size( len(list_of_rows) )
+                except ExcBadPuzzleInput :
+                    raise ExcBadPuzzleInput( "Wrong number of rows: %d" % len(list_of_rows) )
+            else :
+                geometry = DEFAULT_GEOMETRY
+        self.geometry = geometry
+        rcb_size      = geometry.rcb_size
+
         # We are generating new board from a list of row-lists
         # We create empty data structs and have set() adjust them
 
         # Create all rows/cols/blocks.  Make them empty
-        self.rows = [ RCB(RCB_TYPE_ROW, self, rcb_num) for rcb_num in range(RCB_SIZE) ] 
-        self.cols = [ RCB(RCB_TYPE_COL, self, rcb_num) for rcb_num in range(RCB_SIZE) ] 
-        self.blks = [ RCB(RCB_TYPE_BLK, self, rcb_num) for rcb_num in range(RCB_SIZE) ] 
+        self.rows = [ RCB(RCB_TYPE_ROW, self, rcb_num) for rcb_num in range(rcb_size) ] 
+        self.cols = [ RCB(RCB_TYPE_COL, self, rcb_num) for rcb_num in range(rcb_size) ] 
+        self.blks = [ RCB(RCB_TYPE_BLK, self, rcb_num) for rcb_num in range(rcb_size) ] 
 
         # Gather them all in one place
         self.rcbs = self.rows + self.cols + self.blks
@@ -171,25 +452,36 @@ class Board :
         # We pass our self in so Cell knows what board it belongs to
         # Cell() initializes the rows/cols/blks it belongs to
         # These are created in raster order
-        self.cells = [ Cell(self, cell_num) for cell_num in range(NUM_CELLS)]
+        self.cells = [ Cell(self, cell_num) for cell_num in range(geometry.num_cells)]
 
         # A separate Set of Cells that are unsolved.
         # Currently all cells are unsolved
         # Note: We use Set rather than list because set is faster than []
         self.unsolved_cells = set(self.cells)
-        assert len( self.unsolved_cells) == NUM_CELLS
+        assert len( self.unsolved_cells) == geometry.num_cells
+
+        # Populate all rows/cols/blocks with the cells
+        # the geometry tables say belong to them
+        cells = self.cells
+        for rcb in self.rcbs :
+            for cell_num in geometry.rcb_cells[rcb.rcb_type][rcb.rcb_num] :
+                rcb.initial_cell_placement(cells[cell_num])
 
-        # Populate all rows/cols/blocks
-        for cell in self.cells :
-            # Populate all the rows/cols/blks that this cell belongs to
-            self.rows[cell.row_num].initial_cell_placement(cell)
-            self.cols[cell.col_num].initial_cell_placement(cell)
-            self.blks[cell.blk_num].initial_cell_placement(cell)
+        # Restoring a snapshot?  We trust it, no checking
+        if isinstance(board_spec, BoardState) :
+            self.restore(board_spec)
+            return
+
+        # Told the input is good?  We only look for duplicates
+        if assume_valid :
+            if list_of_rows :
+                self.restore( trusted_state( _flattened_rows(list_of_rows, rcb_size), geometry ) )
+            return
 
         # We have a valid empty board at this point
-        # Sanity check all the RCBs
-        for rcb in self.rcbs :
-            rcb.sanity_check() 
+        # The RCBs were filled from the geometry's precomputed rcb_cells
+        # tables, so we don't rcb.sanity_check() them here.  That was most
+        # of the cost of construction.  test_empty_board checks them.
 
         # Is there any input to solve cells with?
         if not list_of_rows :
@@ -199,14 +491,14 @@ class Board :
 
         # Go thru and solve each cell value from our input,
         # solve() adjusts all the data structures
-        if len(list_of_rows) != RCB_SIZE :    # Sanity check input
+        if len(list_of_rows) != rcb_size :    # Sanity check input
             raise ExcBadPuzzleInput( "Wrong number of rows: %d" % len(list_of_rows) )
 
         cell_num=0
         row_num =0
         for row in list_of_rows :
             # Sanity check
-            if len(row) != RCB_SIZE :
+            if len(row) != rcb_size :
                 raise ExcBadPuzzleInput( "Row %d: Wrong size: %d" % (row_num, len(row)))
 
             col_num = 0
@@ -217,7 +509,7 @@ class Board :
                 # Skip unknown values, all data bases init'ed for all unknown
                 if value != Cell.unsolved_cell_value:
                     # Sanity check the value
-                    if value not in Cell.all_cell_values :
+                    if value not in geometry.all_cell_values :
                         raise ExcBadPuzzleInput( "Bad value: %d at (row,col) (%d,%d)" % (value, row_num, col_num))
 
                     # Common error msg for duplicate entries, which Should be formated with
@@ -252,6 +544,27 @@ class Board :
         # but we aren't time sensitive at construction time
         self.sanity_check()
 
+    @classmethod
+    def from_trusted(cls, values, name=None, desc="", geometry=None) :
+        ''' Returns a new Board with values, an iterable of every cell's
+        value in raster order, 0 for unsolved.  e.g. a list or bytes.
+        For boards made by code known to make good boards, see
+        assume_valid in Board().
+
+        geometry is the Geometry of the board.  If None, it's
+        picked from how many values there are.
+
+        raise ExcBadPuzzleInput on a bad or duplicated value
+        '''
+        values = list(values)
+        if geometry is None :
+            geometry = geometry_for_num_cells( len(values) )
+        elif len(values) != geometry.num_cells :
+            raise ExcBadPuzzleInput( "%d values, should be %d" % (len(values), geometry.num_cells) )
+
+        return cls( trusted_state(values, geometry), name, desc, geometry )
+
+
     def _pick_name_and_desc(self, name, desc, board_spec) :
         ''' returns tuple: (board_name, board_description)
         name, desc, board_spec should be the arguments passed
@@ -305,80 +618,145 @@ class Board :
         return (board_name, board_desc)
 
 
-    def solve(self) :
+    def solve(self, engine=ENGINE_SEARCH) :
         '''
-        Returns a Board that solve us.
+        Returns a Board that solve us, i.e. self.
         Return None if unsolvable
-        raise Exception on multiple solutions 
+        Multiple solutions are NOT detected, the first one found is returned.
+        Use count_solutions() for that.
+
+        engine picks how we go about it, one of ALL_ENGINES
+            ENGINE_SEARCH  (default) algorithm below
+            ENGINE_DLX     Knuth's Dancing Links, see dinkum.sudoku.dlx
+                           It has a much flatter worst case.
 
         If we can't solve the board via solve_by_deduction()
-        We try all possibles combinations.
+        We try possible values with a depth first search.
 
-        We change our values in the process
+        We change our values in the process.  If unsolvable we are
+        left as solve_by_deduction() left us.
         Sets various statistics in solve_stats
 
         Our algorithm:
 
         solve()
-            solve_by_deduction(), return on success
-
-            cell_num = most_constrained_cell_num()
-                     # pick unsolved cell with fewest possibles
-                     # if more than one
-                     #     break tie with lowest total unsolved in RCB
-                     # if still more than one
-                     #     pick the first
-
-           # Try all possibles
-           solve_results = []
-           for v in cell.possible_values
-               b=Board(self) # copy
-               b.cells[cell_num].set(v)
-               solve_results.append( b.solve() )  # recurse
-
-           if all unsolved
-              return unsolvable
-           if 1 solved
-              self = b
-              return solved
-           if >1 solved
-              return/raise multiple solutions
+            deduce, return on success
+
+            search()
+                cell_num = most_constrained_cell_num()
+                         # pick unsolved cell with fewest possibles
+                         # if more than one
+                         #     break tie with lowest total unsolved in RCB
+                         # if still more than one
+                         #     pick the first
+
+               # Try possibles until one works
+               for v in cell.possible_values
+                   mark the trail
+                   solve cell with v
+                   deduce
+                   if solved or search() (recurse)
+                       return solved
+                   undo back to the mark
+
+               return unsolvable
+
+        No Board copies are made.  Every change to a Cell while searching
+        is recorded in self.trail so that a failed guess can be rolled back
+        with undo_trail().
         '''
-        
-        return self.solve_by_deduction() ######################################
 
-        # Try to solve using logic
-        bd = self.solve_by_deduction()
-        if bd :
-            # We did
-            return bd
+        assert engine in ALL_ENGINES, "Unknown engine:" + str(engine) + " Should be one of:" + str(ALL_ENGINES)
 
-        # We are currently unsolved
-        # Pick the cell with fewest choices
-        mc_cell_num = self.most_constrained_cell_num()
-
-        # and try all possibles values for that cell
-        # We have to try all values to detect multiple solutions
-        solve_results = []
-        for value in self.cells[mc_cell_num].possible_values :
-            bd = Board(self) # Make a copy
-            bd.cells[mc_cell_num].solve(value)  # Put in value we are trying
-            
-            # Recurse and remember results
-#           solve_results.append( (bd, bd.solve() ) )
+        # fractional seconds
+        self.solve_stats.solve_start_time_secs = time.perf_counter()
+        self.solve_stats.num_solve_passes = 0
+        num_changes_at_start = self.num_changes
+
+        # The one place we look, so it costs nothing when not set
+        stats = self.solve_stats if self.collect_stats else None
+        if stats is not None :
+            stats.start_detail()
+            num_allocated_at_start = Board.num_allocated
+
+        # Solved before?  The cache only knows our values
+        cache = self.solution_cache
+        if cache is not None and not self._possibles_from_values() :
+            cache = None
+        if cache is not None :
+            cache_key = cache.key(self)
+            cached    = cache.get(cache_key)
+            if cached is not None :
+                (status, values) = cached
+                if values :
+                    masks = bytes( array.array(masks_typecode(self.geometry)).itemsize * len(values) )
+                    self.restore( BoardState(values, masks) )
+                self.solve_stats.solve_time_secs = (time.perf_counter() -
+                                                    self.solve_stats.solve_start_time_secs)
+                self.solve_stats.num_changes = self.num_changes - num_changes_at_start
+                return self if self.is_solved() else None
+
+        self._solve(engine, stats)
+
+        # Remember for next time.  Unsolved is no solution.
+        if cache is not None :
+            cache.put(cache_key, [ cell.value for cell in self.cells ] if self.is_solved() else b'')
+
+        if stats is not None :
+            stats.num_boards_allocated = Board.num_allocated - num_allocated_at_start
+
+        # All done, Remember how long we ran
+        self.solve_stats.solve_time_secs = (time.perf_counter() -
+                                            self.solve_stats.solve_start_time_secs)
+        self.solve_stats.num_changes = self.num_changes - num_changes_at_start
+
+        # Tell um how we did
+        return self if self.is_solved() else None
+
+
+    def _possibles_from_values(self) :
+        ''' Returns True if every unsolved cell's possibles are just
+        what the values solved in it's row, col and blk leave it.
+        i.e. nobody has removed possibles the values don't account for.
+        '''
+        state = self.snapshot()
+        try :
+            return trusted_state(state.values, self.geometry) == state
+        except (ExcBadPuzzleInput, ExcUnsolvable) :
+            return False
+
+
+    def _solve(self, engine, stats=None) :
+        ''' Does the work of solve(), which see, with engine.
+        stats is the Stats to count in, None for no counting.
+        '''
+        if engine == ENGINE_DLX :
+            dlx_solve(self)
+            return
+
+        # Record changes from the start so guesses can be undone
+        self.trail = []
+        scheduler  = self._pick_scheduler()
+
+        try :
+            # Try to solve using logic
+            self._deduce(scheduler, stats)
 
-        ######################################
+            # And guess if we must
+            if not self.is_solved() :
+                self._search(scheduler, stats)
 
-        # Unsolvable
-        # <todo> may not get here
-        return None
+        except ExcUnsolvable :
+            pass # Nothing to do, we just aren't solved
+
+        finally :
+            self.trail = None  # Not searching any more
 
 
     def solve_by_deduction(self) :
         '''
         Returns a Board that solve us.
         Return None if unsolvable
-        raise Exception on multiple solutions 
         Solution attempt involves no guessing.
         We change our values in the process
         Sets various statistics in solve_stats
@@ -386,62 +764,390 @@ class Board :
 
         # fractional seconds
         self.solve_stats.solve_start_time_secs = time.perf_counter()
-
-        # We try all the solution techniques we know about
-        # until board is solved.
-        # We break out of the loop and give up when the
-        # a cell wasn't solved in pass and board isn't changed in a pass
         self.solve_stats.num_solve_passes = 0
-        while not self.is_solved() :
+        num_changes_at_start = self.num_changes
+
+        # The one place we look, so it costs nothing when not set
+        stats = self.solve_stats if self.collect_stats else None
+        if stats is not None :
+            stats.start_detail()
+
+        try :
+            self._deduce( self._pick_scheduler(), stats )
+        except ExcUnsolvable :
+            pass  # We'll report it's unsolved below
+
+        # All done, Remember how long we ran
+        self.solve_stats.solve_time_secs = (time.perf_counter() -
+                                            self.solve_stats.solve_start_time_secs)
+        self.solve_stats.num_changes = self.num_changes - num_changes_at_start
+
+        # Tell um how we did
+        return self if self.is_solved() else None
+
+
+    def count_solutions(self, limit=2, engine=ENGINE_DLX) :
+        ''' Returns the number of solutions we have, but stops
+        counting when it gets to limit.  So the default of 2 answers
+        "none, one, or more than one?" without exploring the rest
+        of the search tree.  limit of None counts them all, which
+        for a puzzle with few givens could take forever.
+
+        engine is one of ALL_ENGINES, see solutions().
+        We are not changed.
+        '''
+        assert limit is None or limit >= 1, "limit must be at least 1: " + str(limit)
+
+        # DLX needn't fill in a Board to count a solution
+        if engine == ENGINE_DLX :
+            solutions = dlx_solutions(self)
+        else :
+            solutions = self._solutions(engine)
+
+        num_solutions = 0
+        for solution in solutions :
+            num_solutions += 1
+            if num_solutions == limit :
+                break  # Seen enough
+
+        return num_solutions
+
+
+    def solutions(self, engine=ENGINE_DLX) :
+        ''' generator which yields a solved Board for every
+        solution we have.  They are found lazily, the search only
+        goes as far as needed for the next one.  Yields nothing
+        if we are unsolvable.
+
+        engine is one of ALL_ENGINES.  ENGINE_SEARCH deduces at
+        every node of the search, ENGINE_DLX just searches.
+        DLX is usually quicker to step from one solution to the next.
+
+        We are not changed, the work is done on a clone().
+        '''
+        for solved in self._solutions(engine) :
+            yield solved.clone()
+
+
+    def _solutions(self, engine) :
+        ''' generator for count_solutions() and solutions().
+        Yields a Board, that is solved, for every solution.  It
+        is the same Board every time, the next one is searched for
+        in it, so copy it if you need to keep it.
+        '''
+        assert engine in ALL_ENGINES, "Unknown engine:" + str(engine) + " Should be one of:" + str(ALL_ENGINES)
+
+        board = self.clone()
+        board.strategies = self.strategies
+        board.scheduler  = self._pick_scheduler()
+        board.solve_stats.num_solve_passes = 0
+
+        if engine == ENGINE_DLX :
+            # dlx_solutions() leaves board alone, so we
+            # solve a snapshot and put it back each time
+            state = board.snapshot()
+            for solution in dlx_solutions(board) :
+                board.solve_cells( [ CellToSolve(board.cells[cell_num], value) for (cell_num, value) in solution ] )
+                yield board
+                board.restore(state)
+            return
+
+        # Record changes from the start so each guess can be undone
+        board.trail = []
+        try :
+            board._deduce(board.scheduler)
+            yield from board._search_all(board.scheduler)
+        except ExcUnsolvable :
+            pass # No solutions at all
+        finally :
+            board.trail = None
+
+
+    def _search_all(self, scheduler) :
+        ''' Like _search(), but a generator that yields
+        self every time we are solved and then keeps looking.
+        Each time the board is as it was on entry when done.
+        '''
+        if self.is_solved() :
+            yield self
+            return
+
+        # Pick the cell with fewest choices
+        cell = self.cells[ self.most_constrained_cell_num() ]
 
-            # Snapshot the board state
-            num_solved_this_pass = 0
-#################################            board_on_last_pass = Board(self)
-            board_on_last_pass = copy.deepcopy(self)
+        for value in mask_to_values(cell.possibles_mask) :
+            trail_mark = len(self.trail)
+
+            try :
+                # Put in value we are trying and see how far we get
+                self.solve_cells( [ CellToSolve(cell, value) ] )
+                self._deduce(scheduler)
+                guess_worked = True
+            except ExcUnsolvable :
+                guess_worked = False  # Wrong guess
+
+            if guess_worked :
+                yield from self._search_all(scheduler)
+
+            # Put everything back the way it was before the guess
+            self.undo_trail(trail_mark)
+
+
+    def _pick_scheduler(self) :
+        ''' Returns self.scheduler, or a new StrategyScheduler
+        for self.strategies if we don't have one.
+        '''
+        if self.scheduler is not None :
+            return self.scheduler
+        return StrategyScheduler(self.strategies)
+
+
+    def _deduce(self, scheduler, stats=None) :
+        '''
+        Solves as much of the board as it can without guessing.
+        Counts passes in solve_stats.num_solve_passes
+        stats, if not None, is the Stats to count each technique in.
+
+        Each pass has StrategyScheduler scheduler try strategies,
+        the ones that have paid off best first, until one of them
+        changes the board.  The next pass starts back at the
+        best one.  So strategies which seldom pay off are only tried
+        when all the others are stuck.
+
+        raises ExcUnsolvable if the board is found to have no solution
+        '''
+
+        # We give up when no strategy changes the board in a pass.
+        # Every change to a Cell bumps self.num_changes, so we
+        # don't have to snapshot the board
+        while not self.is_solved() :
 
             # count the # of times thru the loop
             self.solve_stats.num_solve_passes += 1
 
-            # Solve cells with only 1 possible value
-            num_solved_this_pass += self.solve_cells_with_single_possible_value()
+            if not scheduler.run_pass(self, stats) :
+                break # Nothing worked, too bad
 
-            # Solve row/col/blks where an unsolved value can only be
-            # satisfied by a single cell
-            num_solved_this_pass += self.solve_rcbs_with_single_possible_value_solution()
 
-            # Remove some possibles by looking for matching cells with same possibles
-            # and projecting that into other rcb's.  This doesn't actually solve any
-            # cells, but may modifify the board
-            num_solved_this_pass += self.solve_possibles_from_matching_cells()
+    def _search(self, scheduler, stats=None, depth=1) :
+        '''
+        Depth first search for a solution.  See solve()
+        Deduces with StrategyScheduler scheduler after each guess.
+        Returns True if we are solved, False otherwise.
 
-            # Time to bail out?
-            if num_solved_this_pass == 0   and   self == board_on_last_pass :
-                break # too bad
+        stats, if not None, is the Stats to count guesses,
+        backtracks and search depth in.  depth is how many
+        guesses deep this one is.
 
-        # All done, Remember how long we ran
-        self.solve_stats.solve_time_secs = (time.perf_counter() -
-                                            self.solve_stats.solve_start_time_secs)
+        self.trail must be a [] on entry.  On a False
+        return the board is as it was on entry.
+        '''
+        # Pick the cell with fewest choices
+        cell = self.cells[ self.most_constrained_cell_num() ]
+
+        if stats is not None and depth > stats.max_search_depth :
+            stats.max_search_depth = depth
+
+        # and try the possibles values for that cell
+        # Note: mask_to_values() returns a tuple, so cell changing
+        #       underneath us doesn't bother the iteration
+        for value in mask_to_values(cell.possibles_mask) :
+            trail_mark = len(self.trail)
+            if stats is not None :
+                stats.num_guesses += 1
+
+            try :
+                # Put in value we are trying and see how far we get
+                self.solve_cells( [ CellToSolve(cell, value) ] )
+                self._deduce(scheduler, stats)
+
+                # Recurse if needed
+                if self.is_solved() or self._search(scheduler, stats, depth + 1) :
+                    return True  # Winner
+
+            except ExcUnsolvable :
+                pass  # Wrong guess
+
+            # Put everything back the way it was before the guess
+            self.undo_trail(trail_mark)
+            if stats is not None :
+                stats.num_backtracks += 1
+
+        # No possible value worked
+        return False
+
+
+    def undo_trail(self, trail_mark) :
+        ''' Rolls back every change recorded in self.trail after
+        it's length was trail_mark.  self.trail is truncated to trail_mark.
+
+        Changes are undone in reverse order.  A Cell which was solved
+        after trail_mark is put back into unsolved_cells of the board
+        and it's RCBs.
+        '''
+        trail = self.trail
+        while len(trail) > trail_mark :
+            (cell, value, possibles_mask) = trail.pop()
+
+            # Was cell solved since this was recorded?
+            if cell.value != value :
+                # Yes, unsolve it
+                self.unsolved_cells.add(cell)
+                value_mask = ~(1 << cell.value)
+                # Each of it's RCBs, without building cell.rcbs
+                row = cell.row
+                row.unsolved_cells.add(cell)
+                row.solved_values_mask &= value_mask
+                col = cell.col
+                col.unsolved_cells.add(cell)
+                col.solved_values_mask &= value_mask
+                blk = cell.blk
+                blk.unsolved_cells.add(cell)
+                blk.solved_values_mask &= value_mask
+
+            cell.value          = value
+            cell.possibles_mask = possibles_mask
+
+
+    def snapshot(self) :
+        ''' Returns a BoardState which holds the value and possibles_mask
+        of every Cell.  It can be handed to restore() or Board() to
+        get them back.
+        '''
+        cells = self.cells
+        masks = array.array(masks_typecode(self.geometry), [ cell.possibles_mask for cell in cells ])
+        return BoardState( bytes( [ cell.value for cell in cells ] ), masks.tobytes() )
+
+
+    def restore(self, state) :
+        ''' Sets every Cell's value and possibles_mask from "state", a
+        BoardState returned by snapshot() on this or any other Board.
+        unsolved_cells of us and our RCBs are rebuilt to match.
+
+        state is trusted, no error checking is done.
+        Can't be called while solve() is searching.
+        '''
+        assert self.trail is None, "Can't restore() while searching"
+        assert len(state.values) == self.geometry.num_cells, "BoardState is for a different size Board"
+
+        masks = array.array(masks_typecode(self.geometry))
+        masks.frombytes(state.possibles_masks)
+
+        cells = self.cells
+        for (cell, value, possibles_mask) in zip(cells, state.values, masks) :
+            cell.value          = value
+            cell.possibles_mask = possibles_mask
+
+        self.unsolved_cells = set( [ cell for cell in cells if not cell.value ] )
+        for rcb in self.rcbs :
+            rcb.unsolved_cells = set( [ cell for cell in rcb if not cell.value ] )
+            solved_values_mask = 0
+            for cell in rcb :
+                solved_values_mask |= 1 << cell.value
+            rcb.solved_values_mask = solved_values_mask & self.geometry.all_values_mask
+
+        self.num_changes += 1
+
+
+    def clone(self) :
+        ''' Returns a new Board with the same Cell values and
+        possibles as us.  It's named as a copy of us, just like the
+        copy constructor Board(self).  Unlike Board(self), what
+        solve() has deduced about possibles is carried over, and
+        nothing is revalidated.
+        '''
+        (name, desc) = self._pick_name_and_desc(None, None, self)
+        return Board(self.snapshot(), name, desc, self.geometry)
+
+
+    def to_bytes(self, possibles=True) :
+        ''' Returns bytes of the Board, packed to be small.  e.g. a
+        9x9 board is 44 bytes, 136 with possibles.  from_bytes() turns
+        it back into a Board.  The name and description aren't included.
+
+            flags        1 byte, 1 if possibles are included
+            blk_height   1 byte
+            blk_width    1 byte
+            values       every cell.value in raster order, 2 to a byte
+                         (high nibble first).  1 to a byte for boards
+                         bigger than 15x15
+            possibles    if possibles is True: every cell.possibles_mask
+                         in raster order, rcb_size bits each without
+                         bit 0, as one big endian number
+        '''
+        geometry = self.geometry
+        cells    = self.cells
+        packed = bytes( [ _PACKED_HAS_POSSIBLES if possibles else 0,
+                          geometry.blk_height, geometry.blk_width ] )
+        packed += _pack_values( [ cell.value for cell in cells ], geometry.rcb_size )
+        if possibles :
+            packed += _pack_masks( [ cell.possibles_mask for cell in cells ], geometry.rcb_size )
+        return packed
+
+
+    @classmethod
+    def from_bytes(cls, packed, name=None, desc="") :
+        ''' Returns a new Board from packed, bytes returned by
+        to_bytes().  If the possibles weren't packed, they are what
+        Board(list of rows) would give them.
+
+        Packed possibles are trusted, like a BoardState.
+
+        raise ExcBadPuzzleInput if packed is bad
+        '''
+        if len(packed) < _PACKED_HEADER_SIZE :
+            raise ExcBadPuzzleInput( "Packed board too short: %d bytes" % len(packed) )
+        (flags, blk_height, blk_width) = packed[:_PACKED_HEADER_SIZE]
+        if flags & ~_PACKED_HAS_POSSIBLES :
+            raise ExcBadPuzzleInput( "Packed board has unknown flags: 0x%02x" % flags )
+        if not blk_height or not blk_width :
+            raise ExcBadPuzzleInput( "Packed board has bad blks: %dx%d" % (blk_height, blk_width) )
+        geometry_for_rcb_size(blk_height * blk_width)   # raises if unsupported
+        geometry = get_geometry(blk_height, blk_width)
+
+        values_end = _PACKED_HEADER_SIZE + _packed_values_size(geometry)
+        size = values_end
+        if flags & _PACKED_HAS_POSSIBLES :
+            size += _packed_masks_size(geometry.num_cells, geometry.rcb_size)
+        if len(packed) != size :
+            raise ExcBadPuzzleInput( "Packed %dx%d board is %d bytes, should be %d" %
+                                     (geometry.rcb_size, geometry.rcb_size, len(packed), size) )
+
+        values = _unpack_values( packed[_PACKED_HEADER_SIZE:values_end], geometry )
+        if flags & _PACKED_HAS_POSSIBLES :
+            state = BoardState( values, _unpack_masks(packed[values_end:], geometry).tobytes() )
+        else :
+            state = trusted_state(values, geometry)
+        return cls(state, name, desc, geometry)
+
+
+    def __reduce__(self) :
+        ''' pickle support.  A Board is pickled as it's to_bytes(), name,
+        description and solve_stats, not as every Cell and RCB.  The
+        strategies, scheduler and solution_cache aren't pickled, the
+        unpickled Board has the defaults.
+        '''
+        assert self.trail is None, "Can't pickle a Board while searching"
+        return ( _unpickled_board,
+                 (self.to_bytes(), self.name, self.description, self.solve_stats, self.collect_stats) )
 
-        # Tell um how we did
-        return self if self.is_solved() else None
 
-    
     def solve_cells_with_single_possible_value(self) :
         '''Solves all unsolved cells on the board that have a single possible value.
         Returns number of cells solved.
+        raises ExcUnsolvable if an unsolved cell has no possible values.
         '''
 
         # Examine all the unsolved cells, looking for ones
-        # that have only 1 possible solutions
+        # that have only 1 possible solutions, i.e. a single bit in possibles_mask
         cells_to_solve = set() # Put those cells in this set
         for cell in self.unsolved_cells :
-            if len(cell.possible_values) == 1 :
-                # Extract the only element in the set.  Leave num_possible_values intact
-                # See https://stackoverflow.com/questions/20625579/access-the-sole-element-of-a-set
-                [value] = list(cell.possible_values)
-
+            possibles_mask = cell.possibles_mask
+            if not possibles_mask :
+                raise ExcUnsolvable()   # It can't be anything
+            if not possibles_mask & (possibles_mask-1) :
                 # and solve that value into the set of CellToSolve
-                cells_to_solve.add( CellToSolve(cell, value) )
+                cells_to_solve.add( CellToSolve(cell, sole_value(possibles_mask)) )
 
 
         # solve all those Cells (and any other Cells that solution causes)
@@ -457,35 +1163,19 @@ class Board :
         num_solved = 0 # what we return
 
         # Iterate over unsolved rcbs
-        for rcb in [rcb for rcb in self.rcbs if not rcb.is_solved()] :
+        for rcb in self.rcbs :
+            if not rcb.unsolved_cells :
+                continue # solved
 
-            # Build a set() of CellToSolve's that could provide "value"
-            # We build the list and then Cell.solve() in a separate pass
+            # Find the CellToSolve's that are the only provider of "value"
+            # We build the set and then Cell.solve() in a separate pass
             # to prevent "dictionary changed size during iteration"
-            cells_to_solve = set()
-            unsolved_value_possibles = rcb.build_unsolved_value_possibles()
-            for (value, possible_cells) in unsolved_value_possibles.items() :
-                num_possibles = len(possible_cells)
-
-                # if there is a value with solving cells,
-                # something is broken as cell can't be solved
-                assert num_possibles != 0
-
-                # If there is only one such cell ....
-                if num_possibles == 1 :
-                    # We have a winner
-                    # This is the only cell in the RCB what can provide "value"
-                    # Extract the only element in the set, which is the providing cell
-                    # See https://stackoverflow.com/questions/20625579/access-the-sole-element-of-a-set
-                    [cell] = possible_cells
-
-                    # Put it in set() to be solved
-                    cells_to_solve.add( CellToSolve(cell, value))
-
-                    
+            cells_to_solve = rcb.hidden_singles()
+
             # Now solve those cells
-            num_solved += self.solve_cells( cells_to_solve )
-                    
+            if cells_to_solve :
+                num_solved += self.solve_cells( cells_to_solve )
+
         # Tell um how we did
         return num_solved
 
@@ -557,56 +1247,14 @@ class Board :
         if self.is_solved() :
             return default_answer
 
-        # pick unsolved cell with fewest possibles
-        unsolved_cells = list(self.unsolved_cells)  # set ==> list
-
-        # sorting functions
-        def by_cell_num(cell) :
-            return cell.cell_num
-        def by_num_possibles(cell) :
-            return len(cell.possible_values)
-        
-        # Put fewest possibles at head of the list
-        unsolved_cells.sort( key=by_cell_num)        # put in cell num order
-        unsolved_cells.sort( key=by_num_possibles)   # now sort by # possibles
-
-        # Eliminate all but those with fewest possible values
-        min_num_possibles = len( unsolved_cells[0].possible_values)
-        for (indx, cell) in enumerate( unsolved_cells ) :
-            if indx == 0 :
-                continue  # skip the first one
+        # We pick the smallest of (num possibles, unsolved in rcbs, cell_num)
+        # Only cells with the fewest possibles get to the tie breakers
+        def by_num_possibles_then_rcb_then_cell_num(cell) :
+            return ( popcount(cell.possibles_mask),
+                     len(cell.row.unsolved_cells) + len(cell.col.unsolved_cells) + len(cell.blk.unsolved_cells),
+                     cell.cell_num )
 
-            if len(unsolved_cells[indx].possible_values) > min_num_possibles :
-                # Remove this cell and all following
-                unsolved_cells = unsolved_cells[:indx]
-                break
-
-
-        # unsolved_cells has all the cells with minimum number of possible values
-        if len(unsolved_cells) == 1 :
-            # only one choice, we are done
-            return unsolved_cells[0].cell_num
-
-
-        # We have multiple cells with same number of possible_values
-        # First tie breaker.. The minimum sum of unsolved cells RCB
-        # Build a list of (cell, sum_of_rcb_unsolved)
-        unsolved_rcb_cnt = []
-        for c in unsolved_cells :
-            urc = 0  # count of unsolveds
-            for rcb in c.rcbs :
-                urc += len(rcb.unsolved_cells)
-            unsolved_rcb_cnt.append( (c, urc) )
-
-        # Find put minimum at head of the list
-        def by_rcb( t ) : return t[1]
-        unsolved_rcb_cnt.sort (key=by_rcb)
-
-
-        # If there is only one cell left we return it
-        # If there are multiple cells left, we return the first
-        # Both are the same
-        return unsolved_rcb_cnt[0][0].cell_num
+        return min(self.unsolved_cells, key=by_num_possibles_then_rcb_then_cell_num).cell_num
 
     def __getitem__(self, row) :
         ''' Returns our RCB at row
@@ -646,6 +1294,9 @@ class Board :
         been solved are silently ignored as long
         as they have been solved with passed in
         value in CellToSolve
+
+        raises ExcUnsolvable if a Cell is already solved with
+        a different value or value isn't one of it's possibles.
         '''
         # What we return
         num_solved = 0
@@ -656,7 +1307,11 @@ class Board :
         for (cell,value) in cells_to_solve :
             if cell.is_solved() :
                 # Already solved, make sure values match
-                assert cell.value == value
+                if cell.value != value :
+                    raise ExcUnsolvable()
+            elif not cell.possibles_mask & (1 << value) :
+                # Somebody else already took value away
+                raise ExcUnsolvable()
             else :
                 # cell not solved, put on list to solve
                 additional_cells_to_solve |= self.solve_a_cell(cell, value)
@@ -680,7 +1335,7 @@ class Board :
         Specifically
             cell.solve(value)
             remove cell from unsolved
-            for rcb in cell.rcbs()
+            for rcb in cell.row, cell.col, cell.blk
                 set(CellToSolve) |= RCB.a_cell_was_solved(cell)
             return set(CellToSolve)
         '''
@@ -692,12 +1347,10 @@ class Board :
         assert cell in self.unsolved_cells
         self.unsolved_cells.remove(cell)
 
-        # What we return
-        cells_to_solve = set()
-
-        # Iterates thru rcbs:        
-        for rcb in cell.rcbs :
-            cells_to_solve |= rcb.a_cell_was_solved(cell)
+        # Tell it's rcbs, without building cell.rcbs
+        cells_to_solve  = cell.row.a_cell_was_solved(cell)
+        cells_to_solve |= cell.col.a_cell_was_solved(cell)
+        cells_to_solve |= cell.blk.a_cell_was_solved(cell)
 
         # Tell them more cells to solve (if any)
         return cells_to_solve
@@ -717,7 +1370,7 @@ class Board :
     def num_solved(self) :
         ''' returns the number of solved cells.
         '''
-        return NUM_CELLS - self.num_unsolved()
+        return self.geometry.num_cells - self.num_unsolved()
 
 
 
@@ -726,7 +1379,7 @@ class Board :
         Same format as __init__ argument '''
 
         # Build [] of rows where every row is [] of cells in it
-        list_of_rows = [[ cell.value for cell in self.rows[row_indx]] for row_indx in range(RCB_SIZE) ]
+        list_of_rows = [[ cell.value for cell in row ] for row in self.rows ]
 
         return list_of_rows
 
@@ -747,21 +1400,26 @@ class Board :
          6 2 4  7 5 9  3 8 1
          1 7 3  8 6 2  5 9 4
 
+        Values bigger than 9 are printed as letters, so the
+        result can be handed back to Board().
         '''
+        blk_height = self.geometry.blk_height
+        blk_width  = self.geometry.blk_width
+
         ret_str = ""
         for row in self.rows :
             # row separator?
-            if row.rcb_num and not row.rcb_num % BLK_SIZE :
+            if row.rcb_num and not row.rcb_num % blk_height :
                 ret_str += '\n'
                 
             # Print the cell values
             for cell in row :
                 # Vertial block separator?
-                if cell.col_num and not cell.col_num % BLK_SIZE :
+                if cell.col_num and not cell.col_num % blk_width :
                     ret_str += ' '
 
                 # Cell's value
-                ret_str += "%2d" % cell.value
+                ret_str += ' ' + value_to_char(cell.value)
 
             ret_str += '\n'
 
@@ -817,7 +1475,7 @@ class Board :
         for (our_cell, their_cell) in zip(self.cells, their.cells) :
             if our_cell.value != their_cell.value :
                 return False  # we are NOT equal
-            if our_cell.possible_values != their_cell.possible_values :
+            if our_cell.possibles_mask != their_cell.possibles_mask :
                 return False
 
         # If we fall out, all cells matched.
@@ -828,9 +1486,11 @@ class Board :
         assert's on first failure.
         '''
 
+        rcb_size = self.geometry.rcb_size
+
         # Make sure all rows/cols/blks got populated
-        for rcb_num in range(RCB_SIZE) :
-            for indx in range(RCB_SIZE) :
+        for rcb_num in range(rcb_size) :
+            for indx in range(rcb_size) :
                 if not self.rows[rcb_num][indx] : assert "Unpopulated row:% entry:%d" % (rcb_num, indx)
                 if not self.cols[rcb_num][indx] : assert "Unpopulated col:% entry:%d" % (rcb_num, indx)
                 if not self.blks[rcb_num][indx] : assert "Unpopulated blk:% entry:%d" % (rcb_num, indx)
@@ -838,8 +1498,8 @@ class Board :
         # Make sure cells/rows/cols/blks all refer to the same cell
         # Raster scan cells/rows/cols/blks
         cell_num = 0
-        for row_num in range(RCB_SIZE) :
-            for col_num in range(RCB_SIZE) :
+        for row_num in range(rcb_size) :
+            for col_num in range(rcb_size) :
 
                 # cells[] are in raster order
                 cell = self.cells[cell_num]
@@ -884,6 +1544,7 @@ class Board :
 import unittest
 import copy
 import itertools
+import pickle
 
 class Test_board(unittest.TestCase):
     # Some CLASS-WIDE board specifications
@@ -947,6 +1608,10 @@ class Test_board(unittest.TestCase):
             # All values should be possible
             self.assertSetEqual (cell.possible_values, Cell.all_cell_values,
                                  "Cell# %d: num_possibles should have all possible values" %cell.cell_num)
+
+        # __init__ doesn't check the RCBs built from the geometry tables
+        for rcb in board.rcbs :
+            rcb.sanity_check()
                        
     def test_board_name(self) :
         name = "I never know what to call you"
@@ -1080,6 +1745,42 @@ class Test_board(unittest.TestCase):
 
         
 
+    def test_num_changes(self) :
+        board = Board(self.kato_spec_lrl)
+        start = board.num_changes
+        self.assertGreater( start, 0 ) # the givens
+
+        # Removing a possible that isn't there doesn't count
+        cell = board[0][0]
+        cell.remove_from_possibles( [ v for v in Cell.all_cell_values
+                                      if v not in cell.possible_values ] )
+        self.assertEqual( board.num_changes, start )
+
+        # Cell and RCB changes both count
+        cell.remove_from_possibles( min(cell.possible_values) )
+        self.assertEqual( board.num_changes, start+1 )
+
+        except_cell = board[0][1]
+        value = min(except_cell.possible_values)
+        num_cells_with_value = len( [ c for c in board.rows[0]
+                                      if value in c.possible_values and c is not except_cell ] )
+        board.rows[0].remove_from_possibles( value, except_cell )
+        self.assertEqual( board.num_changes, start+1+num_cells_with_value )
+
+        # A solve makes changes and reports them in solve_stats
+        board = Board(self.kato_spec_lrl)
+        start = board.num_changes
+        board.solve_by_deduction()
+        self.assertEqual( board.solve_stats.num_changes, board.num_changes - start )
+        self.assertGreater( board.solve_stats.num_changes, 0 )
+
+        # Nothing left to change once solved
+        board.solve()
+        self.assertTrue( board.is_solved() )
+        board.solve()
+        self.assertEqual( board.solve_stats.num_changes, 0 )
+
+
     def test_cell_all_neighbors(self) :
         # By rights it should be in the unittest for cell.py
         # but it can't because it would mean cyclical imports
@@ -1261,6 +1962,46 @@ class Test_board(unittest.TestCase):
         self.assertRaises(ExcBadPuzzleInput, Board, str(puzzle))
 
 
+    def test_from_trusted(self) :
+        for spec in ( self.kato_spec_lrl, self.hardest_spec_str, self.full_spec_lrl, [] ) :
+            board   = Board(spec)
+            values  = [ v for row in board.output() for v in row ]
+            trusted = Board.from_trusted(values, "trusted")
+            self.assertEqual( trusted, board )
+            self.assertEqual( trusted.name, "trusted" )
+            self.assertEqual( trusted.unsolved_cells, set( [ c for c in trusted.cells if not c.value ] ) )
+            trusted.sanity_check()   # What we skipped would have passed
+            self.assertEqual( Board(spec, assume_valid=True), board )
+
+        # Other sizes
+        geometry = get_geometry(2, 3)
+        rows = self.pattern_rows(geometry)
+        rows[0][0] = rows[4][2] = 0
+        self.assertEqual( Board.from_trusted( bytes( [ v for row in rows for v in row ] ) ),
+                          Board(rows, None, "", geometry) )
+
+        # Duplicates are still found, with the same messages
+        rows = [ list(row) for row in self.kato_spec_lrl ]
+        rows[0][0] = 6
+        for make in ( lambda : Board(rows), lambda : Board(rows, assume_valid=True),
+                      lambda : Board.from_trusted( [ v for row in rows for v in row ] ) ) :
+            with self.assertRaises(ExcBadPuzzleInput) as context :
+                make()
+            self.assertEqual( context.exception.message, "cell#2 at (0,2) value:6 is duplicated in cell's row" )
+
+        rows[0][0] = 10
+        with self.assertRaises(ExcBadPuzzleInput) as context :
+            Board(rows, assume_valid=True)
+        self.assertEqual( context.exception.message, 'Bad value: 10 at (row,col) (0,0)' )
+        self.assertRaises( ExcBadPuzzleInput, Board.from_trusted, [0] * 80 )
+        self.assertRaises( ExcBadPuzzleInput, Board.from_trusted, [0] * 80, None, "", DEFAULT_GEOMETRY )
+        self.assertRaises( ExcBadPuzzleInput, Board, rows[:8], None, "", None, True )
+
+        # An unsolved cell with nothing possible
+        dead = [0,1,2,3,4,5,6,7,8, 9] + [0] * 71
+        self.assertRaises( ExcUnsolvable, Board.from_trusted, dead )
+        self.assertRaises( ExcUnsolvable, Board.from_trusted, bytes(dead) )
+
     def test_input_duplicate_values(self) :
         some_board_spec = [ \
                             [0, 4, 6, 1, 2, 7, 9, 5, 8], # 0 row
@@ -1401,6 +2142,24 @@ class Test_board(unittest.TestCase):
         self.assertTrue  ( board.is_solved() )
 
 
+    def test_solve_cells_with_single_possible_value(self) :
+        board = Board()
+        board.cells[1].remove_from_possibles( range(1, RCB_SIZE) )
+        self.assertEqual( board.solve_cells_with_single_possible_value(), 1 )
+        self.assertEqual( board.cells[1].value, RCB_SIZE )
+
+        # A cell with no possibles isn't a single
+        board = Board()
+        board.cells[1].remove_from_possibles( range(1, RCB_SIZE+1) )
+        self.assertRaises( ExcUnsolvable, board.solve_cells_with_single_possible_value )
+
+        board = Board()
+        board.cells[1].remove_from_possibles( range(1, RCB_SIZE+1) )
+        self.assertFalse( board.solve() )
+        board = Board()
+        board.cells[1].remove_from_possibles( range(1, RCB_SIZE+1) )
+        self.assertEqual( board.count_solutions(engine=ENGINE_SEARCH), 0 )
+
     def test_common_rcbs(self) :
 
         # empty board
@@ -1449,6 +2208,330 @@ class Test_board(unittest.TestCase):
         self.assertTrue  ( board.cols[7] in ones_in_common )
 
         
+    # A puzzle that can't be solved without guessing
+    # https://www.codewars.com/kata/hard-sudoku-solver-1/train/python
+    kato_spec_lrl = [
+        [0, 0, 6, 1, 0, 0, 0, 0, 8],
+        [0, 8, 0, 0, 9, 0, 0, 3, 0],
+        [2, 0, 0, 0, 0, 5, 4, 0, 0],
+        [4, 0, 0, 0, 0, 1, 8, 0, 0],
+        [0, 3, 0, 0, 7, 0, 0, 4, 0],
+        [0, 0, 7, 9, 0, 0, 0, 0, 3],
+        [0, 0, 8, 4, 0, 0, 0, 0, 6],
+        [0, 2, 0, 0, 5, 0, 0, 8, 0],
+        [1, 0, 0, 0, 0, 2, 5, 0, 0]
+    ]
+
+    # Takes a search to solve, even with all of dinkum.sudoku.strategies
+    hardest_spec_str = "800000000003600000070090200050007000000045700000100030001000068008500010090000400"
+
+    def test_solve_by_search(self) :
+        # Can't do it by deduction
+        hardest = self.hardest_spec_str
+        board = Board(hardest)
+        self.assertIsNone( board.solve_by_deduction() )
+
+        # but can by searching
+        board = Board(hardest)
+        self.assertIs    ( board.solve(), board )
+        self.assertTrue  ( Board(hardest).is_subset_of(board) )
+        board.sanity_check()
+
+        board = Board(self.kato_spec_lrl)
+        self.assertIs    ( board.solve(), board )
+        self.assertEqual ( board.output(), self.full_spec_lrl )
+        self.assertIsNone( board.trail )   # Not searching any more
+        board.sanity_check()
+        for rcb in board.rcbs :
+            rcb.sanity_check()
+
+        # An empty board has lots of solutions, we get one of them
+        board = Board()
+        self.assertIs( board.solve(), board )
+        for rcb in board.rcbs :
+            self.assertEqual( rcb.solved_values(), Cell.all_cell_values )
+
+        # Hardest puzzle with a wrong value at (0,1), takes a search to find out
+        board = Board( hardest[0] + '2' + hardest[2:] )
+        self.assertIsNone( board.solve() )
+        for rcb in board.rcbs :
+            rcb.sanity_check()
+
+    def test_solve_engines(self) :
+        for engine in ALL_ENGINES :
+            # Hard puzzle
+            board = Board(self.kato_spec_lrl)
+            self.assertIs    ( board.solve(engine), board )
+            self.assertEqual ( board.output(), self.full_spec_lrl )
+            self.assertIsNotNone( board.solve_stats.solve_time_secs )
+
+            # Unsolvable
+            lrl = copy.deepcopy(self.kato_spec_lrl)
+            lrl[0][6] = 7
+            board = Board(lrl)
+            self.assertIsNone( board.solve(engine) )
+
+        # Unknown engine
+        self.assertRaises( AssertionError, Board().solve, "guess harder" )
+
+    def test_collect_stats(self) :
+        # Off by default
+        board = Board(self.hardest_spec_str)
+        board.solve()
+        self.assertIsNone( board.solve_stats.num_guesses )
+        self.assertIsNone( board.solve_stats.technique_calls )
+
+        board = Board(self.hardest_spec_str)
+        board.collect_stats = True
+        self.assertTrue( Board(board).collect_stats )
+        board.solve()
+        stats = board.solve_stats
+        self.assertGreater( stats.num_guesses, 0 )
+        self.assertGreater( stats.max_search_depth, 0 )
+        # Every guess but the ones on the way to the solution was undone
+        self.assertGreaterEqual( stats.num_backtracks, stats.num_guesses - stats.max_search_depth )
+        self.assertLess        ( stats.num_backtracks, stats.num_guesses )
+        self.assertEqual  ( stats.num_boards_allocated, 0 )   # Search doesn't copy Boards
+        self.assertGreater( sum( stats.technique_cells_solved.values() ), 0 )
+        self.assertGreater( stats.num_candidates_eliminated, 0 )
+        self.assertEqual  ( set(stats.technique_calls), set(stats.technique_secs) )
+        self.assertIn     ( "naked_singles", stats.technique_calls )
+        self.assertIn     ( "num_guesses: %d" % stats.num_guesses, str(stats) )
+
+        # Deduction alone doesn't guess
+        board = Board(self.kato_spec_lrl)
+        board.collect_stats = True
+        board.solve_by_deduction()
+        stats = board.solve_stats
+        self.assertEqual( stats.num_guesses, 0 )
+        self.assertEqual( sum( stats.technique_cells_solved.values() ),
+                          Board(self.kato_spec_lrl).num_unsolved() - board.num_unsolved() )
+
+    def test_solution_cache(self) :
+        from dinkum.sudoku.cache import SolutionCache
+        cache = SolutionCache(False)
+
+        board = Board(self.kato_spec_lrl)
+        board.solution_cache = cache
+        solution = board.solve().output()
+        self.assertEqual( (cache.hits, cache.misses), (0, 1) )
+
+        # Copies share it, and get the answer from it
+        again = Board(Board(self.kato_spec_lrl))
+        again.solution_cache = cache
+        self.assertIs( Board(again).solution_cache, cache )
+        self.assertTrue( again.solve(ENGINE_DLX) )
+        self.assertEqual( again.output(), solution )
+        self.assertEqual( again.num_unsolved(), 0 )
+        self.assertEqual( (cache.hits, cache.misses), (1, 1) )
+
+        # No solution is remembered too
+        # with a wrong 7 at (0,6)
+        rows = [ list(row) for row in self.kato_spec_lrl ]
+        rows[0][6] = 7
+        for i in range(2) :
+            unsolvable = Board(rows)
+            unsolvable.solution_cache = cache
+            self.assertIsNone( unsolvable.solve() )
+        self.assertEqual( (cache.hits, cache.misses), (2, 2) )
+
+        # Possibles removed that the values don't account for
+        # aren't in the key, so the cache isn't used
+        cache = SolutionCache(False)
+        board = Board()
+        board.solution_cache = cache
+        self.assertEqual( board.solve().cells[0].value, 1 )
+        narrowed = Board()
+        narrowed.cells[0].remove_from_possibles(1)
+        narrowed.solution_cache = cache
+        self.assertTrue( narrowed.solve() )
+        self.assertNotEqual( narrowed.cells[0].value, 1 )
+        self.assertEqual( (cache.hits, cache.misses, len(cache)), (0, 1, 1) )
+
+    def test_count_solutions(self) :
+        hardest = self.hardest_spec_str
+        for engine in ALL_ENGINES :
+            # Unique, we aren't changed by counting
+            board  = Board(hardest)
+            before = board.snapshot()
+            self.assertEqual( board.count_solutions(engine=engine), 1 )
+            self.assertEqual( board.snapshot(), before )
+
+            # None, takes a search to find out
+            self.assertEqual( Board( hardest[0] + '2' + hardest[2:] ).count_solutions(engine=engine), 0 )
+
+            # Lots, stops at limit
+            self.assertEqual( Board().count_solutions(engine=engine), 2 )
+            self.assertEqual( Board().count_solutions(5, engine), 5 )
+
+            # All of them.  A 4x4 board has 288
+            self.assertEqual( Board("0"*16).count_solutions(None, engine), 288 )
+
+        self.assertRaises( AssertionError, Board().count_solutions, 0 )
+
+    def test_solutions(self) :
+        for engine in ALL_ENGINES :
+            board     = Board(self.kato_spec_lrl)
+            solutions = list( board.solutions(engine) )
+            self.assertEqual( len(solutions), 1 )
+            self.assertEqual( solutions[0].output(), self.full_spec_lrl )
+            self.assertFalse( board.is_solved() )   # We weren't changed
+
+            # Lazy, the empty board has billions
+            seen = []
+            for solution in Board().solutions(engine) :
+                self.assertTrue( solution.is_solved() )
+                solution.sanity_check()
+                seen.append( solution.output() )
+                if len(seen) == 3 :
+                    break
+            self.assertEqual( len(seen), 3 )
+            for i in range(3) :
+                self.assertNotIn( seen[i], seen[i+1:] )
+
+            # Every one is different
+            outputs = [ str(solution.output()) for solution in Board("0"*16).solutions(engine) ]
+            self.assertEqual( len(outputs), len(set(outputs)) )
+            self.assertEqual( len(outputs), 288 )
+
+    def test_undo_trail(self) :
+        board = Board(self.hardest_spec_str)
+        board.solve_by_deduction()
+        before = copy.deepcopy(board)
+        before_unsolved = set( [cell.cell_num for cell in board.unsolved_cells] )
+
+        # Make a guess and deduce from it while recording
+        board.trail = []
+        cell = board.cells[ board.most_constrained_cell_num() ]
+        value = min(cell.possible_values)
+        board.solve_cells( [ CellToSolve(cell, value) ] )
+        self.assertTrue( board.trail )
+        self.assertNotEqual( board, before )
+
+        # Roll it all back
+        board.undo_trail(0)
+        self.assertEqual( board.trail, [] )
+        self.assertEqual( board, before )
+        self.assertEqual( set( [cell.cell_num for cell in board.unsolved_cells] ), before_unsolved )
+        for rcb in board.rcbs :
+            rcb.sanity_check()
+
+
+    def test_snapshot_restore(self) :
+        board = Board(self.hardest_spec_str)
+        board.solve_by_deduction()
+        before = copy.deepcopy(board)
+        state  = board.snapshot()
+
+        # Immutable and compact
+        self.assertIsInstance( state.values, bytes )
+        self.assertEqual( len(state.values), NUM_CELLS )
+        with self.assertRaises(AttributeError) :
+            state.values = b''
+
+        # Solve it, then put it back
+        board.solve()
+        self.assertTrue( board.is_solved() )
+        board.restore(state)
+        self.assertEqual( board, before )
+        self.assertEqual( board.num_unsolved(), before.num_unsolved() )
+        for rcb in board.rcbs :
+            rcb.sanity_check()
+
+        # The restored board still solves
+        self.assertTrue( board.solve() )
+
+        # Can restore onto a different board
+        empty = Board()
+        empty.restore(state)
+        self.assertEqual( empty, before )
+
+    def test_clone(self) :
+        board = Board(self.hardest_spec_str, "to-clone", "some desc")
+        board.solve_by_deduction()
+
+        clone = board.clone()
+        self.assertIsNot( clone, board )
+        self.assertEqual( clone, board )   # including possibles
+        self.assertEqual( clone.description, board.description )
+        self.assertTrue ( clone.name.startswith("to-clone-cp.") )
+        clone.sanity_check()
+        for rcb in clone.rcbs :
+            rcb.sanity_check()
+
+        # Independent of the original
+        clone.solve()
+        self.assertTrue ( clone.is_solved() )
+        self.assertFalse( board.is_solved() )
+
+        # Board() takes a snapshot too
+        self.assertEqual( Board(board.snapshot()), board )
+
+
+    def test_to_from_bytes(self) :
+        board = Board(self.hardest_spec_str, "packed", "some desc")
+        board.solve_by_deduction()
+
+        # Possibles included
+        packed = board.to_bytes()
+        self.assertEqual( len(packed), 3 + 41 + 92 )
+        unpacked = Board.from_bytes(packed, "unpacked")
+        self.assertEqual( unpacked, board )
+        self.assertEqual( unpacked.name, "unpacked" )
+        self.assertEqual( unpacked.num_unsolved(), board.num_unsolved() )
+        for rcb in unpacked.rcbs :
+            rcb.sanity_check()
+
+        # Without possibles, we get them as Board() would
+        packed = board.to_bytes(False)
+        self.assertEqual( len(packed), 3 + 41 )
+        self.assertEqual( Board.from_bytes(packed), Board( board.output() ) )
+
+        # Other sizes
+        for (h, w) in [ (2,2), (2,3), (4,4), (5,5) ] :
+            geometry = get_geometry(h, w)
+            rows = self.pattern_rows(geometry)
+            rows[0][0] = rows[h][w] = 0
+            board = Board(rows, None, "", geometry)
+            self.assertEqual( Board.from_bytes( board.to_bytes() ), board )
+            self.assertEqual( Board.from_bytes( board.to_bytes(False) ), board )
+            self.assertEqual( Board.from_bytes( board.to_bytes() ).geometry, geometry )
+
+        # Bad input
+        packed = Board(self.kato_spec_lrl).to_bytes()
+        for bad in [ b'', packed[:2], packed[:-1], packed + b'\0',
+                     b'\x02' + packed[1:], packed[:1] + b'\0' + packed[2:],
+                     packed[:1] + b'\x07\x07' + packed[3:] ] :
+            self.assertRaises( ExcBadPuzzleInput, Board.from_bytes, bad )
+
+        # Duplicate values are found without possibles
+        rows = [ list(row) for row in self.kato_spec_lrl ]
+        rows[0][0] = rows[0][2]
+        rows[0][2] = 0
+        packed = bytearray( Board(rows).to_bytes(False) )
+        packed[3] = (packed[3] & 0xf0) | rows[0][0]   # 2nd cell, duplicates the 1st
+        self.assertRaises( ExcBadPuzzleInput, Board.from_bytes, bytes(packed) )
+
+    def test_pickle(self) :
+        board = Board(self.hardest_spec_str, "to-pickle", "some desc")
+        board.collect_stats = True
+        board.solve_by_deduction()
+
+        pickled = pickle.dumps(board)
+        self.assertLess( len(pickled), 1000 )   # Every Cell and RCB was over 20K
+
+        unpickled = pickle.loads(pickled)
+        self.assertEqual( unpickled, board )
+        self.assertEqual( unpickled.name, "to-pickle" )
+        self.assertEqual( unpickled.description, "some desc" )
+        self.assertEqual( unpickled.geometry, board.geometry )
+        self.assertTrue ( unpickled.collect_stats )
+        self.assertEqual( unpickled.solve_stats.technique_calls, board.solve_stats.technique_calls )
+
+        # And it still solves
+        self.assertTrue( unpickled.solve() )
+        self.assertTrue( unpickled.is_solved() )
+
     def test_most_constrained_cell_num(self) :
         # None solved, should return cell#0
         bd = Board()
@@ -1481,7 +2564,56 @@ class Test_board(unittest.TestCase):
         lrl[2][4] = 0 # should pick this one
         bd = Board(lrl)
         self.assertEqual(2*9 + 4, bd.most_constrained_cell_num() )
-        
+
+    @staticmethod
+    def pattern_rows(geometry) :
+        ''' returns list of row-lists of a solved board for geometry '''
+        (h, w, n) = (geometry.blk_height, geometry.blk_width, geometry.rcb_size)
+        return [ [ (w*(r%h) + r//h + c) % n + 1 for c in range(n) ] for r in range(n) ]
+
+    def test_other_sizes(self) :
+        for (blk_height, blk_width) in [ (2,2), (2,3), (3,2), (4,4) ] :
+            geometry = get_geometry(blk_height, blk_width)
+            rcb_size = geometry.rcb_size
+
+            # Knock out 3/7 of the cells of a solved board
+            rows = Test_board.pattern_rows(geometry)
+            for (row_num, row) in enumerate(rows) :
+                for col_num in range(rcb_size) :
+                    if (row_num * 5 + col_num * 3) % 7 < 3 :
+                        row[col_num] = 0
+
+            for engine in ALL_ENGINES :
+                puzzle = Board(rows, "%s-%s" % (geometry.name, engine), "", geometry)
+                self.assertIs   ( puzzle.geometry, geometry )
+                self.assertEqual( len(puzzle.cells), rcb_size * rcb_size )
+
+                board = Board(puzzle)
+                self.assertIs   ( board.solve(engine), board )
+                self.assertIs   ( board.geometry, geometry )
+                self.assertTrue ( puzzle.is_subset_of(board) )
+                for rcb in board.rcbs :
+                    self.assertEqual( rcb.solved_values(), geometry.all_cell_values )
+                board.sanity_check()
+
+        # size picked from the input
+        self.assertIs( Board( [[0]*4 for i in range(4)] ).geometry, get_geometry(2,2) )
+        self.assertIs( Board( "0" * 36 ).geometry,                  get_geometry(2,3) )
+        self.assertIs( Board( "0" * 256 ).geometry,                 get_geometry(4,4) )
+        self.assertIs( Board().geometry,                            DEFAULT_GEOMETRY  )
+
+        # 16x16 writes values bigger than 9 as letters, and reads them back
+        sixteen = Board( Test_board.pattern_rows(get_geometry(4,4)) )
+        self.assertIs   ( sixteen.geometry, get_geometry(4,4) )
+        self.assertIn   ( " G", str(sixteen) )
+        self.assertEqual( Board(str(sixteen)).output(), sixteen.output() )
+        self.assertEqual( sixteen.clone(), sixteen )
+
+        with self.assertRaises(ExcBadPuzzleInput) :
+            Board( [[0]*5 for i in range(5)] )
+        with self.assertRaises(ExcBadPuzzleInput) :
+            Board( [[0]*4 for i in range(4)], geometry=DEFAULT_GEOMETRY )
+
 
 if __name__ == "__main__" :
     # Run the unittests
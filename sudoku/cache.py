@@ -0,0 +1,426 @@
+#!/usr/bin/env python3
+# dinkum/sudoku/cache.py
+''' A cache of puzzle solutions, so a puzzle that has been solved
+before needn't be solved again.
+
+A SolutionCache has two levels:
+    memory    The most recently used max_entries, in an OrderedDict
+              kept in LRU order.  A hit costs a hash and a dict lookup.
+    disk      An sqlite3 file, by default in the dinkum.sudoku state
+              space (see dinkum.utils.state_space), so entries are
+              shared between processes and outlive them.  Least
+              recently used entries are evicted when it holds more than
+              max_disk_entries, each about 100 bytes for a 9x9 board.
+
+The key is a 16 byte blake2b hash of the Board's size and cell values.
+Possibles aren't in it, so Board.solve() doesn't use the cache for a
+Board with possibles removed that it's values don't account for.
+With canonical=True it's the hash of the canonical form instead (see
+dinkum.sudoku.canonical), so every puzzle isomorphic to one that's been
+solved is a hit.  Finding the canonical form costs about 20 msec for
+a 9x9 board, so that only pays when solves cost more than that.
+
+Each entry records what's known about the puzzle, one of:
+    CACHE_UNSOLVABLE   no solution
+    CACHE_SOLVED       a solution, maybe there are others
+    CACHE_UNIQUE       the only solution
+    CACHE_MULTIPLE     a solution, and there are others
+Board.solve() only learns CACHE_SOLVED, kata.sudoku_solver() learns
+the others.  What's known is never forgotten by a later put() of
+CACHE_SOLVED.
+
+hits, disk_hits and misses count get()s.  hits includes disk_hits.
+
+Some useful functions:
+    SolutionCache(...)         A new cache, see it's __init__
+    cache.key(board)           ==> CacheKey for board as it is now
+    cache.get(key)             ==> (status, solution values) or None
+    cache.put(key, values, status)
+    default_solution_cache()   ==> The SolutionCache in state space
+'''
+
+# 2026-10-18 tc Initial
+
+from dinkum.sudoku          import * # All package wide def's
+from dinkum.utils.state_space import state_filename
+
+import collections
+import hashlib
+import os
+import sqlite3
+
+# What's known about a puzzle
+CACHE_UNSOLVABLE = 0
+CACHE_SOLVED     = 1
+CACHE_UNIQUE     = 2
+CACHE_MULTIPLE   = 3
+
+# What's in state space
+cache_filename = "solution_cache.sqlite3"
+
+
+class CacheKey(collections.namedtuple('CacheKey', 'digest transform')) :
+    ''' What SolutionCache.key() returns:
+        digest     bytes, the hash of the puzzle
+        transform  canonical.Transform to it's canonical form, or None
+                   if the cache isn't canonical
+    '''
+    __slots__ = ()
+
+
+class SolutionCache :
+    ''' An LRU cache of puzzle solutions, in memory and on disk.
+    See module doc.
+
+    Usage:
+        key   = cache.key(board)
+        entry = cache.get(key)
+        if entry is None :
+            ... solve board ...
+            cache.put(key, solution_values)
+    '''
+
+    def __init__(self, filename=None, max_entries=10000, max_disk_entries=1000000,
+                 canonical=False) :
+        ''' filename is the sqlite3 file entries are kept in.  None is
+        cache_filename in the dinkum.sudoku state space.  False keeps
+        them in memory only.
+
+        max_entries is the most entries kept in memory, 0 is none.
+        max_disk_entries is the most kept on disk.
+
+        canonical keys puzzles by their canonical form, see module doc.
+        '''
+        if filename is None :
+            (filename, exists, dirs_created) = state_filename(__name__, cache_filename, True, 1)
+
+        self.filename         = filename
+        self.max_entries      = max_entries
+        self.max_disk_entries = max_disk_entries
+        self.canonical        = canonical
+
+        self.hits      = 0  # get()s that found an entry
+        self.disk_hits = 0  # ... on disk, not in memory
+        self.misses    = 0  # get()s that didn't
+
+        # key: digest  value: (status, solution values)
+        # Least recently used first
+        self._memory = collections.OrderedDict()
+
+        # Opened on first use.  A connection can't be shared
+        # with a forked child, so _db_pid is who opened it.
+        self._db     = None
+        self._db_pid = None
+        self._num_disk_entries = None
+
+
+    def key(self, board) :
+        ''' Returns the CacheKey of Board board, as it is now '''
+        geometry = board.geometry
+        if self.canonical :
+            from dinkum.sudoku.canonical import canonical_form  # canonical imports board
+            (canonical_str, transform) = canonical_form(board)
+            values = canonical_str.encode()
+        else :
+            transform = None
+            values    = bytes( [ cell.value for cell in board.cells ] )
+
+        digest = hashlib.blake2b( bytes( [geometry.blk_height, geometry.blk_width] ) + values,
+                                  digest_size=16 ).digest()
+        return CacheKey(digest, transform)
+
+
+    def get(self, key) :
+        ''' Returns (status, solution values) for CacheKey key, or None
+        if we don't have it.  status is one of CACHE_*.  solution values is
+        bytes of every cell's value in raster order, empty if CACHE_UNSOLVABLE.
+        '''
+        digest = key.digest
+        entry = self._memory.get(digest)
+        if entry is not None :
+            self._memory.move_to_end(digest)
+        else :
+            entry = self._disk_get(digest)
+            if entry is None :
+                self.misses += 1
+                return None
+            self.disk_hits += 1
+            self._remember(digest, entry)
+
+        self.hits += 1
+        (status, values) = entry
+        if key.transform is not None and values :
+            values = _from_canonical(values, key.transform)
+        return (status, values)
+
+
+    def put(self, key, values, status=None) :
+        ''' Records values as the solution of the puzzle of CacheKey key.
+        values is anything bytes() takes of every cell's value in raster
+        order, empty if there is no solution.  status is one of CACHE_*,
+        None is CACHE_SOLVED, or CACHE_UNSOLVABLE if values is empty.
+
+        CACHE_SOLVED doesn't replace what we already know.
+        '''
+        digest = key.digest
+        values = bytes(values)
+        if status is None :
+            status = CACHE_SOLVED if values else CACHE_UNSOLVABLE
+        if key.transform is not None and values :
+            values = _to_canonical(values, key.transform)
+
+        if status == CACHE_SOLVED :
+            known = self._memory.get(digest) or self._disk_get(digest)
+            if known is not None and known[0] != CACHE_SOLVED :
+                return
+
+        entry = (status, values)
+        self._remember(digest, entry)
+        self._disk_put(digest, entry)
+
+
+    def clear(self) :
+        ''' Forgets every entry, on disk too, and zeros the counters '''
+        self._memory.clear()
+        db = self._connection()
+        if db is not None :
+            with db :
+                db.execute("DELETE FROM solutions")
+            self._num_disk_entries = 0
+        self.hits = self.disk_hits = self.misses = 0
+
+
+    def close(self) :
+        ''' Closes the disk file.  We reopen it if used again. '''
+        if self._db is not None and self._db_pid == os.getpid() :
+            self._db.close()
+        self._db = None
+
+
+    def __len__(self) :
+        ''' Returns # of entries in memory '''
+        return len(self._memory)
+
+
+    def __str__(self) :
+        ''' e.g. "hits:10 (disk:2) misses:3 entries:11" '''
+        return "hits:%d (disk:%d) misses:%d entries:%d" % (self.hits, self.disk_hits,
+                                                           self.misses, len(self))
+
+
+    def _remember(self, digest, entry) :
+        ''' Puts entry in memory as most recently used, evicting
+        the least recently used if there are too many.
+        '''
+        memory = self._memory
+        memory[digest] = entry
+        memory.move_to_end(digest)
+        while len(memory) > self.max_entries :
+            memory.popitem(last=False)
+
+
+    def _connection(self) :
+        ''' Returns the sqlite3 connection to our file, opening
+        (and creating) it if need be.  None if we have no file.
+        '''
+        if not self.filename :
+            return None
+        if self._db is None or self._db_pid != os.getpid() :
+            db = sqlite3.connect(self.filename, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")    # Readers don't wait on writers
+            db.execute("PRAGMA synchronous=NORMAL")  # No fsync per put()
+            db.execute("CREATE TABLE IF NOT EXISTS solutions "
+                       "(digest BLOB PRIMARY KEY, status INTEGER, solution BLOB, last_used INTEGER)")
+            db.execute("CREATE INDEX IF NOT EXISTS solutions_last_used ON solutions (last_used)")
+            db.commit()
+            (self._db, self._db_pid) = (db, os.getpid())
+            self._num_disk_entries = db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+        return self._db
+
+
+    def _disk_get(self, digest) :
+        ''' Returns (status, values) for digest from disk, None if not there.
+        Marks it most recently used.
+        '''
+        db = self._connection()
+        if db is None :
+            return None
+        row = db.execute("SELECT status, solution FROM solutions WHERE digest = ?",
+                         (digest,)).fetchone()
+        if row is None :
+            return None
+        with db :
+            db.execute("UPDATE solutions SET last_used = (SELECT COALESCE(MAX(last_used), 0) + 1 FROM solutions) "
+                       "WHERE digest = ?", (digest,))
+        return (row[0], bytes(row[1]))
+
+
+    def _disk_put(self, digest, entry) :
+        ''' Writes (status, values) entry for digest to disk, as most
+        recently used, evicting the least recently used if there are
+        too many.
+        '''
+        db = self._connection()
+        if db is None :
+            return
+        (status, values) = entry
+        with db :
+            db.execute("INSERT OR REPLACE INTO solutions (digest, status, solution, last_used) "
+                       "VALUES (?, ?, ?, (SELECT COALESCE(MAX(last_used), 0) + 1 FROM solutions))",
+                       (digest, status, values))
+        self._num_disk_entries += 1  # Maybe a replace, counted exactly when we evict
+
+        if self._num_disk_entries > self.max_disk_entries :
+            with db :
+                # Down to 90% so we don't evict on every put()
+                keep = self.max_disk_entries * 9 // 10
+                db.execute("DELETE FROM solutions WHERE digest NOT IN "
+                           "(SELECT digest FROM solutions ORDER BY last_used DESC LIMIT ?)", (keep,))
+            self._num_disk_entries = db.execute("SELECT COUNT(*) FROM solutions").fetchone()[0]
+
+
+def _rows_of(values, rcb_size) :
+    return [ list( values[row_start:row_start + rcb_size] )
+             for row_start in range(0, len(values), rcb_size) ]
+
+
+def _to_canonical(values, transform) :
+    ''' Returns raster order bytes values turned into their canonical form '''
+    rows = transform.to_canonical( _rows_of(values, len(transform.row_order)) )
+    return bytes( [ value for row in rows for value in row ] )
+
+
+def _from_canonical(values, transform) :
+    ''' Returns canonical raster order bytes values turned back '''
+    rows = transform.from_canonical( _rows_of(values, len(transform.row_order)) )
+    return bytes( [ value for row in rows for value in row ] )
+
+
+# The one default_solution_cache() returns
+_default_solution_cache = None
+
+def default_solution_cache() :
+    ''' Returns the SolutionCache in the dinkum.sudoku state space,
+    creating it on first call.  A new one is made if the state
+    root has moved, see dinkum.utils.state_space.set_state_root()
+    '''
+    global _default_solution_cache
+    (filename, exists, dirs_created) = state_filename(__name__, cache_filename, True, 1)
+    if _default_solution_cache is None or _default_solution_cache.filename != filename :
+        if _default_solution_cache is not None :
+            _default_solution_cache.close()
+        _default_solution_cache = SolutionCache(filename)
+    return _default_solution_cache
+
+
+# Test code
+import unittest
+import tempfile
+import dinkum.sudoku.board
+from dinkum.utils.state_space import set_state_root, reset_state_root
+
+class Test_cache(unittest.TestCase):
+
+    def setUp(self) :
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.filename = os.path.join(self.tmpdir.name, cache_filename)
+
+    def tearDown(self) :
+        self.tmpdir.cleanup()
+
+    def test_memory(self) :
+        cache = SolutionCache(False, max_entries=2)
+        boards = [ dinkum.sudoku.board.Board(spec) for spec in
+                   ( dinkum.sudoku.board.Test_board.kato_spec_lrl,
+                     dinkum.sudoku.board.Test_board.hardest_spec_str,
+                     "0" * NUM_CELLS ) ]
+        keys = [ cache.key(board) for board in boards ]
+        self.assertEqual( len(set(keys)), 3 )
+        self.assertEqual( len(keys[0].digest), 16 )
+
+        self.assertIsNone( cache.get(keys[0]) )
+        cache.put(keys[0], b'\x01' * NUM_CELLS)
+        cache.put(keys[1], b'')
+        self.assertEqual( cache.get(keys[0]), (CACHE_SOLVED, b'\x01' * NUM_CELLS) )
+
+        # keys[1] is least recently used
+        cache.put(keys[2], b'\x02' * NUM_CELLS, CACHE_MULTIPLE)
+        self.assertEqual( len(cache), 2 )
+        self.assertIsNone( cache.get(keys[1]) )
+        self.assertEqual( cache.get(keys[2])[0], CACHE_MULTIPLE )
+        self.assertEqual( (cache.hits, cache.disk_hits, cache.misses), (2, 0, 2) )
+
+        # Known isn't replaced by SOLVED
+        cache.put(keys[2], b'\x03' * NUM_CELLS)
+        self.assertEqual( cache.get(keys[2]), (CACHE_MULTIPLE, b'\x02' * NUM_CELLS) )
+        cache.put(keys[2], b'\x03' * NUM_CELLS, CACHE_UNIQUE)
+        self.assertEqual( cache.get(keys[2])[0], CACHE_UNIQUE )
+
+    def test_disk(self) :
+        board = dinkum.sudoku.board.Board(dinkum.sudoku.board.Test_board.kato_spec_lrl)
+        cache = SolutionCache(self.filename)
+        key   = cache.key(board)
+        cache.put(key, b'\x05' * NUM_CELLS, CACHE_UNIQUE)
+        cache.close()
+
+        # Another cache (or process) sees it
+        other = SolutionCache(self.filename)
+        self.assertEqual( other.get(key), (CACHE_UNIQUE, b'\x05' * NUM_CELLS) )
+        self.assertEqual( (other.hits, other.disk_hits), (1, 1) )
+        self.assertEqual( other.get(key), (CACHE_UNIQUE, b'\x05' * NUM_CELLS) )
+        self.assertEqual( (other.hits, other.disk_hits), (2, 1) )
+
+        other.clear()
+        self.assertIsNone( SolutionCache(self.filename).get(key) )
+
+    def test_disk_eviction(self) :
+        cache = SolutionCache(self.filename, max_entries=0, max_disk_entries=10)
+        keys = [ CacheKey( bytes([i]) * 16, None ) for i in range(20) ]
+        for key in keys[:10] :
+            cache.put(key, b'')
+        self.assertIsNotNone( cache.get(keys[0]) )  # Now most recently used
+
+        for key in keys[10:12] :
+            cache.put(key, b'')
+        self.assertEqual( len(cache), 0 )
+        self.assertIsNotNone( cache.get(keys[0])  )
+        self.assertIsNotNone( cache.get(keys[11]) )
+        self.assertIsNone   ( cache.get(keys[1])  )
+        self.assertLessEqual( cache._connection().execute("SELECT COUNT(*) FROM solutions").fetchone()[0], 10 )
+
+    def test_canonical(self) :
+        import random
+        from dinkum.sudoku.canonical import Test_canonical
+        board = dinkum.sudoku.board.Board(Test_canonical.puzzle_str)
+        isomorph = dinkum.sudoku.board.Board( Test_canonical.random_isomorph(board.output(), random.Random(4)) )
+
+        cache = SolutionCache(False, canonical=True)
+        key = cache.key(board)
+        solution = bytes( [ v for row in dinkum.sudoku.board.Board(board).solve().output() for v in row ] )
+        cache.put(key, solution, CACHE_UNIQUE)
+        self.assertEqual( cache.get(key), (CACHE_UNIQUE, solution) )
+
+        # The isomorph gets it's own solution
+        (status, values) = cache.get( cache.key(isomorph) )
+        self.assertEqual( values, bytes( [ v for row in dinkum.sudoku.board.Board(isomorph).solve().output() for v in row ] ) )
+
+    def test_default(self) :
+        try :
+            set_state_root(self.tmpdir.name, True)
+            cache = default_solution_cache()
+            self.assertIs( default_solution_cache(), cache )
+            self.assertTrue( cache.filename.startswith(self.tmpdir.name) )
+            self.assertTrue( cache.filename.endswith("/dinkum/sudoku/" + cache_filename) )
+
+            # Moving the state root moves it
+            other_root = os.path.join(self.tmpdir.name, "other")
+            set_state_root(other_root, True)
+            self.assertTrue( default_solution_cache().filename.startswith(other_root) )
+            default_solution_cache().close()
+        finally :
+            reset_state_root()
+
+
+if __name__ == "__main__" :
+    # Run the unittests
+    unittest.main()
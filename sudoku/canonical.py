@@ -0,0 +1,311 @@
+#!/usr/bin/env python3
+# dinkum/sudoku/canonical.py
+''' Canonical form of a sudoku puzzle.
+
+These don't change whether a puzzle can be solved, or how:
+    relabeling the values, e.g. swapping every 1 and 7
+    reordering the rows within a band of blks, and the bands
+    reordering the cols within a stack of blks, and the stacks
+    transposing, i.e. swapping rows and cols (square blks only)
+Puzzles which one of those turns into another are isomorphic.
+
+canonical_form(board) picks one of each family of isomorphic puzzles
+as the canonical one.  Two puzzles have the same canonical form iff they
+are isomorphic.  So it can be used to dedupe a corpus, or as the key
+of a solution cache.  Along with it comes the Transform which turns
+board into it.  Transform.from_canonical() turns a solution of the
+canonical form into a solution of board.
+
+The canonical form is the smallest in raster order, comparing value
+by value, of everything the above can make of the puzzle.  Blanks are
+0, and values are relabeled 1, 2, 3, ... in the order they show up.
+
+It's found a row at a time.  We keep every way of getting the
+smallest first k rows, and extend each of them by every row the
+band structure allows next, under every col order they allow.
+Ways which tie, and can't come out differently, are merged.  While
+all the rows so far are blank, the col order isn't picked, so nearly
+empty boards don't blow up.
+
+The col orders are all listed, 1296 for 9x9 boards.  Boards bigger
+than about 9x9 have far too many.
+
+Some useful functions:
+    canonical_form(board)  ==> (str of canonical values, Transform)
+    canonical_board(board) ==> (canonical Board, Transform)
+'''
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc canonical_board() makes it's Board with assume_valid
+
+from dinkum.sudoku          import * # All package wide def's
+from dinkum.sudoku.geometry import value_to_char
+from dinkum.sudoku.board    import Board
+
+import collections
+import itertools
+
+class Transform(collections.namedtuple('Transform', 'transpose row_order col_order relabel')) :
+    ''' How a puzzle is turned into it's canonical form:
+        transpose   True if rows and cols are swapped first
+        row_order   tuple, row i of the canonical form is row row_order[i]
+                    of the (maybe transposed) puzzle
+        col_order   tuple, ditto for cols
+        relabel     tuple, value v becomes relabel[v].  relabel[0] is 0.
+
+    Works on [] of row-lists, as returned by Board.output()
+    '''
+    __slots__ = ()
+
+    def to_canonical(self, rows) :
+        ''' Returns rows turned into their canonical form '''
+        if self.transpose :
+            rows = _transposed(rows)
+        relabel = self.relabel
+        return [ [ relabel[ rows[row_num][col_num] ] for col_num in self.col_order ]
+                 for row_num in self.row_order ]
+
+    def from_canonical(self, rows) :
+        ''' Returns canonical rows turned back into the original.
+        e.g. the solution to the original from the solution to
+        the canonical form.
+        '''
+        unlabel = [0] * len(self.relabel)
+        for (value, label) in enumerate(self.relabel) :
+            unlabel[label] = value
+
+        original = [ [0] * len(self.col_order) for row_num in self.row_order ]
+        for (canonical_row, row_num) in zip(rows, self.row_order) :
+            for (value, col_num) in zip(canonical_row, self.col_order) :
+                original[row_num][col_num] = unlabel[value]
+
+        return _transposed(original) if self.transpose else original
+
+
+def _transposed(rows) :
+    return [ list(col) for col in zip(*rows) ]
+
+
+# key: (num_groups, group_size) value: [] of line orders
+_line_orders_cache = {}
+
+def line_orders(num_groups, group_size) :
+    ''' Returns [] of every order of num_groups*group_size lines (rows or
+    cols) that keeps groups of group_size together, e.g. the rows of
+    a band.  Each is a tuple of line#s.
+    '''
+    key = (num_groups, group_size)
+    orders = _line_orders_cache.get(key)
+    if orders is None :
+        within = list( itertools.permutations( range(group_size) ) )
+        orders = []
+        for group_order in itertools.permutations( range(num_groups) ) :
+            for within_orders in itertools.product(within, repeat=num_groups) :
+                orders.append( tuple( [ group_num * group_size + idx
+                                        for (group_num, within_order) in zip(group_order, within_orders)
+                                        for idx in within_order ] ) )
+        orders = _line_orders_cache[key] = orders
+    return orders
+
+
+def canonical_form(board) :
+    ''' Returns (str of canonical values in raster order, Transform)
+    for Board board.  See module doc.
+    '''
+    geometry = board.geometry
+    (h, w, n) = (geometry.blk_height, geometry.blk_width, geometry.rcb_size)
+
+    rows = board.output()
+    grids = [ (False, rows) ]
+    if h == w :
+        grids.append( (True, _transposed(rows)) )
+
+    # Rows come in w bands of h, cols in h stacks of w
+    col_orders = line_orders(h, w)
+
+    # A state is one way to get the smallest rows so far:
+    #    (transpose, grid, row_order, col_order, relabel, next_label)
+    # col_order is None while every row so far is blank
+    states = [ (transpose, grid, (), None, (0,) * (n+1), 1) for (transpose, grid) in grids ]
+
+    for row_num in range(n) :
+        best_row   = None
+        best_nexts = {}   # key: what decides the future  value: state
+        for state in states :
+            (transpose, grid, row_order, col_order, relabel, next_label) = state
+
+            # Which rows can be next?
+            if row_num % h :
+                band = row_order[-1] // h
+                candidates = range(band * h, band * h + h)
+            else :
+                used_bands = set( [ used // h for used in row_order ] )
+                candidates = [ r for r in range(n) if r // h not in used_bands ]
+
+            for next_row in candidates :
+                if next_row in row_order :
+                    continue
+                line = grid[next_row]
+
+                # All blank doesn't pick a col order
+                if col_order is None and not any(line) :
+                    orders = [ None ]
+                else :
+                    orders = col_orders if col_order is None else [ col_order ]
+
+                for order in orders :
+                    relabeled = _relabeled_row(line, order, relabel, next_label, best_row)
+                    if relabeled is None :
+                        continue  # Bigger than best_row
+                    (row, new_relabel, new_next_label) = relabeled
+                    if best_row is None or row < best_row :
+                        best_row   = row
+                        best_nexts = {}
+
+                    new_row_order = row_order + (next_row,)
+                    key = (transpose, frozenset(new_row_order), order, new_relabel)
+                    if key not in best_nexts :
+                        best_nexts[key] = (transpose, grid, new_row_order, order, new_relabel, new_next_label)
+
+        states = list( best_nexts.values() )
+
+    # Any of the states left will do, they all make the same thing
+    (transpose, grid, row_order, col_order, relabel, next_label) = states[0]
+    if col_order is None :
+        col_order = tuple(range(n))   # All blank
+
+    # Values not in the puzzle get what's left, so relabel is a permutation
+    relabel = list(relabel)
+    for value in range(1, n+1) :
+        if not relabel[value] :
+            relabel[value] = next_label
+            next_label += 1
+
+    transform = Transform(transpose, row_order, col_order, tuple(relabel))
+    canonical_rows = transform.to_canonical(rows)
+    return ( ''.join( [ value_to_char(value) for row in canonical_rows for value in row ] ), transform )
+
+
+def _relabeled_row(line, col_order, relabel, next_label, best_row=None) :
+    ''' Returns (tuple of line's values in col_order, relabeled,
+                 relabel with any new values added,
+                 next_label after them)
+    or None as soon as it's known that the row would be bigger
+    than best_row.
+    col_order of None is only allowed if line is blank.
+    '''
+    if col_order is None :
+        return ( (0,) * len(line), relabel, next_label )
+
+    row = []
+    new_relabel = None
+    still_equal = best_row is not None  # to best_row so far
+    for col_num in col_order :
+        value = line[col_num]
+        if value :
+            label = (new_relabel or relabel)[value]
+            if not label :
+                if new_relabel is None :
+                    new_relabel = list(relabel)
+                label = new_relabel[value] = next_label
+                next_label += 1
+        else :
+            label = 0
+
+        if still_equal :
+            best_label = best_row[len(row)]
+            if label > best_label :
+                return None
+            still_equal = label == best_label
+        row.append(label)
+
+    return ( tuple(row), tuple(new_relabel) if new_relabel else relabel, next_label )
+
+
+def canonical_board(board) :
+    ''' Returns (canonical Board, Transform) for Board board.
+    See canonical_form()
+    '''
+    (canonical_str, transform) = canonical_form(board)
+    canonical = Board(transform.to_canonical( board.output() ),
+                      board.name + "-canonical", board.description, board.geometry,
+                      assume_valid=True)  # An isomorph of a good board
+    return (canonical, transform)
+
+
+# Test code
+import unittest
+import random
+import dinkum.sudoku.board
+
+class Test_canonical(unittest.TestCase):
+
+    puzzle_str = "100000569492056108056109240009640801064010000218035604040500016905061402621000005"
+
+    @staticmethod
+    def random_isomorph(rows, rng, h=3, w=3) :
+        ''' Returns rows with random symmetries applied '''
+        n = len(rows)
+        if h == w and rng.random() < 0.5 :
+            rows = _transposed(rows)
+        row_order = rng.choice( line_orders(w, h) )
+        col_order = rng.choice( line_orders(h, w) )
+        values = list(range(1, n+1))
+        rng.shuffle(values)
+        relabel = [0] + values
+        return [ [ relabel[rows[r][c]] for c in col_order ] for r in row_order ]
+
+    def test_line_orders(self) :
+        self.assertEqual( len(line_orders(3, 3)), 1296 )
+        self.assertEqual( len(line_orders(2, 3)), 72   )
+        self.assertIn   ( (3,4,5, 0,1,2, 6,7,8), line_orders(3, 3) )
+        self.assertNotIn( (0,1,3, 2,4,5, 6,7,8), line_orders(3, 3) )
+
+    def test_isomorphs(self) :
+        rng = random.Random(1)
+        for spec in [ self.puzzle_str, dinkum.sudoku.board.Test_board.hardest_spec_str ] :
+            board = dinkum.sudoku.board.Board(spec)
+            (canonical_str, transform) = canonical_form(board)
+            for i in range(5) :
+                isomorph = dinkum.sudoku.board.Board( self.random_isomorph(board.output(), rng) )
+                self.assertEqual( canonical_form(isomorph)[0], canonical_str )
+
+        # Different puzzles are different
+        self.assertNotEqual( canonical_form( dinkum.sudoku.board.Board(self.puzzle_str) )[0],
+                             canonical_form( dinkum.sudoku.board.Board(dinkum.sudoku.board.Test_board.hardest_spec_str) )[0] )
+
+    def test_transform(self) :
+        board = dinkum.sudoku.board.Board( self.random_isomorph( dinkum.sudoku.board.Board(self.puzzle_str).output(),
+                                                                 random.Random(2) ) )
+        (canonical, transform) = canonical_board(board)
+        self.assertEqual( sorted(transform.relabel), list(range(NUM_CELLS // RCB_SIZE + 1)) )
+        self.assertEqual( transform.from_canonical( canonical.output() ), board.output() )
+        self.assertEqual( ''.join( [ str(v) for row in canonical.output() for v in row ] ),
+                          canonical_form(board)[0] )
+
+        # Solve the canonical form and map it back
+        solution = transform.from_canonical( canonical.solve().output() )
+        self.assertEqual( solution, dinkum.sudoku.board.Board(board).solve().output() )
+
+    def test_empty_and_small(self) :
+        (canonical_str, transform) = canonical_form( dinkum.sudoku.board.Board() )
+        self.assertEqual( canonical_str, "0" * NUM_CELLS )
+        self.assertEqual( transform.from_canonical( [ [0]*9 ]*9 ), [ [0]*9 ]*9 )
+
+        # 6x6 has 2x3 blks, no transposing
+        geometry = dinkum.sudoku.board.get_geometry(2, 3)
+        rows = dinkum.sudoku.board.Test_board.pattern_rows(geometry)
+        rows[0][0] = rows[3][4] = rows[5][1] = 0
+        board = dinkum.sudoku.board.Board(rows, None, "", geometry)
+        (canonical_str, transform) = canonical_form(board)
+        self.assertFalse( transform.transpose )
+
+        rng = random.Random(3)
+        for i in range(5) :
+            isomorph = dinkum.sudoku.board.Board( self.random_isomorph(rows, rng, 2, 3), None, "", geometry )
+            self.assertEqual( canonical_form(isomorph)[0], canonical_str )
+
+
+if __name__ == "__main__" :
+    # Run the unittests
+    unittest.main()
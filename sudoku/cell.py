@@ -23,18 +23,33 @@ a value to set it to.
 #               remove_from_possibles() accepts value or values
 #                                       adjust possibles only
 #                                       return true if they changed
+# 2026-10-18 tc possible_values is now a view of possibles_mask
+# 2026-10-18 tc Changes are recorded on board.trail when searching
+# 2026-10-18 tc record_change() bumps board.num_changes
+# 2026-10-18 tc row/col/blk nums and idxs and neighbors come from
+#               dinkum.sudoku.geometry tables
+# 2026-10-18 tc __slots__, rcbs is a property
+# 2026-10-18 tc boards other than 9x9.  See geometry
 
-from dinkum.sudoku import *  # Get package wide constants from __init__.py
+from dinkum.sudoku         import *  # Get package wide constants from __init__.py
+from dinkum.sudoku.bitmask import *
+from dinkum.sudoku.geometry import DEFAULT_GEOMETRY, value_to_char
 
 
 class Cell :
     ''' Represents a single cell on the sudoku board. Has
     value           can be unsolved_cell_value or 1-9
+    possibles_mask  bitmask of potential values, 0 if value has been solved
+                    See dinkum.sudoku.bitmask
     possible_values set of potential values, empty if value has been solved
+                    This is a view of possibles_mask.  It is built on every
+                    access, so altering the returned set does NOT alter the
+                    Cell.  Assign to it instead.
     board           The Board we belong to
 
     row/col/blk     The RCB we belong to
-    rcbs            [] of row,col, and blk
+    rcbs            tuple of row,col, and blk.  Built on every access,
+                    so hot loops use row, col and blk instead
 
     cell_num   0 to Board.num_cells-1
 
@@ -51,7 +66,20 @@ class Cell :
 
     row/col/blk The RCBs we belong to, e.g. board.rows[row_idx]
 
+    geometry   The layout of our board, see dinkum.sudoku.geometry
+               DEFAULT_GEOMETRY (9x9) if we don't have a board
+
+    Every Board has NUM_CELLS of us, so we use __slots__ rather
+    than a per instance __dict__ to keep them small.
+
+    all_cell_values (class variable) is every legal value on a 9x9 board.
+    Use geometry.all_cell_values for our board.
     '''
+    __slots__ = ( 'board', 'cell_num',
+                  'row_num', 'row_idx', 'col_num', 'col_idx', 'blk_num', 'blk_idx',
+                  'value', 'possibles_mask',
+                  'row', 'col', 'blk' )
+
     unsolved_cell_value = 0 # Used to signal cell hasn't been solved()
     num_values = RCB_SIZE
     all_cell_values = set(range(1,num_values+1))
@@ -70,10 +98,10 @@ class Cell :
         self.row = None
         self.col = None
         self.blk = None
-        self.rcbs = [None] * 3
 
         # Sanity checks
-        assert 0 <= cell_num < NUM_CELLS
+        geometry = self.geometry
+        assert 0 <= cell_num < geometry.num_cells
         self.cell_num = cell_num
 
         # Remember which row/col/blk we belong to
@@ -81,17 +109,14 @@ class Cell :
         # where rows[row_num].cells[row_idx] (or rows[row_num][row_idx]) retrieves a cell
         # Likewise for cols and blks
 
-        # We figure our (row,col) in the board and have someone else compute the indexes
-        row_num = self.cell_num // RCB_SIZE
-        col_num = self.cell_num  % RCB_SIZE
-
-        (self.row_num, self.row_idx) = self.map_row_col_to_indexes(RCB_TYPE_ROW, row_num, col_num)
-        (self.col_num, self.col_idx) = self.map_row_col_to_indexes(RCB_TYPE_COL, row_num, col_num)
-        (self.blk_num, self.blk_idx) = self.map_row_col_to_indexes(RCB_TYPE_BLK, row_num, col_num)
+        # They are precomputed for every cell_num, see dinkum.sudoku.geometry
+        (self.row_num, self.row_idx,
+         self.col_num, self.col_idx,
+         self.blk_num, self.blk_idx) = geometry.cell_geometry[cell_num]
 
         # Mark us unsolved with all possibles
         self.value = Cell.unsolved_cell_value
-        self.possible_values = Cell.all_cell_values.copy()
+        self.possibles_mask = geometry.all_values_mask
 
         # Remember our RCBs
         if board :
@@ -99,8 +124,33 @@ class Cell :
             self.col = self.board.cols[self.col_num]
             self.blk = self.board.blks[self.blk_num]
 
-            self.rcbs = (self.row, self.col, self.blk)
-            
+    @property
+    def geometry(self) :
+        ''' The Geometry of our board, DEFAULT_GEOMETRY if no board '''
+        return self.board.geometry if self.board else DEFAULT_GEOMETRY
+
+    @property
+    def rcbs(self) :
+        ''' tuple of our (row, col, blk).  They are None if we
+        don't have a board
+        '''
+        return (self.row, self.col, self.blk)
+
+    @property
+    def possible_values(self) :
+        ''' set of potential values built from possibles_mask
+        '''
+        return set(mask_to_values(self.possibles_mask))
+
+    @possible_values.setter
+    def possible_values(self, values) :
+        self.possibles_mask = values_to_mask(values)
+
+    def num_possibles(self) :
+        ''' Returns the number of potential values
+        '''
+        return popcount(self.possibles_mask)
+
 
     def solve(self, value) :
         '''Solves the Cell by
@@ -110,16 +160,17 @@ class Cell :
         
         '''
         # Error check value
-        assert value in Cell.all_cell_values
+        assert value in self.geometry.all_cell_values
 
         # Make sure data structs are consistent
-        assert value in self.possible_values
+        assert self.possibles_mask & (1 << value)
         if self.board :
             assert self in self.board.unsolved_cells
+            self.record_change()
 
         # Our data structs
         self.value = value
-        self.possible_values = set() # empty possible_values
+        self.possibles_mask = 0 # empty possible_values
 
 
     def remove_from_possibles(self, value_or_values) :
@@ -138,27 +189,50 @@ class Cell :
         '''
 
         # value?  or values?
-        values = value_or_values # Assume it's iterable, ie values
         try:
-            iter(value_or_values)
+            values = iter(value_or_values)
         except TypeError :
-            values = [value_or_values] # wrong assumption, it was a single value
+            values = [value_or_values] # it was a single value
                                        # Make a single item iterable
 
-        # Check all the possibles to remove
-        possible_values_changed = False # What we return
+        # Build a mask of everything to remove
+        mask = 0
+        all_cell_values = self.geometry.all_cell_values
         for value in values :
-            assert value in Cell.all_cell_values
+            assert value in all_cell_values
+            mask |= 1 << value
 
-            # Anything to remove?
-            if value in self.possible_values :
-                # yes, remove value
-                self.possible_values.remove(value)
+        return self.remove_mask_from_possibles(mask)
 
-                # and remember we did so
-                possible_values_changed = True
 
-        return  possible_values_changed
+    def remove_mask_from_possibles(self, mask) :
+        ''' Removes all the values in bitmask "mask" as possible
+        solutions for us.  See dinkum.sudoku.bitmask
+
+        Returns True if the possible_values changed
+        and False otherwise.
+        '''
+        if not self.possibles_mask & mask :
+            return False  # Nothing to remove
+
+        if self.board :
+            self.record_change()
+        self.possibles_mask &= ~mask
+        return True
+
+
+    def record_change(self) :
+        ''' Should be called BEFORE changing our value or possibles_mask.
+        Bumps board.num_changes.
+        If our board is searching (i.e. board.trail isn't None),
+        appends (self, value, possibles_mask) to board.trail so
+        the change can be undone.  See Board.undo_trail()
+        '''
+        board = self.board
+        board.num_changes += 1
+        trail = board.trail
+        if trail is not None :
+            trail.append( (self, self.value, self.possibles_mask) )
 
 
     def common_rcbs( self, other_cells ) :
@@ -173,25 +247,15 @@ class Cell :
 
         returned_rcbs = []
 
-        # For each row/col/blk, we produce a
-        # set() of their all their rows/cols/blks
-        # if there is only one rcb in the
-        # resulting union, they were all the same
-
-        matched_rows = set([self.row_num])
-        matched_cols = set([self.col_num])
-        matched_blks = set([self.blk_num])
-        
-        for cell in other_cells :
-            matched_rows.add(cell.row_num)
-            matched_cols.add(cell.col_num)
-            matched_blks.add(cell.blk_num)
+        # For each row/col/blk, if every other cell has
+        # our row/col/blk num, we all share it
+        row_num, col_num, blk_num = self.row_num, self.col_num, self.blk_num
 
-        if len(matched_rows) == 1 :
+        if all( [ cell.row_num == row_num for cell in other_cells ] ) :
             returned_rcbs.append(self.row)
-        if len(matched_cols) == 1 :
+        if all( [ cell.col_num == col_num for cell in other_cells ] ) :
             returned_rcbs.append(self.col)
-        if len(matched_blks) == 1 :
+        if all( [ cell.blk_num == blk_num for cell in other_cells ] ) :
             returned_rcbs.append(self.blk)
 
         # Give um the answer
@@ -225,18 +289,9 @@ class Cell :
         the set
         '''
 
-        # iterate thru self.rcbs() when RCB iterator works
-        # put all our neighbors together
-        ans = set()  # What we return
-
-        # Put unique cells into ans
-        for rcb in self.rcbs :
-            ans = ans.union( set(list(rcb)) )
-
-        # and take thyself out
-        ans.remove(self) 
-
-        return ans
+        # Who they are is precomputed, see dinkum.sudoku.geometry
+        cells = self.board.cells
+        return set( [ cells[cell_num] for cell_num in self.board.geometry.cell_peers[self.cell_num] ] )
 
 
     def is_solved(self) :
@@ -249,40 +304,9 @@ class Cell :
         ''' Given row_num, col_num of a cell in the board,
         returns touple of array_index of the RCB, e.g. into self.rows/cols/blks[]
                       cell_index in RCB.rcb[]
+        See dinkum.sudoku.geometry.Geometry.map_row_col_to_indexes()
         '''
-
-        if rcb_type == RCB_TYPE_ROW :
-            return (row_num, col_num)
-
-        elif rcb_type == RCB_TYPE_COL :
-            return (col_num, row_num)
-
-        elif rcb_type == RCB_TYPE_BLK :
-            blks_per_row = RCB_SIZE // BLK_SIZE
-
-            # We First compute (x,y) of block in board
-            # and convert that to block number
-
-            # Get (x,y) of what block we are in
-            blk_x = col_num // BLK_SIZE
-            blk_y = row_num // BLK_SIZE
-
-            # convert to blk_num
-            blk_num = blk_y * blks_per_row + blk_x
-
-            # get (x,y) of cell in blk
-            cell_x_in_blk = col_num % BLK_SIZE
-            cell_y_in_blk = row_num % BLK_SIZE
-
-            # Compute index of cell in block
-            blk_idx = cell_y_in_blk * BLK_SIZE + cell_x_in_blk
-
-            return (blk_num, blk_idx)
-
-        else :
-            assert False, "Unknown rcb_type:" + str(rcb_type) + " Should be one of:" + str(ALL_RCB_TYPES)
-
-        assert False, "Impossible place"
+        return self.geometry.map_row_col_to_indexes(rcb_type, row_num, col_num)
 
 
     def name(self) :
@@ -311,8 +335,7 @@ class Cell :
         ret_str += "  value: %s" % ( value_str)                           + '\n'
         
         # possible_values
-        sorted_possible_values = list(self.possible_values)
-        sorted_possible_values.sort()
+        sorted_possible_values = list(mask_to_values(self.possibles_mask))
         ret_str += "  possible_values: %s" % (str(sorted_possible_values))+ '\n'
 
         # row/col/blk numbers and offset
@@ -325,11 +348,12 @@ class Cell :
 
     def str_value(self, desired_length=1, unsolved_char = ' ') :
         ''' Returns cell.value as string of desired_length
-        with the numeric value right justified.
+        with the value right justified.  Values above 9 are
+        letters, see dinkum.sudoku.geometry.value_to_char()
         unsolved cells return unsolved_char.
         '''
         return "%*s" %(desired_length,
-                       self.value if self.value != Cell.unsolved_cell_value else unsolved_char )
+                       value_to_char(self.value) if self.value != Cell.unsolved_cell_value else unsolved_char )
 
 
 
@@ -347,9 +371,11 @@ class CellToSolve(tuple) :
     CellToSolve members
     '''
 
+    __slots__ = ()  # Everything is in the tuple
+
     def __new__(cls, cell, value) :
         assert isinstance(cell, Cell)
-        assert value in Cell.all_cell_values
+        assert value in cell.geometry.all_cell_values
 
         # See https://stackoverflow.com/questions/12652683/how-to-initialize-an-instance-of-a-subclass-of-tuple-in-python
         return tuple.__new__(cls, (cell, value) )
@@ -357,15 +383,14 @@ class CellToSolve(tuple) :
         # the follwing __init__ will be called for the instance we
         # just returned
 
-    
-    def __init__(self,cell,value) :
-        self.cell  = cell
-        self.value = value
-
-        
-
 
+    @property
+    def cell(self) :
+        return self[0]
 
+    @property
+    def value(self) :
+        return self[1]
 
     def __str__(self) :
         ''' Human readable description:
@@ -660,6 +685,26 @@ class Test_cell(unittest.TestCase):
         self.assertFalse(ret_val) 
         
 
+    def test_possibles_mask(self) :
+        cell = Cell(None, 40)
+        self.assertEqual( cell.possibles_mask, ALL_VALUES_MASK )
+        self.assertEqual( cell.num_possibles(), RCB_SIZE )
+
+        # possible_values is a view, altering it doesn't alter the cell
+        cell.possible_values.remove(4)
+        self.assertEqual( cell.num_possibles(), RCB_SIZE )
+
+        # but assigning to it does
+        cell.possible_values = set([2,7])
+        self.assertEqual( cell.possibles_mask, (1 << 2) | (1 << 7) )
+        self.assertEqual( cell.num_possibles(), 2 )
+
+        # Remove via mask
+        self.assertTrue ( cell.remove_mask_from_possibles( 1 << 7 ) )
+        self.assertFalse( cell.remove_mask_from_possibles( 1 << 7 ) )
+        self.assertSetEqual( cell.possible_values, set([2]) )
+
+
     def test_CellToSolve(self) :
         # A test cell
         cell = Cell(None, 8)
@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+# dinkum/sudoku/dlx.py
+''' An alternative solution engine for a sudoku Board.
+
+The Board is encoded as an exact cover problem and solved with
+Knuth's Dancing Links (DLX) implementation of Algorithm X.
+See https://arxiv.org/abs/cs/0011047
+
+There are 4 * num_cells (324 for 9x9) columns, i.e. constraints,
+each of which must be satisfied exactly once:
+    cell       every cell has a value             num_cells columns
+    row,value  every row   has every value        num_cells columns
+    col,value  every col   has every value        num_cells columns
+    blk,value  every blk   has every value        num_cells columns
+num_cells comes from the Board's geometry, so any size Board works.
+
+There is one matrix row for every (unsolved cell, possible value),
+which satisfies 4 columns.  Solved cells don't get matrix rows,
+their columns are covered up front.
+
+The links are kept in parallel int []'s rather than node objects
+as that is a lot faster in python.
+
+Some useful functions:
+    dlx_solutions(board)   generator of solutions to board
+    dlx_solve(board)       solves board in place, returns board or None
+'''
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc Column numbers from the Board's geometry
+
+from dinkum.sudoku         import * # All package wide def's
+from dinkum.sudoku.bitmask import *
+from dinkum.sudoku.cell    import CellToSolve
+
+class DancingLinks :
+    ''' The exact cover matrix for a Board.
+
+    The matrix is held in parallel []'s indexed by node#.
+    node 0 is the root, 1 thru num_cols are the column headers,
+    and the rest are the 1's in the matrix.
+        left, right, up, down   node# of neighbors
+        col                     node# of column header for the node
+        size                    # of 1's in the column (headers only)
+        row_cell_num            cell_num the node's row solves
+        row_value               value the node's row solves with
+
+    The cell, row/value, col/value, and blk/value columns start
+    at cell_col_base, row_col_base, col_col_base, and blk_col_base.
+
+    Use solutions() to get them.
+    '''
+
+    def __init__(self, board) :
+        ''' Builds the matrix from board's Cells '''
+
+        # Where each kind of column starts
+        num_cells = board.geometry.num_cells
+        self.rcb_size      = board.geometry.rcb_size
+        self.cell_col_base = 0
+        self.row_col_base  = 1 * num_cells
+        self.col_col_base  = 2 * num_cells
+        self.blk_col_base  = 3 * num_cells
+        num_cols           = 4 * num_cells
+
+        # headers: node# = 1 + column#
+        num_headers = num_cols + 1
+        self.left  = [ n-1 for n in range(num_headers) ]
+        self.right = [ n+1 for n in range(num_headers) ]
+        self.left[0]              = num_cols   # circular
+        self.right[num_cols]      = 0
+        self.up    = list(range(num_headers))
+        self.down  = list(range(num_headers))
+        self.col   = list(range(num_headers))
+        self.size  = [0] * num_headers
+        self.row_cell_num = [None] * num_headers
+        self.row_value    = [None] * num_headers
+
+        # A matrix row for every possible value of every unsolved cell
+        for cell in board.cells :
+            for value in mask_to_values(cell.possibles_mask) :
+                self._add_row(cell, value)
+
+        # Solved cells satisfy their constraints.
+        # Take those columns out of play
+        for cell in board.cells :
+            if cell.is_solved() :
+                for col_num in self._col_nums(cell, cell.value) :
+                    self._cover(col_num + 1)
+
+
+    def _col_nums(self, cell, value) :
+        ''' Returns the 4 column numbers satisfied by cell having value '''
+        value_idx = value - 1
+        rcb_size  = self.rcb_size
+        return ( self.cell_col_base + cell.cell_num,
+                 self.row_col_base  + cell.row_num * rcb_size + value_idx,
+                 self.col_col_base  + cell.col_num * rcb_size + value_idx,
+                 self.blk_col_base  + cell.blk_num * rcb_size + value_idx )
+
+
+    def _add_row(self, cell, value) :
+        ''' Adds a matrix row for cell having value '''
+        first = None
+        for col_num in self._col_nums(cell, value) :
+            header = col_num + 1
+            node   = len(self.col)
+
+            # Insert at bottom of the column
+            self.col.append(header)
+            self.up.append( self.up[header] )
+            self.down.append(header)
+            self.down[ self.up[header] ] = node
+            self.up[header] = node
+            self.size[header] += 1
+            self.size.append(0)
+
+            # Link into the row
+            if first is None :
+                first = node
+                self.left.append(node)
+                self.right.append(node)
+            else :
+                self.left.append( self.left[first] )
+                self.right.append(first)
+                self.right[ self.left[first] ] = node
+                self.left[first] = node
+
+            self.row_cell_num.append(cell.cell_num)
+            self.row_value.append(value)
+
+
+    def _cover(self, header) :
+        ''' Removes column header from the header list and all rows
+        which satisfy it from the other columns.
+        '''
+        left, right, up, down, col, size = self.left, self.right, self.up, self.down, self.col, self.size
+
+        right[ left[header] ] = right[header]
+        left [ right[header] ] = left[header]
+
+        i = down[header]
+        while i != header :
+            j = right[i]
+            while j != i :
+                down[ up[j] ] = down[j]
+                up  [ down[j] ] = up[j]
+                size[ col[j] ] -= 1
+                j = right[j]
+            i = down[i]
+
+    def _uncover(self, header) :
+        ''' Undoes _cover(header).  Must be called in reverse order of _cover()s '''
+        left, right, up, down, col, size = self.left, self.right, self.up, self.down, self.col, self.size
+
+        i = up[header]
+        while i != header :
+            j = left[i]
+            while j != i :
+                size[ col[j] ] += 1
+                down[ up[j] ] = j
+                up  [ down[j] ] = j
+                j = left[j]
+            i = up[i]
+
+        right[ left[header] ] = header
+        left [ right[header] ] = header
+
+
+    def solutions(self) :
+        ''' generator that yields every solution.  Each solution is
+        a [] of (cell_num, value) for the unsolved cells.
+        The matrix is restored when the generator is exhausted.
+        '''
+        chosen = []  # node# of the rows picked so far
+        yield from self._search(chosen)
+
+    def _search(self, chosen) :
+        ''' Algorithm X.  See solutions() '''
+        right, down, size = self.right, self.down, self.size
+
+        # All columns satisfied?
+        if right[0] == 0 :
+            yield [ (self.row_cell_num[node], self.row_value[node]) for node in chosen ]
+            return
+
+        # Pick column with the fewest rows
+        header = right[0]
+        best_size = size[header]
+        c = right[header]
+        while c != 0 and best_size > 1 :
+            if size[c] < best_size :
+                header = c
+                best_size = size[c]
+            c = right[c]
+
+        if best_size == 0 :
+            return   # Dead end
+
+        # Try every row in that column
+        self._cover(header)
+        r = down[header]
+        while r != header :
+            chosen.append(r)
+            j = right[r]
+            while j != r :
+                self._cover( self.col[j] )
+                j = right[j]
+
+            yield from self._search(chosen)
+
+            j = self.left[r]
+            while j != r :
+                self._uncover( self.col[j] )
+                j = self.left[j]
+            chosen.pop()
+            r = down[r]
+        self._uncover(header)
+
+
+def dlx_solutions(board) :
+    ''' generator which yields every solution to board.
+    Each solution is [] of (cell_num, value) for every
+    unsolved cell in board.  board is not changed.
+    '''
+    yield from DancingLinks(board).solutions()
+
+
+def dlx_solve(board) :
+    ''' Solves board in place using DancingLinks.
+    Returns board if it was solved, None if unsolvable.
+
+    board is unchanged if unsolvable.  Only the first solution is found.
+    '''
+    for solution in dlx_solutions(board) :
+        board.solve_cells( [ CellToSolve(board.cells[cell_num], value) for (cell_num, value) in solution ] )
+        return board
+
+    return None
+
+
+# Test code
+import unittest
+import dinkum.sudoku.board
+
+class Test_dlx(unittest.TestCase):
+
+    kato_str = '''
+        0 0 6 1 0 0 0 0 8
+        0 8 0 0 9 0 0 3 0
+        2 0 0 0 0 5 4 0 0
+        4 0 0 0 0 1 8 0 0
+        0 3 0 0 7 0 0 4 0
+        0 0 7 9 0 0 0 0 3
+        0 0 8 4 0 0 0 0 6
+        0 2 0 0 5 0 0 8 0
+        1 0 0 0 0 2 5 0 0
+    '''
+    kato_ans_str = '''
+        3 4 6 1 2 7 9 5 8
+        7 8 5 6 9 4 1 3 2
+        2 1 9 3 8 5 4 6 7
+        4 6 2 5 3 1 8 7 9
+        9 3 1 2 7 8 6 4 5
+        8 5 7 9 4 6 2 1 3
+        5 9 8 4 1 3 7 2 6
+        6 2 4 7 5 9 3 8 1
+        1 7 3 8 6 2 5 9 4
+    '''
+
+    def test_solve(self) :
+        board    = dinkum.sudoku.board.Board(self.kato_str)
+        solution = dinkum.sudoku.board.Board(self.kato_ans_str)
+
+        self.assertIs   ( dlx_solve(board), board )
+        self.assertTrue ( board.is_solved() )
+        self.assertEqual( board.output(), solution.output() )
+        board.sanity_check()
+
+    def test_unsolvable(self) :
+        # A wrong given at (0,6)
+        board = dinkum.sudoku.board.Board(self.kato_str)
+        board[0][6].possible_values = set([7])
+        before = board.output()
+
+        self.assertIsNone( dlx_solve(board) )
+        self.assertEqual ( board.output(), before )
+
+    def test_presolved(self) :
+        board = dinkum.sudoku.board.Board(self.kato_ans_str)
+        self.assertEqual( list(dlx_solutions(board)), [ [] ] )
+
+    def test_multiple_solutions(self) :
+        # An empty board has lots of solutions.  Get a few
+        board = dinkum.sudoku.board.Board()
+        solutions = []
+        for solution in dlx_solutions(board) :
+            solutions.append(solution)
+            if len(solutions) == 3 :
+                break
+        self.assertEqual( len(solutions), 3 )
+        for solution in solutions :
+            self.assertEqual( len(solution), NUM_CELLS )
+        self.assertNotEqual( solutions[0], solutions[1] )
+
+
+if __name__ == "__main__" :
+    # Run the unittests
+    unittest.main()
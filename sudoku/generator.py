@@ -0,0 +1,447 @@
+#!/usr/bin/env python3
+# dinkum/sudoku/generator.py
+''' Generates sudoku puzzles that have exactly one solution.
+
+A puzzle is made by:
+    random_solution()   filling in a random solved board
+    remove_clues()      blanking cells, in random order, as long as
+                        the puzzle keeps a unique solution.  Cells can be
+                        blanked in symmetric groups, see SYMMETRIES.
+                        It can stop at a target number of clues and
+                        refuse blanks that make the puzzle too hard.
+
+generate_puzzle() does both, retrying with a new solution until the
+target clue count and difficulty are met.  generate_puzzles() makes
+lots of them with multiple worker processes.  It only yields puzzles
+of the difficulty asked for.
+
+Every puzzle is made from it's own random.Random, seeded by
+puzzle_seed(seed, puzzle_num).  So a given seed always makes the
+same puzzles no matter how many processes make them.
+
+Puzzles and solutions are kept as strings of values in raster order,
+0 for a blank, as given to Board().  They are small and cheap to pass
+between processes.
+
+Difficulty is the category of dinkum.sudoku.rating, i.e. which
+strategies a person needs to solve it, see puzzle_difficulty().
+
+Some useful functions:
+    generate_puzzles(num_puzzles, seed, num_jobs, ...)  generator of puzzles
+    generate_puzzle(rng, ...)      a GeneratedPuzzle
+    puzzle_difficulty(board)       one of DIFFICULTIES
+'''
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc DIFFICULTIES come from dinkum.sudoku.rating
+# 2026-10-18 tc _puzzle_board() uses Board.from_trusted()
+# 2026-10-18 tc generate_puzzles() drops puzzles that miss the difficulty
+
+from dinkum.sudoku            import * # All package wide def's
+from dinkum.sudoku.geometry   import *
+from dinkum.sudoku.board      import Board
+from dinkum.sudoku.strategies import DEFAULT_STRATEGIES
+from dinkum.sudoku.rating     import *
+
+import collections
+import functools
+import multiprocessing
+import random
+
+# How clues can be removed together
+SYMMETRY_NONE       = None
+SYMMETRY_ROTATIONAL = "rotational" # (r,c) and (n-1-r,n-1-c), i.e. 180 degrees
+SYMMETRY_MIRROR     = "mirror"     # (r,c) and (r,n-1-c), i.e. left/right
+SYMMETRY_DIAGONAL   = "diagonal"   # (r,c) and (c,r)
+
+SYMMETRIES = (SYMMETRY_NONE, SYMMETRY_ROTATIONAL, SYMMETRY_MIRROR, SYMMETRY_DIAGONAL)
+
+
+class GeneratedPuzzle(collections.namedtuple('GeneratedPuzzle',
+                                             'puzzle solution num_clues difficulty seed')) :
+    ''' What generate_puzzle() makes
+
+        puzzle      str of values in raster order, 0 for a blank
+        solution    str of values, the only solution to puzzle
+        num_clues   # of non-blank cells in puzzle
+        difficulty  one of DIFFICULTIES, or None if not asked for
+        seed        what the random.Random was seeded with, if known
+    '''
+    __slots__ = ()
+
+    def board(self, name=None) :
+        ''' Returns a Board of our puzzle '''
+        return Board(self.puzzle, name, "generated, seed %s" % (self.seed,))
+
+
+def values_to_str(values) :
+    ''' Returns the str of values, a sequence of cell values, as given to Board() '''
+    return ''.join( map(value_to_char, values) )
+
+
+def puzzle_seed(seed, puzzle_num) :
+    ''' Returns what to seed the random.Random for puzzle_num
+    of a run with seed.  Different for every (seed, puzzle_num).
+    '''
+    # A str seed is hashed with sha512, so it's the same everywhere
+    return "%s:%d" % (seed, puzzle_num)
+
+
+def random_solution(rng, geometry=DEFAULT_GEOMETRY) :
+    ''' Returns [] of values in raster order of a random solved
+    board with geometry.  Uses random.Random rng.
+
+    The blks down the diagonal don't share a row or col, so they are
+    filled in with random values.  The rest is solved, and then the
+    rows within each band of blks, the bands, the cols within each
+    stack, and the stacks are shuffled.  None of those break a solution.
+
+    On small boards the random diagonal blks can leave no solution,
+    then we just try again.
+    '''
+    (h, w, n) = (geometry.blk_height, geometry.blk_width, geometry.rcb_size)
+
+    def shuffled(seq) :
+        seq = list(seq)
+        rng.shuffle(seq)
+        return seq
+
+    # A band is h rows of blks (there are w of them), a stack is w cols (h of them)
+    solved = None
+    while not solved :
+        rows = [ [0] * n for row_num in range(n) ]
+        for diag_num in range( min(w, h) ) :
+            values = shuffled( range(1, n+1) )
+            for (r, c) in [ (r, c) for r in range(h) for c in range(w) ] :
+                rows[diag_num*h + r][diag_num*w + c] = values.pop()
+
+        try :
+            solved = next( Board(rows, "generator", "", geometry).solutions(ENGINE_DLX), None )
+        except ExcUnsolvable :
+            pass  # Try again
+
+    row_nums = [ band*h  + r for band  in shuffled(range(w)) for r in shuffled(range(h)) ]
+    col_nums = [ stack*w + c for stack in shuffled(range(h)) for c in shuffled(range(w)) ]
+    return [ solved.cells[row_num*n + col_num].value for row_num in row_nums for col_num in col_nums ]
+
+
+def symmetric_cell_nums(cell_num, symmetry, geometry=DEFAULT_GEOMETRY) :
+    ''' Returns sorted tuple of cell_num and the cell#s
+    symmetry maps it to.  symmetry is one of SYMMETRIES.
+    '''
+    n = geometry.rcb_size
+    (r, c) = divmod(cell_num, n)
+    if symmetry == SYMMETRY_NONE :
+        others = []
+    elif symmetry == SYMMETRY_ROTATIONAL :
+        others = [ (n-1-r, n-1-c) ]
+    elif symmetry == SYMMETRY_MIRROR :
+        others = [ (r, n-1-c) ]
+    elif symmetry == SYMMETRY_DIAGONAL :
+        others = [ (c, r) ]
+    else :
+        assert False, "Unknown symmetry:" + str(symmetry) + " Should be one of:" + str(SYMMETRIES)
+
+    return tuple(sorted( set( [cell_num] + [ r*n + c for (r, c) in others ] ) ))
+
+
+def puzzle_difficulty(board) :
+    ''' Returns which of DIFFICULTIES board is.  board isn't changed. '''
+    return rate(board).category
+
+
+def is_no_harder_than(board, difficulty) :
+    ''' Returns True if board's puzzle_difficulty() isn't
+    harder than difficulty.  Takes one solve_by_deduction()
+    rather than one for each difficulty.  board isn't changed.
+    '''
+    difficulty_num = DIFFICULTIES.index(difficulty)
+    if difficulty_num == len(DIFFICULTIES) - 1 :
+        return True   # Nothing is harder
+
+    max_cost = DIFFICULTY_MAX_COSTS[difficulty_num]
+    attempt = board.clone()
+    attempt.strategies = [ strategy for strategy in DEFAULT_STRATEGIES
+                           if max_cost is None or strategy.cost <= max_cost ]
+    return bool( attempt.solve_by_deduction() )
+
+
+def _rows(values, geometry) :
+    ''' values in raster order ==> list of row-lists '''
+    n = geometry.rcb_size
+    return [ values[offset:offset+n] for offset in range(0, geometry.num_cells, n) ]
+
+
+def _puzzle_board(puzzle, geometry) :
+    ''' Returns a Board of puzzle, [] of values in raster order.
+
+    puzzle is part of a solution, so it needs none of the checking
+    Board(list of rows) does.  Board.from_trusted() is several
+    times quicker.
+    '''
+    return Board.from_trusted(puzzle, "generator", "", geometry)
+
+
+def _still_unique(puzzle, blanked, solution, geometry) :
+    ''' Returns True if puzzle has only one solution.
+
+    puzzle is [] of values, which was uniquely solved by
+    solution before the cell#s in blanked were set to 0.
+    Any other solution must differ from solution in a blanked cell.
+    So we just look for a solution with something else there,
+    which is usually quickly found not to exist.
+    '''
+    board = _puzzle_board(puzzle, geometry)
+    for cell_num in blanked :
+        attempt = board.clone() if len(blanked) > 1 else board
+        attempt.cells[cell_num].remove_from_possibles( solution[cell_num] )
+        if attempt.count_solutions(1) :
+            return False
+
+    return True
+
+
+def remove_clues(solution, rng, geometry=DEFAULT_GEOMETRY, symmetry=SYMMETRY_NONE,
+                 target_clues=None, max_difficulty=None) :
+    ''' Returns [] of puzzle values made from solution,
+    [] of values of a solved board.
+
+    Cells are blanked in random order, by random.Random rng,
+    as long as the puzzle keeps one solution.  With a symmetry
+    (one of SYMMETRIES) the cells it maps together are blanked
+    together.  Every cell is tried once.
+
+    We stop when the puzzle has no more than target_clues.  If
+    max_difficulty (one of DIFFICULTIES) is given, blanks that make
+    the puzzle harder than that aren't made.
+    '''
+    assert max_difficulty is None or max_difficulty in DIFFICULTIES, \
+        "Unknown difficulty:" + str(max_difficulty) + " Should be one of:" + str(DIFFICULTIES)
+
+    # Only check the difficulty if it can be too hard
+    if max_difficulty == DIFFICULTIES[-1] :
+        max_difficulty = None
+
+    # Each group of cells that must be blanked together, once
+    groups = sorted( set( [ symmetric_cell_nums(cell_num, symmetry, geometry)
+                            for cell_num in range(geometry.num_cells) ] ) )
+    rng.shuffle(groups)
+
+    puzzle    = list(solution)
+    num_clues = geometry.num_cells
+    for group in groups :
+        if target_clues is not None and num_clues <= target_clues :
+            break  # Far enough
+
+        for cell_num in group :
+            puzzle[cell_num] = 0
+
+        keep_blanks = _still_unique(puzzle, group, solution, geometry)
+        if keep_blanks and max_difficulty :
+            board = _puzzle_board(puzzle, geometry)
+            keep_blanks = is_no_harder_than(board, max_difficulty)
+
+        if keep_blanks :
+            num_clues -= len(group)
+        else :
+            # Put um back
+            for cell_num in group :
+                puzzle[cell_num] = solution[cell_num]
+
+    return puzzle
+
+
+def generate_puzzle(rng, geometry=DEFAULT_GEOMETRY, symmetry=SYMMETRY_NONE,
+                    target_clues=None, difficulty=None, max_tries=20, seed=None) :
+    ''' Returns a GeneratedPuzzle with a unique solution.
+    rng is the random.Random to use, seed is just recorded.
+
+    With no target_clues, clues are removed until no more can be.
+    With target_clues, we want no more than that many clues.
+    With difficulty, one of DIFFICULTIES, we want a puzzle that hard.
+
+    If a solution won't make a puzzle that meets the target(s),
+    we try another one.  After max_tries, we settle for the
+    closest we got.  Ask for too few clues and that's what you get.
+    The difficulty of what we return may not be the one asked
+    for, check it.  generate_puzzles() drops those.
+    '''
+    best = None
+    best_miss = None
+    for try_num in range(max_tries) :
+        solution = random_solution(rng, geometry)
+        puzzle   = remove_clues(solution, rng, geometry, symmetry, target_clues, difficulty)
+
+        num_clues = geometry.num_cells - puzzle.count(0)
+        puzzle_difficulty_got = None
+        if difficulty :
+            puzzle_difficulty_got = puzzle_difficulty( _puzzle_board(puzzle, geometry) )
+
+        # How far from the targets
+        miss = ( abs( DIFFICULTIES.index(puzzle_difficulty_got) - DIFFICULTIES.index(difficulty) ) if difficulty else 0,
+                 max(num_clues - target_clues, 0) if target_clues is not None else 0 )
+
+        if best is None or miss < best_miss :
+            best = GeneratedPuzzle( values_to_str(puzzle), values_to_str(solution),
+                                    num_clues, puzzle_difficulty_got, seed )
+            best_miss = miss
+
+        if best_miss == (0, 0) :
+            break   # Got what they wanted
+
+    return best
+
+
+def _generate_numbered(seed, kwargs, puzzle_num) :
+    ''' generate_puzzle() for puzzle_num of a run with seed.
+    What runs in a worker process for generate_puzzles()
+    '''
+    this_seed = puzzle_seed(seed, puzzle_num)
+    return generate_puzzle( random.Random(this_seed), seed=this_seed, **kwargs )
+
+
+def generate_puzzles(num_puzzles, seed=0, num_jobs=0, chunk_size=4, max_misses=None, **kwargs) :
+    ''' generator which yields num_puzzles GeneratedPuzzle's.
+    kwargs are passed on to generate_puzzle(), e.g. target_clues.
+
+    Puzzle i is made from random.Random( puzzle_seed(seed, i) ), so
+    it's the same puzzle however many jobs there are.  They are
+    yielded in order.
+
+    With a difficulty in kwargs, puzzles that aren't that difficult
+    are dropped, and more puzzle#'s are made in their place.  After
+    max_misses (default: 10 * num_puzzles) are dropped we give up,
+    and fewer than num_puzzles are yielded.
+
+    Uses num_jobs worker processes, handing each chunk_size
+    puzzles to make at a time.  If num_jobs is 0, they are made
+    in this process.
+    '''
+    generate   = functools.partial(_generate_numbered, seed, kwargs)
+    difficulty = kwargs.get("difficulty")
+    if max_misses is None :
+        max_misses = 10 * num_puzzles
+
+    pool = multiprocessing.Pool(num_jobs) if num_jobs else None
+    try :
+        # In rounds of as many puzzle#'s as we still need
+        (next_puzzle_num, num_made, num_misses) = (0, 0, 0)
+        while num_made < num_puzzles and num_misses <= max_misses :
+            puzzle_nums = range(next_puzzle_num, next_puzzle_num + num_puzzles - num_made)
+            next_puzzle_num = puzzle_nums.stop
+
+            for generated in ( pool.imap(generate, puzzle_nums, chunk_size) if pool else
+                               map(generate, puzzle_nums) ) :
+                if difficulty and generated.difficulty != difficulty :
+                    num_misses += 1
+                    if num_misses > max_misses :
+                        break
+                    continue
+                num_made += 1
+                yield generated
+    finally :
+        if pool :
+            pool.terminate()
+
+
+# Test code
+import unittest
+
+class Test_generator(unittest.TestCase):
+
+    def assert_unique(self, generated, geometry=DEFAULT_GEOMETRY) :
+        ''' generated is a GeneratedPuzzle that must have 1 solution '''
+        board = Board(generated.puzzle, None, "", geometry)
+        self.assertEqual( board.count_solutions(), 1 )
+        self.assertTrue ( board.is_subset_of( Board(generated.solution, None, "", geometry) ) )
+        self.assertEqual( generated.num_clues, board.num_solved() )
+
+    def test_random_solution(self) :
+        for geometry in [ DEFAULT_GEOMETRY, get_geometry(2, 3), get_geometry(2, 2) ] :
+            solution = random_solution( random.Random(1), geometry )
+            board = Board( _rows(solution, geometry), None, "", geometry )
+            self.assertTrue( board.is_solved() )
+            board.sanity_check()
+
+        # Repeatable, and not always the same
+        self.assertEqual   ( random_solution(random.Random(1)), random_solution(random.Random(1)) )
+        self.assertNotEqual( random_solution(random.Random(1)), random_solution(random.Random(2)) )
+
+    def test_symmetric_cell_nums(self) :
+        self.assertEqual( symmetric_cell_nums( 0, SYMMETRY_NONE       ), (0,)    )
+        self.assertEqual( symmetric_cell_nums( 0, SYMMETRY_ROTATIONAL ), (0, 80) )
+        self.assertEqual( symmetric_cell_nums(40, SYMMETRY_ROTATIONAL ), (40,)   )
+        self.assertEqual( symmetric_cell_nums(10, SYMMETRY_MIRROR     ), (10, 16) )
+        self.assertEqual( symmetric_cell_nums( 1, SYMMETRY_DIAGONAL   ), (1, 9)  )
+        self.assertRaises( AssertionError, symmetric_cell_nums, 0, "sideways" )
+
+    def test_generate_puzzle(self) :
+        generated = generate_puzzle( random.Random(3) )
+        self.assert_unique(generated)
+        self.assertIsNone(generated.difficulty)
+
+        # Minimal, every clue is needed
+        puzzle = generated.puzzle
+        for cell_num in [ cell_num for cell_num in range(NUM_CELLS) if puzzle[cell_num] != '0' ] :
+            board = Board( puzzle[:cell_num] + '0' + puzzle[cell_num+1:] )
+            self.assertEqual( board.count_solutions(), 2 )
+
+    def test_symmetry(self) :
+        generated = generate_puzzle( random.Random(4), symmetry=SYMMETRY_ROTATIONAL )
+        self.assert_unique(generated)
+        puzzle = generated.puzzle
+        for cell_num in range(NUM_CELLS) :
+            self.assertEqual( puzzle[cell_num] == '0', puzzle[NUM_CELLS-1-cell_num] == '0' )
+
+    def test_targets(self) :
+        generated = generate_puzzle( random.Random(5), target_clues=40 )
+        self.assert_unique(generated)
+        self.assertEqual( generated.num_clues, 40 )
+
+        generated = generate_puzzle( random.Random(6), difficulty=DIFFICULTY_EASY )
+        self.assert_unique(generated)
+        self.assertEqual( generated.difficulty, DIFFICULTY_EASY )
+        self.assertEqual( puzzle_difficulty(generated.board()), DIFFICULTY_EASY )
+
+        # Other sizes
+        geometry  = get_geometry(2, 3)
+        generated = generate_puzzle( random.Random(7), geometry )
+        self.assert_unique(generated, geometry)
+
+    def test_puzzle_difficulty(self) :
+        import dinkum.sudoku.board
+        hardest = Board(dinkum.sudoku.board.Test_board.hardest_spec_str)
+        self.assertEqual( puzzle_difficulty(hardest), DIFFICULTY_FIENDISH )
+        self.assertFalse( hardest.is_solved() )  # we weren't changed
+        self.assertTrue ( is_no_harder_than(hardest, DIFFICULTY_FIENDISH) )
+        self.assertFalse( is_no_harder_than(hardest, DIFFICULTY_HARD) )
+
+    def test_generate_puzzles_difficulty(self) :
+        # With 1 try, seed 1's puzzle 1 is easy, so it's dropped
+        for num_jobs in (0, 2) :
+            generated = list( generate_puzzles(2, seed=1, num_jobs=num_jobs,
+                                               difficulty=DIFFICULTY_MEDIUM, max_tries=1) )
+            self.assertEqual( len(generated), 2 )
+            for puzzle in generated :
+                self.assertEqual( puzzle.difficulty, DIFFICULTY_MEDIUM )
+                self.assertEqual( puzzle_difficulty( puzzle.board() ), DIFFICULTY_MEDIUM )
+            self.assertEqual( [ puzzle.seed for puzzle in generated ], [ puzzle_seed(1, 0), puzzle_seed(1, 2) ] )
+
+        # Out of misses, fewer are made
+        self.assertEqual( len( list( generate_puzzles(2, seed=1, difficulty=DIFFICULTY_MEDIUM,
+                                                      max_tries=1, max_misses=0) ) ), 1 )
+
+    def test_generate_puzzles(self) :
+        # Same puzzles in this process or in 2 workers
+        here    = list( generate_puzzles(3, seed=8, target_clues=45) )
+        workers = list( generate_puzzles(3, seed=8, num_jobs=2, chunk_size=1, target_clues=45) )
+        self.assertEqual( here, workers )
+        self.assertEqual( len(set(here)), 3 )
+        for generated in here :
+            self.assert_unique(generated)
+        self.assertEqual( here[1].seed, puzzle_seed(8, 1) )
+
+
+if __name__ == "__main__" :
+    # Run the unittests
+    unittest.main()
@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+# dinkum/sudoku/geometry.py
+''' Describes the layout of a sudoku Board.
+
+A Board has RCB_SIZE rows, cols, and blks of RCB_SIZE cells each.
+Each blk is blk_height rows by blk_width cols, RCB_SIZE being
+blk_height * blk_width.  The blks don't have to be square, e.g.
+a 6x6 board has 2x3 blks.  Supported board sizes run from
+4x4 to 35x35.
+
+class Geometry holds tables for one layout.  They are computed
+once and shared by every Board, Cell, RCB, and solution engine
+with that layout.  Don't modify them.  Get one with:
+    get_geometry(blk_height, blk_width)
+    geometry_for_rcb_size(rcb_size)    picks the squarest blks
+
+DEFAULT_GEOMETRY is the classic 9x9 with 3x3 blks.  Its tables are
+also available as module level names for code which only deals
+with 9x9 boards (e.g. dinkum.sudoku.batch).
+
+The tables are indexed by cell_num or rcb numbers, which run in
+raster order.  A "unit" is a row/col/blk numbered across
+all three rcb_types:
+    unit_num = rcb_type * rcb_size + rcb_num
+
+    cell_geometry[cell_num]   (row_num, row_idx, col_num, col_idx, blk_num, blk_idx)
+                              See Cell for their meaning
+    cell_units[cell_num]      (row unit_num, col unit_num, blk unit_num)
+    cell_peers[cell_num]      tuple of cell_nums in same row/col/blk as cell_num,
+                              cell_num itself not included.  Ascending order.
+    cell_peers_mask[cell_num] cell_peers as an int with bit (1 << peer_cell_num) set
+    rcb_cells[rcb_type][rcb_num] tuple of cell_nums in the rcb, in rcb idx order
+    unit_cells[unit_num]      tuple of cell_nums in the unit, in rcb idx order
+
+Values bigger than 9 are written as letters, A is 10, B is 11, ...
+    value_to_char(value)  ==> '0'-'9', 'A'-'Z'
+    char_to_value(char)   ==> value, None if char isn't a value
+    CHAR_VALUES_TABLE     bytes.translate() table from the chars of a
+                          9x9 puzzle, 0-9 and ., to values.  Any other
+                          char becomes BAD_CHAR_VALUE
+
+Some other useful functions:
+    map_row_col_to_indexes(rcb_type, row_num, col_num) ==> (rcb_num, rcb_idx)
+        for a 9x9 board.  See Geometry.map_row_col_to_indexes()
+'''
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc class Geometry, boards other than 9x9
+# 2026-10-18 tc Added CHAR_VALUES_TABLE and BAD_CHAR_VALUE
+
+from dinkum.sudoku import *  # Get package wide constants from __init__.py
+
+# How values are written.  Index is the value, 0 is unsolved
+VALUE_CHARS = "0123456789ABCDEFGHIJKLMNOPQRSTUVWXYZ"
+
+# Biggest board we support, limited by VALUE_CHARS
+MAX_RCB_SIZE = len(VALUE_CHARS) - 1
+
+def value_to_char(value) :
+    ''' Returns the single char which represents value '''
+    return VALUE_CHARS[value]
+
+def char_to_value(char) :
+    ''' Returns the value that char represents, None if it doesn't
+    represent one.  Letters may be either case.
+    '''
+    value = VALUE_CHARS.find(char.upper())
+    return value if value >= 0 else None
+
+# bytes.translate() table from 9x9 puzzle chars to values, . is a blank.
+# Anything not a value or blank becomes BAD_CHAR_VALUE
+BAD_CHAR_VALUE    = 0xff
+CHAR_VALUES_TABLE = bytearray( [BAD_CHAR_VALUE] * 256 )
+CHAR_VALUES_TABLE[ord('.')] = 0
+for _value in range(RCB_SIZE + 1) :
+    CHAR_VALUES_TABLE[ord(value_to_char(_value))] = _value
+CHAR_VALUES_TABLE = bytes(CHAR_VALUES_TABLE)
+
+
+class Geometry :
+    ''' The layout of a board with blks that are blk_height rows
+    by blk_width cols.  Has:
+        blk_height, blk_width   size of a blk
+        rcb_size                # cells in a row/col/blk, blk_height*blk_width
+        num_cells               # cells on the board, rcb_size**2
+        all_values_mask         bitmask of every legal cell value
+                                See dinkum.sudoku.bitmask
+        all_cell_values         frozenset of every legal cell value
+        name                    e.g. "9x9" or "6x6(2x3)"
+
+    and the tables in the module doc.
+    Use get_geometry() rather than constructing one.
+    '''
+
+    def __init__(self, blk_height, blk_width) :
+        rcb_size = blk_height * blk_width
+        assert blk_height >= 1 and blk_width >= 2, "Bad blk size: %dx%d" % (blk_height, blk_width)
+        assert rcb_size <= MAX_RCB_SIZE, "Board too big: %d" % rcb_size
+
+        self.blk_height      = blk_height
+        self.blk_width       = blk_width
+        self.rcb_size        = rcb_size
+        self.num_cells       = rcb_size * rcb_size
+        self.all_values_mask = ((1 << (rcb_size+1)) - 1) & ~1
+        self.all_cell_values = frozenset(range(1, rcb_size+1))
+
+        self.name = "%dx%d" % (rcb_size, rcb_size)
+        if blk_height != blk_width :
+            self.name += "(%dx%d)" % (blk_height, blk_width)
+
+        self._build_tables()
+
+
+    def map_row_col_to_indexes(self, rcb_type, row_num, col_num) :
+        ''' Given row_num, col_num of a cell in the board,
+        returns tuple of array_index of the RCB, e.g. into Board.rows/cols/blks[]
+                         cell_index in RCB[]
+        '''
+
+        if rcb_type == RCB_TYPE_ROW :
+            return (row_num, col_num)
+
+        elif rcb_type == RCB_TYPE_COL :
+            return (col_num, row_num)
+
+        elif rcb_type == RCB_TYPE_BLK :
+            blks_per_row = self.rcb_size // self.blk_width
+
+            # We First compute (x,y) of block in board
+            # and convert that to block number
+
+            # Get (x,y) of what block we are in
+            blk_x = col_num // self.blk_width
+            blk_y = row_num // self.blk_height
+
+            # convert to blk_num
+            blk_num = blk_y * blks_per_row + blk_x
+
+            # get (x,y) of cell in blk
+            cell_x_in_blk = col_num % self.blk_width
+            cell_y_in_blk = row_num % self.blk_height
+
+            # Compute index of cell in block
+            blk_idx = cell_y_in_blk * self.blk_width + cell_x_in_blk
+
+            return (blk_num, blk_idx)
+
+        else :
+            assert False, "Unknown rcb_type:" + str(rcb_type) + " Should be one of:" + str(ALL_RCB_TYPES)
+
+        assert False, "Impossible place"
+
+
+    def _build_tables(self) :
+        ''' Fills in all the tables in the module doc '''
+        rcb_size  = self.rcb_size
+        num_cells = self.num_cells
+
+        cell_geometry = []
+        cell_units    = []
+        rcb_cells     = [ [ [None] * rcb_size for rcb_num in range(rcb_size) ] for rcb_type in ALL_RCB_TYPES ]
+
+        for cell_num in range(num_cells) :
+            row_num = cell_num // rcb_size
+            col_num = cell_num  % rcb_size
+
+            geometry = ()
+            units    = ()
+            for rcb_type in ALL_RCB_TYPES :
+                (rcb_num, rcb_idx) = self.map_row_col_to_indexes(rcb_type, row_num, col_num)
+                geometry += (rcb_num, rcb_idx)
+                units    += (rcb_type * rcb_size + rcb_num, )
+                rcb_cells[rcb_type][rcb_num][rcb_idx] = cell_num
+
+            cell_geometry.append(geometry)
+            cell_units.append(units)
+
+        rcb_cells  = tuple( [ tuple( [ tuple(cells) for cells in rcbs ] ) for rcbs in rcb_cells ] )
+        unit_cells = tuple( [ cells for rcbs in rcb_cells for cells in rcbs ] )
+
+        cell_peers      = []
+        cell_peers_mask = []
+        for cell_num in range(num_cells) :
+            peers = set()
+            for unit_num in cell_units[cell_num] :
+                peers.update( unit_cells[unit_num] )
+            peers.remove(cell_num)
+
+            cell_peers.append( tuple(sorted(peers)) )
+            cell_peers_mask.append( sum( [ 1 << peer for peer in peers ] ) )
+
+        self.cell_geometry   = tuple(cell_geometry)
+        self.cell_units      = tuple(cell_units)
+        self.cell_peers      = tuple(cell_peers)
+        self.cell_peers_mask = tuple(cell_peers_mask)
+        self.rcb_cells       = rcb_cells
+        self.unit_cells      = unit_cells
+
+
+    def __repr__(self) :
+        return "Geometry(%d, %d)" % (self.blk_height, self.blk_width)
+
+
+# Every Geometry we have built.  key:(blk_height, blk_width)
+_geometries = {}
+
+def get_geometry(blk_height, blk_width) :
+    ''' Returns the (shared) Geometry with blk_height x blk_width blks '''
+    key = (blk_height, blk_width)
+    geometry = _geometries.get(key)
+    if geometry is None :
+        geometry = _geometries[key] = Geometry(blk_height, blk_width)
+    return geometry
+
+
+def geometry_for_rcb_size(rcb_size) :
+    ''' Returns the Geometry for an rcb_size x rcb_size board.
+    The blks are as square as possible, with the longer side
+    horizontal, e.g. 6 ==> 2x3 blks, 12 ==> 3x4 blks.
+
+    raises ExcBadPuzzleInput if rcb_size can't be made into blks,
+    e.g. it's prime or too big.
+    '''
+    if not 4 <= rcb_size <= MAX_RCB_SIZE :
+        raise ExcBadPuzzleInput( "Unsupported board size: %dx%d" % (rcb_size, rcb_size))
+
+    # Biggest blk_height that isn't more than sqrt(rcb_size)
+    blk_height = max( [ h for h in range(1, rcb_size+1) if rcb_size % h == 0 and h*h <= rcb_size ] )
+    if blk_height == 1 :
+        raise ExcBadPuzzleInput( "Can't divide %dx%d board into blks" % (rcb_size, rcb_size))
+
+    return get_geometry(blk_height, rcb_size // blk_height)
+
+
+def geometry_for_num_cells(num_cells) :
+    ''' Returns geometry_for_rcb_size() for a board with num_cells.
+    raises ExcBadPuzzleInput if num_cells isn't a supported square.
+    '''
+    rcb_size = int(round(num_cells ** 0.5))
+    if rcb_size * rcb_size != num_cells :
+        raise ExcBadPuzzleInput( "%d cells isn't a square board" % num_cells)
+    return geometry_for_rcb_size(rcb_size)
+
+
+# The classic 9x9 board
+DEFAULT_GEOMETRY = get_geometry(BLK_SIZE, BLK_SIZE)
+
+(CELL_GEOMETRY, CELL_UNITS, CELL_PEERS, CELL_PEERS_MASK, RCB_CELLS, UNIT_CELLS) = \
+    (DEFAULT_GEOMETRY.cell_geometry, DEFAULT_GEOMETRY.cell_units,
+     DEFAULT_GEOMETRY.cell_peers,    DEFAULT_GEOMETRY.cell_peers_mask,
+     DEFAULT_GEOMETRY.rcb_cells,     DEFAULT_GEOMETRY.unit_cells)
+
+def map_row_col_to_indexes(rcb_type, row_num, col_num) :
+    ''' DEFAULT_GEOMETRY.map_row_col_to_indexes() '''
+    return DEFAULT_GEOMETRY.map_row_col_to_indexes(rcb_type, row_num, col_num)
+
+
+# Test code
+import unittest
+
+class Test_geometry(unittest.TestCase):
+
+    def test_sizes(self) :
+        num_units = len(ALL_RCB_TYPES) * RCB_SIZE
+        num_peers = 3 * (RCB_SIZE-1) - 2 * (BLK_SIZE-1)   # 20 for 9x9
+
+        self.assertEqual( len(CELL_GEOMETRY),   NUM_CELLS )
+        self.assertEqual( len(CELL_UNITS),      NUM_CELLS )
+        self.assertEqual( len(UNIT_CELLS),      num_units )
+        for cell_num in range(NUM_CELLS) :
+            self.assertEqual( len(CELL_PEERS[cell_num]), num_peers )
+            self.assertEqual( bin(CELL_PEERS_MASK[cell_num]).count('1'), num_peers )
+
+    def test_sample_cells(self) :
+        # (row_num, row_idx, col_num, col_idx, blk_num, blk_idx)
+        self.assertEqual( CELL_GEOMETRY[ 0], (0,0, 0,0, 0,0) )
+        self.assertEqual( CELL_GEOMETRY[10], (1,1, 1,1, 0,4) )
+        self.assertEqual( CELL_GEOMETRY[80], (8,8, 8,8, 8,8) )
+        self.assertEqual( CELL_GEOMETRY[33], (3,6, 6,3, 5,0) )
+
+        self.assertEqual( RCB_CELLS[RCB_TYPE_ROW][1], tuple(range(9,18)) )
+        self.assertEqual( RCB_CELLS[RCB_TYPE_COL][0], tuple(range(0,NUM_CELLS,RCB_SIZE)) )
+        self.assertEqual( RCB_CELLS[RCB_TYPE_BLK][4], (30,31,32, 39,40,41, 48,49,50) )
+
+        self.assertEqual( CELL_UNITS[40], (4, RCB_SIZE+4, 2*RCB_SIZE+4) )
+
+    def test_consistency(self) :
+        for cell_num in range(NUM_CELLS) :
+            geometry = CELL_GEOMETRY[cell_num]
+            for rcb_type in ALL_RCB_TYPES :
+                (rcb_num, rcb_idx) = geometry[2*rcb_type : 2*rcb_type+2]
+                self.assertEqual( RCB_CELLS[rcb_type][rcb_num][rcb_idx], cell_num )
+                self.assertEqual( CELL_UNITS[cell_num][rcb_type], rcb_type * RCB_SIZE + rcb_num )
+
+            # peers are exactly everybody in our units but us
+            peers = set()
+            for unit_num in CELL_UNITS[cell_num] :
+                peers.update( UNIT_CELLS[unit_num] )
+            peers.remove(cell_num)
+            self.assertEqual( set(CELL_PEERS[cell_num]), peers )
+            self.assertEqual( CELL_PEERS_MASK[cell_num], sum( [ 1 << p for p in peers ] ) )
+
+    def test_bad_rcb_type(self) :
+        with self.assertRaises(AssertionError) :
+            map_row_col_to_indexes( 3, 0, 0 )
+
+    def test_other_sizes(self) :
+        for (rcb_size, blk_height, blk_width) in [ (4,2,2), (6,2,3), (8,2,4), (9,3,3),
+                                                   (12,3,4), (16,4,4), (25,5,5) ] :
+            geometry = geometry_for_rcb_size(rcb_size)
+            self.assertEqual( (geometry.blk_height, geometry.blk_width), (blk_height, blk_width) )
+            self.assertIs   ( geometry, get_geometry(blk_height, blk_width) )  # shared
+            self.assertIs   ( geometry, geometry_for_num_cells(rcb_size*rcb_size) )
+            self.assertEqual( geometry.num_cells, rcb_size*rcb_size )
+            self.assertEqual( geometry.all_cell_values, frozenset(range(1,rcb_size+1)) )
+
+            # Every unit has every cell exactly once
+            for unit in geometry.unit_cells :
+                self.assertEqual( len(set(unit)), rcb_size )
+            for rcb_type in ALL_RCB_TYPES :
+                cells = [ c for cells in geometry.rcb_cells[rcb_type] for c in cells ]
+                self.assertEqual( sorted(cells), list(range(geometry.num_cells)) )
+
+            num_peers = 3*(rcb_size-1) - (blk_height-1) - (blk_width-1)
+            for peers in geometry.cell_peers :
+                self.assertEqual( len(peers), num_peers )
+
+        self.assertIs( geometry_for_rcb_size(RCB_SIZE), DEFAULT_GEOMETRY )
+
+        # 6x6 has 2 rows of 3 cells in a blk
+        six = get_geometry(2,3)
+        self.assertEqual( six.name, "6x6(2x3)" )
+        self.assertEqual( six.rcb_cells[RCB_TYPE_BLK][1], (3,4,5, 9,10,11) )
+        self.assertEqual( six.rcb_cells[RCB_TYPE_BLK][2], (12,13,14, 18,19,20) )
+
+        for bad in [ 3, 5, 7, 13, MAX_RCB_SIZE+1 ] :
+            with self.assertRaises(ExcBadPuzzleInput) :
+                geometry_for_rcb_size(bad)
+        with self.assertRaises(ExcBadPuzzleInput) :
+            geometry_for_num_cells(80)
+
+    def test_value_chars(self) :
+        self.assertEqual( value_to_char(0),  '0' )
+        self.assertEqual( value_to_char(9),  '9' )
+        self.assertEqual( value_to_char(10), 'A' )
+        self.assertEqual( value_to_char(25), 'P' )
+        for value in range(MAX_RCB_SIZE+1) :
+            self.assertEqual( char_to_value(value_to_char(value)), value )
+        self.assertEqual( char_to_value('g'), 16 )
+        self.assertIsNone( char_to_value('.') )
+        self.assertIsNone( char_to_value(' ') )
+
+    def test_char_values_table(self) :
+        self.assertEqual( b"0123456789.".translate(CHAR_VALUES_TABLE),
+                          bytes([0,1,2,3,4,5,6,7,8,9,0]) )
+        for bad in b"A /x" :
+            self.assertEqual( CHAR_VALUES_TABLE[bad], BAD_CHAR_VALUE )
+
+
+if __name__ == "__main__" :
+    # Run the unittests
+    unittest.main()
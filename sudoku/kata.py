@@ -2,8 +2,8 @@
 # dinkum/sudoku/kata.py
 ''' sudoku_solver() solves a sudoku puzzle
 
-Solution technique does NOT involve guessing.
-It only fills in cells that have no alternative.
+Solution technique fills in cells that have no alternative
+and guesses (with backtracking) when it runs out of those.
 
 It is the format required by an on-line sudoku/python
 site:
@@ -18,25 +18,65 @@ https://www.codewars.com/kata/hard-sudoku-solver-1
 # 2019-11-25 tc move Board/RCB/Cell into own files
 # 2019-11-30 tc trimmed imports
 # 2019-11-30 tc Renamed kata.py
+# 2026-10-18 tc Board.solve() searches, empty puzzle no longer unsolvable
+# 2026-10-18 tc Added engine argument
+# 2026-10-18 tc raise ExcMultipleSolutions
+# 2026-10-18 tc consult a SolutionCache
+# 2026-10-18 tc No cache unless one is passed
 
 from dinkum.sudoku.board import *
+from dinkum.sudoku.cache import *
 
-def sudoku_solver(puzzle):
-    ''' return solution to puzzle as a Board
-    raise Exception on no solutions
+def sudoku_solver(puzzle, engine=ENGINE_SEARCH, solution_cache=None):
+    ''' return solution to puzzle as a [] of row-lists
+    raise ExcUnsolvable on no solutions
+    raise ExcMultipleSolutions on more than one
     puzzle should be [] of row-lists
+    engine is passed to Board.solutions(), one of ALL_ENGINES
+    solution_cache is the SolutionCache looked in first, and told
+    what we find.  None (the default) is no cache, pass
+    default_solution_cache() for the one on disk.
     '''
 
     board = Board(puzzle, None, "created by sudoku_solver()")
 
-    # Return a board that solves board
-    solution=board.solve()
+    cache  = solution_cache
+    cached = None
+    if cache is not None :
+        cache_key = cache.key(board)
+        cached    = cache.get(cache_key)
+    if cached is None or cached[0] == CACHE_SOLVED :
+        # Don't know if it's unique
+        cached = _solve_uniquely(board, engine)
+        if cache is not None :
+            cache.put(cache_key, cached[1], cached[0])
 
     # Toss Exception if can't solve
-    if solution :
-        return solution.output() # Uniquely solved!
-    else :
+    (status, values) = cached
+    if status == CACHE_UNSOLVABLE :
         raise ExcUnsolvable()
+    if status == CACHE_MULTIPLE :
+        raise ExcMultipleSolutions()
+
+    # Uniquely solved!
+    rcb_size = board.geometry.rcb_size
+    return [ list( values[row_start:row_start + rcb_size] )
+             for row_start in range(0, len(values), rcb_size) ]
+
+
+def _solve_uniquely(board, engine) :
+    ''' Returns (CACHE_* status, solution values) of board
+    using engine.  See sudoku_solver()
+    '''
+    # We only need to look for a second solution
+    # to know there is more than one
+    solutions = board.solutions(engine)
+    solution  = next(solutions, None)
+    if not solution :
+        return (CACHE_UNSOLVABLE, b'')
+
+    values = bytes( [ cell.value for cell in solution.cells ] )
+    return (CACHE_MULTIPLE if next(solutions, None) else CACHE_UNIQUE, values)
         
 
 
@@ -45,15 +85,110 @@ def sudoku_solver(puzzle):
 
 # Test code
 import unittest
+import os
+import tempfile
+from dinkum.utils.state_space import set_state_root, reset_state_root
 
 class Test_kata(unittest.TestCase):
 
+    def setUp(self) :
+        # Keep default_solution_cache() out of the real state space
+        self.state_root = tempfile.TemporaryDirectory()
+        set_state_root(self.state_root.name, True)
+
+    def tearDown(self) :
+        reset_state_root()
+        self.state_root.cleanup()
+
     def test_unsolvable(self) :
-        # Try to solve a puzzle with all unknowns... Can't be done
-        puzzle = [ [0] * 9 for i in range(9) ]
+        # The kato puzzle with a wrong value (7) at (0,6)
+        # Can't be seen by looking at the givens, it takes a search
+        puzzle = [[0, 0, 6, 1, 0, 0, 7, 0, 8],
+                  [0, 8, 0, 0, 9, 0, 0, 3, 0],
+                  [2, 0, 0, 0, 0, 5, 4, 0, 0],
+                  [4, 0, 0, 0, 0, 1, 8, 0, 0],
+                  [0, 3, 0, 0, 7, 0, 0, 4, 0],
+                  [0, 0, 7, 9, 0, 0, 0, 0, 3],
+                  [0, 0, 8, 4, 0, 0, 0, 0, 6],
+                  [0, 2, 0, 0, 5, 0, 0, 8, 0],
+                  [1, 0, 0, 0, 0, 2, 5, 0, 0]]
 
         self.assertRaises(ExcUnsolvable, sudoku_solver, puzzle)
 
+    def test_multiple_solutions(self) :
+        # Try to solve a puzzle with all unknowns... Lots of answers
+        puzzle = [ [0] * 9 for i in range(9) ]
+        for engine in ALL_ENGINES :
+            self.assertRaises(ExcMultipleSolutions, sudoku_solver, puzzle, engine)
+
+        # kato with the 4 at (3,0) removed has 2 solutions
+        puzzle = [[0, 0, 6, 1, 0, 0, 0, 0, 8],
+                  [0, 8, 0, 0, 9, 0, 0, 3, 0],
+                  [2, 0, 0, 0, 0, 5, 4, 0, 0],
+                  [0, 0, 0, 0, 0, 1, 8, 0, 0],
+                  [0, 3, 0, 0, 7, 0, 0, 4, 0],
+                  [0, 0, 7, 9, 0, 0, 0, 0, 3],
+                  [0, 0, 8, 4, 0, 0, 0, 0, 6],
+                  [0, 2, 0, 0, 5, 0, 0, 8, 0],
+                  [1, 0, 0, 0, 0, 2, 5, 0, 0]]
+        self.assertRaises(ExcMultipleSolutions, sudoku_solver, puzzle)
+
+    def test_engines(self) :
+        puzzle = [[0, 0, 6, 1, 0, 0, 0, 0, 8],
+                  [0, 8, 0, 0, 9, 0, 0, 3, 0],
+                  [2, 0, 0, 0, 0, 5, 4, 0, 0],
+                  [4, 0, 0, 0, 0, 1, 8, 0, 0],
+                  [0, 3, 0, 0, 7, 0, 0, 4, 0],
+                  [0, 0, 7, 9, 0, 0, 0, 0, 3],
+                  [0, 0, 8, 4, 0, 0, 0, 0, 6],
+                  [0, 2, 0, 0, 5, 0, 0, 8, 0],
+                  [1, 0, 0, 0, 0, 2, 5, 0, 0]]
+
+        # No caching, so each engine does the work
+        solutions = [ sudoku_solver(puzzle, engine, SolutionCache(False, 0)) for engine in ALL_ENGINES ]
+        for solution in solutions :
+            self.assertEqual( solution, solutions[0] )
+
+        # Unsolvable with every engine
+        puzzle[0][6] = 7
+        for engine in ALL_ENGINES :
+            self.assertRaises(ExcUnsolvable, sudoku_solver, puzzle, engine, SolutionCache(False, 0))
+
+    def test_cache(self) :
+        puzzle = [[0, 0, 6, 1, 0, 0, 0, 0, 8],
+                  [0, 8, 0, 0, 9, 0, 0, 3, 0],
+                  [2, 0, 0, 0, 0, 5, 4, 0, 0],
+                  [0, 0, 0, 0, 0, 1, 8, 0, 0],
+                  [0, 3, 0, 0, 7, 0, 0, 4, 0],
+                  [0, 0, 7, 9, 0, 0, 0, 0, 3],
+                  [0, 0, 8, 4, 0, 0, 0, 0, 6],
+                  [0, 2, 0, 0, 5, 0, 0, 8, 0],
+                  [1, 0, 0, 0, 0, 2, 5, 0, 0]]
+        cache = SolutionCache(False)
+
+        # Board.solve() finds one of it's 2 solutions, that doesn't
+        # make it unique
+        board = Board(puzzle)
+        board.solution_cache = cache
+        self.assertTrue( board.solve() )
+        self.assertRaises(ExcMultipleSolutions, sudoku_solver, puzzle, ENGINE_SEARCH, cache)
+        self.assertEqual( cache.get( cache.key(Board(puzzle)) )[0], CACHE_MULTIPLE )
+
+        # Unique from the cache
+        puzzle[3][0] = 4
+        solution = sudoku_solver(puzzle, ENGINE_SEARCH, cache)
+        (hits, misses) = (cache.hits, cache.misses)
+        self.assertEqual( sudoku_solver(puzzle, ENGINE_DLX, cache), solution )
+        self.assertEqual( (cache.hits, cache.misses), (hits + 1, misses) )
+
+        # Nothing is written to disk unless asked
+        self.assertEqual( sudoku_solver(puzzle), solution )
+        self.assertFalse( os.path.exists( SolutionCache().filename ) )
+
+        # Ditto for the default cache, which is on disk
+        self.assertEqual( sudoku_solver(puzzle, ENGINE_SEARCH, default_solution_cache()), solution )
+        self.assertEqual( SolutionCache().get( cache.key(Board(puzzle)) )[0], CACHE_UNIQUE )
+
     def test_presolved(self) :
         presolved = [[3, 4, 6, 1, 2, 7, 9, 5, 8], 
                      [7, 8, 5, 6, 9, 4, 1, 3, 2], 
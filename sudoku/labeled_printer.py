@@ -66,6 +66,7 @@ Example empty board:
 # 2019-11-26 tc Fixed import problem
 # 2019-12-01 tc minor todo knockoff.  get row# from rgb rather than cell
 # 2019-12-03 tc Made cell# and num_possible printouts optional
+# 2026-10-18 tc Layout comes from the board's geometry, any size board
 
 #--------------------------------------------------------------
 from dinkum.sudoku.board    import *
@@ -83,12 +84,29 @@ cell_width   = 6
 cell_height  = 4
 
 # Width of whole printed board
-left_offset_to_first_cell = 2           # Accounts for row label and one |
-right_pad_after_last_cell = 3           # || + row_label
-width_of_internal_block_separators = 2  # Two internal |'s
+# These depend on the size of the board, see dinkum.sudoku.geometry
+def row_label_width(geometry=DEFAULT_GEOMETRY) :
+    ''' # of chars in the widest row label '''
+    return len(str(geometry.rcb_size-1))
 
-output_width = left_offset_to_first_cell + cell_width * RCB_SIZE +     \
-               width_of_internal_block_separators + right_pad_after_last_cell
+def left_offset_to_first_cell(geometry=DEFAULT_GEOMETRY) :
+    ''' Accounts for row label and one | '''
+    return row_label_width(geometry) + 1
+
+def right_pad_after_last_cell(geometry=DEFAULT_GEOMETRY) :
+    ''' || + row_label '''
+    return 2 + row_label_width(geometry)
+
+def width_of_internal_block_separators(geometry=DEFAULT_GEOMETRY) :
+    ''' One internal | between each blk in a row of blks '''
+    return geometry.rcb_size // geometry.blk_width - 1
+
+def board_output_width(geometry=DEFAULT_GEOMETRY) :
+    ''' Width of every output line '''
+    return (left_offset_to_first_cell(geometry) + cell_width * geometry.rcb_size +
+            width_of_internal_block_separators(geometry) + right_pad_after_last_cell(geometry))
+
+output_width = board_output_width()  # of a 9x9 board
 
 # Height of whole printed board
 top_offset_to_first_cell = 2 # column label + '-'
@@ -126,7 +144,7 @@ def labeled_board(board=None, want_cell_nums=True, want_num_possibles=False) :
 
     #    0  1  2 ...
     # /--------------------------------\  #
-    ws += top_or_bottom_lines(is_top=True)
+    ws += top_or_bottom_lines(is_top=True, geometry=board.geometry)
 
     # Stuff in the middle, e.g.
     # 1|  9 10 11 | 12 13 14 | 15 16 17 |1
@@ -135,29 +153,30 @@ def labeled_board(board=None, want_cell_nums=True, want_num_possibles=False) :
 
     # \ --------------------------------/ #
     #    0  1  2 ...
-    ws += top_or_bottom_lines(is_top=False)
+    ws += top_or_bottom_lines(is_top=False, geometry=board.geometry)
         
     return ws
 
 
-def top_or_bottom_lines(is_top) :
+def top_or_bottom_lines(is_top, geometry=DEFAULT_GEOMETRY) :
     ''' returns [] of [column label line, horz separator line. e.g.
-    is_top controls whether top or bottom lines.  Example of a top line
+    is_top controls whether top or bottom lines.
+    geometry is the layout of the board.  Example of a top line
         0     1     2      3     4     5      6     7     8     
     /---------------------------------------------------------\ 
     '''
 
     if is_top :
         # column label and separator line
-        ret_list  = col_label_lines()               # 0 1 2 ...
-        ret_list += horz_separator_lines('/', '\\') # /----------\
+        ret_list  = col_label_lines(geometry)                 # 0 1 2 ...
+        ret_list += horz_separator_lines('/', '\\', geometry) # /----------\
         assert len(ret_list) == top_offset_to_first_cell
         return ret_list
 
     else :
         # bottom
-        ret_list =  horz_separator_lines('\\', '/')                       # \---------------/ 
-        ret_list += col_label_lines()                                     #     0     1   2 ...
+        ret_list =  horz_separator_lines('\\', '/', geometry)             # \---------------/ 
+        ret_list += col_label_lines(geometry)                             #     0     1   2 ...
 
         assert len(ret_list) == bot_pad_after_last_cell
         return ret_list
@@ -189,7 +208,9 @@ def row_line(row, want_cell_nums, want_num_possibles) :
     '''
 
     # Which row we are working on
-    row_num = row.rcb_num
+    row_num  = row.rcb_num
+    geometry = row.geometry
+    label_width = row_label_width(geometry)
 
     # What we return.  Gets filled in below                     
     ret_lines= [None] * cell_height
@@ -201,7 +222,7 @@ def row_line(row, want_cell_nums, want_num_possibles) :
     # the row.  block number labels will be inserted into this line
     # above and below the middle cell in the block. Example:
     #  |---------------------------------------------------------| 
-    ret_lines = horz_separator_lines()
+    ret_lines = horz_separator_lines(geometry=geometry)
 
     # Each individual row is made of multiple output lines.
     # Iterate over them
@@ -213,7 +234,7 @@ def row_line(row, want_cell_nums, want_num_possibles) :
                   # moving left to right
 
         # Time to place row label on outside ?
-        line += str(row_num) if line_num_in_row == cell_height//2 else ' '
+        line += str(row_num).rjust(label_width) if line_num_in_row == cell_height//2 else ' ' * label_width
 
         line += vert_line_char 
 
@@ -228,7 +249,7 @@ def row_line(row, want_cell_nums, want_num_possibles) :
             if line_num_in_row == first_line_of_cell_content and cell.blk_idx == 0 :
                 # yes, it's first cell in block
                 ret_lines[0] = replace_substr_at(ret_lines[0], str(cell.blk_num),
-                                                 block_label_offset_in_line(cell))
+                                                 block_label_offset_in_line(cell, geometry))
 
             # cell's left edge
             line += vert_line_char
@@ -258,7 +279,7 @@ def row_line(row, want_cell_nums, want_num_possibles) :
                     line_num_in_row <
                     (value_label_vert_offset_in_cell + value_label_vert_num)) :
                     # Yes, replace the chars
-                    cell_content = replace_substr_at(cell_content, str(cell.value) * value_label_horz_num,
+                    cell_content = replace_substr_at(cell_content, value_to_char(cell.value) * value_label_horz_num,
                                                      value_label_horz_offset_in_cell)
             else :
                 # cell is unsolved, maybe a number of possible values
@@ -281,7 +302,7 @@ def row_line(row, want_cell_nums, want_num_possibles) :
                 line = replace_substr_at(line, cell_label, -cell_width)
 
             # Time to place an internal (not on edges) vertical block separator ?
-            if is_cell_rightmost_in_block_and_internal(cell.col_num) :
+            if is_cell_rightmost_in_block_and_internal(cell.col_num, geometry) :
                 line += vert_line_char
 
         # right border of last cell in the row (the one we just output)
@@ -291,10 +312,10 @@ def row_line(row, want_cell_nums, want_num_possibles) :
         line += vert_line_char 
 
         # Time to place row label on outside ?
-        line += str(row_num) if line_num_in_row == cell_height//2 else ' '
+        line += str(row_num).ljust(label_width) if line_num_in_row == cell_height//2 else ' ' * label_width
 
         # All done composing line
-        assert len(line) == output_width, "is: %d, should be:%d" %(len(line), output_width)
+        assert len(line) == board_output_width(geometry), "is: %d, should be:%d" %(len(line), board_output_width(geometry))
 
         # Set our result in the [] we return
         ret_lines.append(line)
@@ -303,12 +324,12 @@ def row_line(row, want_cell_nums, want_num_possibles) :
 
     # If this is the bottom row of an internal block, we need
     # to separate it by adding another line of ----------'s
-    if is_cell_bottom_most_in_block_and_internal(row_num) :
-        ret_lines += horz_separator_lines()
+    if is_cell_bottom_most_in_block_and_internal(row_num, geometry) :
+        ret_lines += horz_separator_lines(geometry=geometry)
 
     return ret_lines
 
-def horz_separator_lines(first_char=vert_line_char, last_char=vert_line_char) :
+def horz_separator_lines(first_char=vert_line_char, last_char=vert_line_char, geometry=DEFAULT_GEOMETRY) :
     ''' Returns [] of lines making up top or bottom
     lines, e.g.
            0     1     2      3     4     5      6     7     8     
@@ -322,33 +343,34 @@ def horz_separator_lines(first_char=vert_line_char, last_char=vert_line_char) :
     # -----------
     # Start with full line of lines
     # and overwrite what we need to
-    sep_line = horz_line_char * output_width
+    sep_line = horz_line_char * board_output_width(geometry)
 
     # Overwrite first and last chars with spaces
     # to account for row label's
-
-    sep_line = replace_substr_at(sep_line, ' ',  0)
-    sep_line = replace_substr_at(sep_line, ' ' , -1)
+    label_width = row_label_width(geometry)
+    sep_line = replace_substr_at(sep_line, ' ' * label_width,  0)
+    sep_line = replace_substr_at(sep_line, ' ' * label_width, -label_width)
 
     # overwrite first and last chars that were passed in                    
-    sep_line = replace_substr_at(sep_line, first_char,  1)
-    sep_line = replace_substr_at(sep_line, last_char , -2)
+    sep_line = replace_substr_at(sep_line, first_char,  label_width)
+    sep_line = replace_substr_at(sep_line, last_char , -label_width-1)
 
     # All done
     return [sep_line]
 
-def col_label_lines() :
-    ''' returns [] of lines that label the columns.
+def col_label_lines(geometry=DEFAULT_GEOMETRY) :
+    ''' returns [] of lines that label the columns of a board
+    laid out per geometry.
     Each line is NOT \n terminated.
     '''
     
     # Start with stuff on left before first Cell
     # "   "
-    col_label_line = left_pad()
+    col_label_line = left_pad(geometry)
 
     # Do the stuff above a row of cells
     # We don't care which row
-    row = Board().rows[0]
+    row = Board(None, None, "", geometry).rows[0]
 
     for cell in row :
         # A cell_width blank string
@@ -360,7 +382,7 @@ def col_label_lines() :
 
         # We have to account for vertical block separators
         # to keep the center alignment of column numbers
-        if is_cell_rightmost_in_block_and_internal(cell.col_num) :
+        if is_cell_rightmost_in_block_and_internal(cell.col_num, geometry) :
             cell_line += ' '
 
         # Tack it on
@@ -368,40 +390,44 @@ def col_label_lines() :
     
     # Fill out the rest of the line
     # "   "
-    col_label_line += right_pad()
+    col_label_line += right_pad(geometry)
 
     # Give them back list of our one generated line
     return [col_label_line]
     
-def is_cell_rightmost_in_block_and_internal(col_num) :
+def is_cell_rightmost_in_block_and_internal(col_num, geometry=DEFAULT_GEOMETRY) :
     ''' Returns true if cell in col_num needs a block
     separator to it's right AND it isn't the last cell
     on the line.  Hence the internal word
     '''
-    return col_num==2  or col_num==5
+    return (col_num+1) % geometry.blk_width == 0 and col_num != geometry.rcb_size-1
 
-def is_cell_bottom_most_in_block_and_internal(row_num) :
+def is_cell_bottom_most_in_block_and_internal(row_num, geometry=DEFAULT_GEOMETRY) :
     ''' Returns True if the row at row_num is the
     bottommost row of the block AND and not on the
     bottom row of the board, hence the use of internal.
     '''
-    return row_num==2 or row_num==5
+    return (row_num+1) % geometry.blk_height == 0 and row_num != geometry.rcb_size-1
 
 def is_cell_above_in_middle_of_block(cell) :
     ''' returns TRUE if cell is the center cell
     of it's block
     '''
-    return cell.row_num in [1,4,7] and cell.col_num in [1,4,7]
+    geometry = cell.geometry
+    return (cell.row_num % geometry.blk_height == geometry.blk_height//2 and
+            cell.col_num % geometry.blk_width  == geometry.blk_width//2)
 
 
 def is_cell_in_middle_of_block(cell) :
     ''' returns TRUE if cell is the center cell
     in the bottom row of it's block.
     '''
-    return cell.row_num in [2,5,8] and cell.col_num in [1,4,7]
+    geometry = cell.geometry
+    return (cell.row_num % geometry.blk_height == geometry.blk_height-1 and
+            cell.col_num % geometry.blk_width  == geometry.blk_width//2)
 
 
-def block_label_offset_in_line(cell) :
+def block_label_offset_in_line(cell, geometry=DEFAULT_GEOMETRY) :
     ''' Returns the offset in a full output line where
     the block label of cell should be placed.
     :example
@@ -410,29 +436,28 @@ def block_label_offset_in_line(cell) :
 
     # The label is in the upper right corner of the first
     # cell (upper left) in the block
-    block_label_offset = top_offset_to_first_cell # offset for cell 0
+    block_label_offset = left_offset_to_first_cell(geometry) # offset for cell 0
 
     # Move it over as required
-    blk_in_line = cell.blk_num %  BLK_SIZE # 0,1,or 2
+    blks_per_line = geometry.rcb_size // geometry.blk_width
+    blk_in_line = cell.blk_num % blks_per_line # e.g. 0,1,or 2
     num_vert_separator_lines = blk_in_line  # How many internal |s there are
-    block_label_offset +=  blk_in_line * BLK_SIZE * cell_width + num_vert_separator_lines
+    block_label_offset +=  blk_in_line * geometry.blk_width * cell_width + num_vert_separator_lines
 
     return block_label_offset
 
-def left_pad() :
+def left_pad(geometry=DEFAULT_GEOMETRY) :
     ''' Returns a string that makes up the left edge of the output board.
     '''
-    ret_str = '  '
-    assert len(ret_str) == left_offset_to_first_cell
+    ret_str = ' ' * left_offset_to_first_cell(geometry)
     return ret_str
 
 
-def right_pad() :
+def right_pad(geometry=DEFAULT_GEOMETRY) :
     ''' Returns a string that makes up the right edge of the output board.
         It's all spaces.
     '''
-    ret_str = '   '
-    assert len(ret_str) == right_pad_after_last_cell
+    ret_str = ' ' * right_pad_after_last_cell(geometry)
 
     return ret_str
 
@@ -667,6 +692,26 @@ class Test_labeled_printer(unittest.TestCase):
         got = labeled_board( board, want_cell_nums=True, want_num_possibles=True )
         self.assertEqual(got, Test_labeled_printer.test_board_output_cell_and_num_possibles)
 
+    def test_other_sizes(self) :
+        # 4x4 has 2x2 blks
+        board = Board( "1 0 0 0  0 0 0 0  0 0 0 0  0 0 0 0", "four" )
+        got = labeled_board( board, want_cell_nums=True, want_num_possibles=True )
+        self.assertEqual(got[:6], [
+            "     0     1      2     3     ",
+            " /--------------------------\\ ",
+            " |0------------1------------| ",
+            " |0     1     |2     3     || ",
+            "0||  1  |     ||     |     ||0",
+            " ||     |3    ||3    |3    || ",
+        ])
+
+        # Two digit row labels on a 16x16
+        got = labeled_board( Board("0" * 256) )
+        for line in got :
+            self.assertEqual( len(line), board_output_width(get_geometry(4,4)) )
+        self.assertTrue( got[-4].startswith("15||") )
+        self.assertTrue( got[-4].endswith  ("||15") )
+
 if __name__ == "__main__" :
     # Run the unittests
     unittest.main()
@@ -0,0 +1,466 @@
+#!/usr/bin/env python3
+# dinkum/sudoku/puzzle_file.py
+''' Reads big files of sudoku puzzles, one per line.
+
+A fixed width file has every puzzle on a line of exactly NUM_CELLS
+chars of 1-9, with . or 0 as blanks, then a newline.  So every record
+is RECORD_SIZE (82) bytes, and puzzle i starts at byte i*RECORD_SIZE.
+
+PuzzleFile mmaps a fixed width file, so opening a 50M puzzle file
+reads nothing.  Puzzles are handed out by index as memoryviews of
+the mapped file, and only become a str, values or a Board when
+asked.  A slice, or a shard(), is a PuzzleFile sharing the mapping,
+so a big file can be split between workers by index or byte offset.
+
+gzip, bz2 and xz files can't be mapped.  read_puzzles() streams
+them (or any file of one puzzle per line) a puzzle at a time.
+
+Some useful functions:
+    PuzzleFile(filename)           a mapped fixed width file
+    puzzle_file[i]                 memoryview of puzzle i's chars
+    puzzle_file[i:j]               PuzzleFile of puzzles i..j-1
+    puzzle_file.puzzle(i)          str of puzzle i
+    puzzle_file.values(i)          bytes of puzzle i's values
+    puzzle_file.board(i)           Board of puzzle i
+    puzzle_file.shard(shard_num, num_shards) PuzzleFile of a share of them
+    read_puzzles(filename, start, stop)      iterator of str puzzles
+'''
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc Every record's newline is checked as it's read
+# 2026-10-18 tc read_puzzles() reads lines after a bad fixed width record
+# 2026-10-18 tc chars to values table moved to dinkum.sudoku.geometry
+
+from dinkum.sudoku          import * # All package wide def's
+from dinkum.sudoku.board    import Board
+from dinkum.sudoku.geometry import CHAR_VALUES_TABLE, BAD_CHAR_VALUE
+
+import bz2
+import gzip
+import io
+import itertools
+import lzma
+import mmap
+import os
+import sys
+
+# Bytes in each puzzle of a fixed width file, including the newline
+RECORD_SIZE = NUM_CELLS + 1
+_NEWLINE    = ord('\n')
+
+# How compressed files start.  [] of (magic bytes, open function)
+_COMPRESSIONS = [ (b'\x1f\x8b',         gzip.open),
+                  (b'BZh',              bz2.open ),
+                  (b'\xfd7zXZ\x00',     lzma.open) ]
+_MAGIC_SIZE   = max( [ len(magic) for (magic, opener) in _COMPRESSIONS ] )
+
+
+class PuzzleFile :
+    ''' The puzzles of a fixed width file, see module doc.
+
+        filename   What was opened
+        offset(i)  Byte offset in the file of puzzle i
+
+    len() is the number of puzzles, indexing gives a memoryview of a
+    puzzle's NUM_CELLS chars, and iterating gives all of them in order.
+    Slices (step 1) and shard() share our mapping.
+
+    Use as a context manager, or close() when done.  memoryviews
+    still held after close() keep the mapping alive until they're gone.
+    '''
+
+    def __init__(self, filename) :
+        ''' mmaps filename.
+
+        raise ExcBadPuzzleInput if filename isn't a whole number of
+        RECORD_SIZE records, each ending in a newline.  Only the first
+        and last records are checked here, the rest are checked as they
+        are read.  The last newline may be missing.
+        OSError if filename can't be opened.
+        '''
+        self.filename = filename
+        with open(filename, 'rb') as file :
+            size = os.fstat( file.fileno() ).st_size
+
+            # The last newline is optional
+            if size % RECORD_SIZE == NUM_CELLS :
+                size += 1
+            if size % RECORD_SIZE :
+                raise ExcBadPuzzleInput( "%s: %d bytes, not a whole number of %d byte puzzles" %
+                                         (filename, size, RECORD_SIZE) )
+
+            # Can't mmap an empty file
+            self._mmap = mmap.mmap( file.fileno(), 0, access=mmap.ACCESS_READ ) if size else None
+
+        self._buffer = memoryview(self._mmap) if size else memoryview(b'')
+        self._owner  = True
+        self._puzzle_nums = range( size // RECORD_SIZE )
+
+        # Check the ends
+        for puzzle_num in set( [ self._puzzle_nums[0], self._puzzle_nums[-1] ] if size else [] ) :
+            newline = self._buffer[ puzzle_num * RECORD_SIZE + NUM_CELLS : (puzzle_num+1) * RECORD_SIZE ]
+            if bytes(newline) not in (b'\n', b'') :
+                raise ExcBadPuzzleInput( "%s: puzzle %d isn't %d chars and a newline" %
+                                         (filename, puzzle_num + 1, NUM_CELLS) )
+
+    def _view(self, puzzle_nums) :
+        ''' Returns a PuzzleFile of puzzle_nums, a range, sharing our mapping '''
+        view = object.__new__(PuzzleFile)
+        view.filename     = self.filename
+        view._mmap        = None
+        view._owner       = False  # We close it, not them
+        view._buffer      = self._buffer
+        view._puzzle_nums = puzzle_nums
+        return view
+
+    def __len__(self) :
+        return len(self._puzzle_nums)
+
+    def __getitem__(self, index) :
+        ''' Returns a memoryview of the chars of puzzle index,
+        or if index is a slice, a PuzzleFile of those puzzles.
+        '''
+        if isinstance(index, slice) :
+            puzzle_nums = self._puzzle_nums[index]
+            if puzzle_nums.step != 1 :
+                raise ValueError( "PuzzleFile slices must have a step of 1" )
+            return self._view(puzzle_nums)
+
+        return self._record( self._puzzle_nums[index] )
+
+    def __iter__(self) :
+        for puzzle_num in self._puzzle_nums :
+            yield self._record(puzzle_num)
+
+    def _record(self, puzzle_num) :
+        ''' Returns a memoryview of the chars of puzzle# puzzle_num.
+        raise ExcBadPuzzleInput if they aren't between newlines,
+        i.e. some line before or this one is the wrong length.
+        '''
+        buffer = self._buffer
+        start  = puzzle_num * RECORD_SIZE
+        end    = start + NUM_CELLS
+        if start and buffer[start - 1] != _NEWLINE :
+            bad_puzzle_num = puzzle_num       # The one before us
+        elif end < len(buffer) and buffer[end] != _NEWLINE :
+            bad_puzzle_num = puzzle_num + 1   # Us
+        else :
+            return buffer[start:end]
+        raise ExcBadPuzzleInput( "%s: puzzle %d isn't %d chars and a newline" %
+                                 (self.filename, bad_puzzle_num, NUM_CELLS) )
+
+    def offset(self, index) :
+        ''' Returns the byte offset in the file of puzzle index '''
+        return self._puzzle_nums[index] * RECORD_SIZE
+
+    def byte_range(self) :
+        ''' Returns (start, stop) byte offsets in the file of our puzzles '''
+        return (self._puzzle_nums.start * RECORD_SIZE, self._puzzle_nums.stop * RECORD_SIZE)
+
+    def shard(self, shard_num, num_shards) :
+        ''' Returns a PuzzleFile of the shard_num'th of num_shards
+        nearly equal, contiguous shares of our puzzles.
+        '''
+        assert 0 <= shard_num < num_shards, "Bad shard: %d of %d" % (shard_num, num_shards)
+        num_puzzles = len(self)
+        return self[ num_puzzles * shard_num // num_shards : num_puzzles * (shard_num+1) // num_shards ]
+
+    def puzzle(self, index) :
+        ''' Returns str of the chars of puzzle index '''
+        return str( self[index], 'ascii', 'replace' )
+
+    def values(self, index) :
+        ''' Returns bytes of puzzle index's values, 0 for blanks.
+
+        raise ExcBadPuzzleInput on a char that isn't a value or blank
+        '''
+        record = self[index]
+        values = bytes(record).translate(CHAR_VALUES_TABLE)
+        bad_char_num = values.find(BAD_CHAR_VALUE)
+        if bad_char_num >= 0 :
+            raise ExcBadPuzzleInput( "%s: puzzle %d char %d: bad char: %r" %
+                                     (self.filename, self._puzzle_nums[index] + 1, bad_char_num + 1,
+                                      chr( record[bad_char_num] )) )
+        return values
+
+    def board(self, index, name=None, desc="") :
+        ''' Returns a Board of puzzle index.
+        raise ExcBadPuzzleInput if it's not a good puzzle.
+        raise ExcUnsolvable if an unsolved cell can't be anything.
+        '''
+        return Board.from_trusted( self.values(index), name, desc )
+
+    def close(self) :
+        ''' Unmaps the file.  Slices of us can't be used after.
+        Closing a slice does nothing.
+        '''
+        if not self._owner :
+            return
+        self._buffer.release()
+        if self._mmap is not None :
+            try :
+                self._mmap.close()
+            except BufferError :
+                pass   # Someone holds a puzzle.  It's unmapped when they let go
+            self._mmap = None
+
+    def __enter__(self) :
+        return self
+
+    def __exit__(self, *exc_info) :
+        self.close()
+
+
+def compression_open(filename) :
+    ''' Returns the function that opens filename, one of gzip.open,
+    bz2.open, lzma.open, or None if it's not compressed.  Decided by
+    how the file starts, not it's name.
+    '''
+    with open(filename, 'rb') as file :
+        return _compression_of( file.read(_MAGIC_SIZE) )
+
+
+def _compression_of(start) :
+    ''' Returns the function that opens a file starting
+    with bytes start, None if it's not compressed
+    '''
+    for (magic, opener) in _COMPRESSIONS :
+        if start.startswith(magic) :
+            return opener
+    return None
+
+
+def read_puzzles(filename, start=0, stop=None) :
+    ''' Returns an iterator of str of every puzzle in filename from
+    puzzle# start up to, but not including, puzzle# stop (None is all).
+    Puzzles are one per line, blank lines are ignored, and whitespace
+    is stripped.  - is stdin.
+
+    gzip, bz2 and xz files are decompressed as they are read.  A fixed
+    width file is mapped with PuzzleFile, so nothing before start is read.
+
+    raise OSError if filename can't be opened.
+    A file that looked fixed width, but turns out to have a line of the
+    wrong length, is read a line at a time from the last good line.
+    '''
+    if filename == '-' :
+        file   = sys.stdin.buffer
+        opener = _compression_of( file.peek(_MAGIC_SIZE)[:_MAGIC_SIZE] )
+    else :
+        opener = compression_open(filename)
+        if opener is None :
+            try :
+                puzzle_file = PuzzleFile(filename)
+            except ExcBadPuzzleInput :
+                pass  # Not fixed width, read it a line at a time
+            else :
+                return _mapped_puzzles(puzzle_file, start, stop)
+        file = open(filename, 'rb')
+
+    # Bad chars become ?, and are reported when the puzzle is used
+    if opener :
+        file = opener(file, 'rt', encoding='ascii', errors='replace')
+    else :
+        file = io.TextIOWrapper(file, encoding='ascii', errors='replace')
+    return itertools.islice( _stripped_lines(file), start, stop )
+
+
+def _mapped_puzzles(puzzle_file, start, stop) :
+    ''' generator of str of puzzles start..stop-1 in PuzzleFile
+    puzzle_file, which is closed when done.
+
+    If a record isn't a line, i.e. some line is the wrong length,
+    the rest are read a line at a time from the last good line, or
+    from the start of the file if there isn't one.
+    '''
+    with puzzle_file :
+        puzzles = puzzle_file[start:stop]
+        for index in range( len(puzzles) ) :
+            try :
+                puzzle = puzzles[index]
+            except ExcBadPuzzleInput :
+                break
+            yield str(puzzle, 'ascii', 'replace')
+        else :
+            return   # All good
+
+        # Where does a line we know is puzzle# start+index start?
+        offset = puzzles.offset(index)
+        if index or not offset or puzzle_file._buffer[offset - 1] == _NEWLINE :
+            (skip, num) = (0, None if stop is None else stop - start - index)
+        else :
+            (offset, skip, num) = (0, start, stop)   # Count lines from the top
+
+    file = open(puzzle_file.filename, 'rb')
+    file.seek(offset)
+    file = io.TextIOWrapper(file, encoding='ascii', errors='replace')
+    yield from itertools.islice( _stripped_lines(file), skip, num )
+
+
+def _stripped_lines(file) :
+    ''' generator of every non-blank line of file, stripped.
+    file is closed when done.
+    '''
+    with file :
+        for line in file :
+            line = line.strip()
+            if line :
+                yield line
+
+
+# Test code
+import unittest
+import subprocess
+import tempfile
+import dinkum.sudoku.board
+
+class Test_puzzle_file(unittest.TestCase):
+
+    def setUp(self) :
+        self.tmpdir = tempfile.TemporaryDirectory()
+
+        # Some good puzzles, and a few made by blanking more cells
+        spec = dinkum.sudoku.board.Test_board.hardest_spec_str
+        puzzle = ''.join( [ c for c in spec if c.isdigit() ] )
+        self.puzzles = [ puzzle, puzzle.replace('0', '.') ]
+        for i in range(8) :
+            self.puzzles.append( puzzle[:i*10] + '.' + puzzle[i*10+1:] )
+
+        self.filename = self.write("puzzles.txt", ''.join( [ p + '\n' for p in self.puzzles ] ).encode() )
+
+    def tearDown(self) :
+        self.tmpdir.cleanup()
+
+    def write(self, basename, data, opener=open) :
+        ''' Returns filename of data written to basename in tmpdir '''
+        filename = os.path.join(self.tmpdir.name, basename)
+        with opener(filename, 'wb') as file :
+            file.write(data)
+        return filename
+
+    def test_indexing(self) :
+        with PuzzleFile(self.filename) as puzzle_file :
+            self.assertEqual( len(puzzle_file), len(self.puzzles) )
+            self.assertIsInstance( puzzle_file[0], memoryview )
+            self.assertEqual( bytes(puzzle_file[3]), self.puzzles[3].encode() )
+            self.assertEqual( puzzle_file.puzzle(-1), self.puzzles[-1] )
+            self.assertEqual( [ bytes(p) for p in puzzle_file ], [ p.encode() for p in self.puzzles ] )
+            self.assertRaises( IndexError, puzzle_file.__getitem__, len(self.puzzles) )
+
+            # values and Boards
+            board = dinkum.sudoku.board.Board(self.puzzles[0])
+            self.assertEqual( puzzle_file.values(1), bytes( [ v for row in board.output() for v in row ] ) )
+            self.assertEqual( puzzle_file.board(1, "mapped"), board )
+
+    def test_slices_and_shards(self) :
+        with PuzzleFile(self.filename) as puzzle_file :
+            view = puzzle_file[2:5]
+            self.assertEqual( len(view), 3 )
+            self.assertEqual( view.puzzle(0), self.puzzles[2] )
+            self.assertEqual( view.offset(0), 2 * RECORD_SIZE )
+            self.assertEqual( view.byte_range(), (2 * RECORD_SIZE, 5 * RECORD_SIZE) )
+            self.assertEqual( view[1:].puzzle(0), self.puzzles[3] )
+            self.assertRaises( ValueError, puzzle_file.__getitem__, slice(0, 5, 2) )
+
+            # Shards cover everything once, in order
+            for num_shards in (1, 3, 4, 20) :
+                shards = [ puzzle_file.shard(n, num_shards) for n in range(num_shards) ]
+                self.assertEqual( [ bytes(p) for shard in shards for p in shard ],
+                                  [ bytes(p) for p in puzzle_file ] )
+                self.assertEqual( shards[0].byte_range()[0], 0 )
+                self.assertEqual( shards[-1].byte_range()[1], os.path.getsize(self.filename) )
+
+            # Holding a puzzle past close() is allowed
+            puzzle = puzzle_file[0]
+        self.assertEqual( bytes(puzzle), self.puzzles[0].encode() )
+
+    def test_bad_files(self) :
+        # Last newline is optional, empty is OK
+        with PuzzleFile( self.write("no_newline.txt", self.puzzles[0].encode()) ) as puzzle_file :
+            self.assertEqual( puzzle_file.puzzle(0), self.puzzles[0] )
+        with PuzzleFile( self.write("empty.txt", b'') ) as puzzle_file :
+            self.assertEqual( len(puzzle_file), 0 )
+            self.assertEqual( list(puzzle_file), [] )
+
+        for data in [ b'123\n', (self.puzzles[0] + '\r\n').encode() * 2,
+                      (self.puzzles[0] + 'x').encode() ] :
+            self.assertRaises( ExcBadPuzzleInput, PuzzleFile, self.write("bad.txt", data) )
+
+        # A short line then a long one is the right size, but is found as it's read
+        data = ( self.puzzles[0] + '\n' + self.puzzles[1][:-1] + '\n' +
+                 '1' + self.puzzles[2] + '\n' + self.puzzles[3] + '\n' ).encode()
+        self.assertEqual( len(data) % RECORD_SIZE, 0 )
+        filename = self.write("shifted.txt", data)
+        with PuzzleFile(filename) as puzzle_file :
+            self.assertEqual( puzzle_file.puzzle(0), self.puzzles[0] )
+            self.assertEqual( puzzle_file.puzzle(3), self.puzzles[3] )
+            for bad in ( lambda : puzzle_file[1], lambda : puzzle_file.values(2),
+                         lambda : list(puzzle_file) ) :
+                with self.assertRaises(ExcBadPuzzleInput) as context :
+                    bad()
+                self.assertIn( "puzzle 2 isn't 81 chars and a newline", context.exception.message )
+
+        # read_puzzles() reads those a line at a time
+        lines = [ self.puzzles[0], self.puzzles[1][:-1], '1' + self.puzzles[2], self.puzzles[3] ]
+        self.assertEqual( list( read_puzzles(filename) ), lines )
+        for (start, stop) in ( (1, None), (2, None), (2, 3), (3, 4), (0, 2) ) :
+            self.assertEqual( list( read_puzzles(filename, start, stop) ), lines[start:stop] )
+
+        # Bad chars are found when asked
+        with PuzzleFile( self.write("bad_char.txt", (self.puzzles[0][:5] + 'x' + self.puzzles[0][6:] + '\n').encode()) ) as puzzle_file :
+            with self.assertRaises(ExcBadPuzzleInput) as context :
+                puzzle_file.values(0)
+            self.assertIn( "puzzle 1 char 6: bad char: 'x'", context.exception.message )
+
+    def test_read_puzzles(self) :
+        data = ''.join( [ p + '\n' for p in self.puzzles ] ).encode()
+        filenames = [ self.filename,
+                      self.write("ragged.txt", b'\n  ' + data.replace(b'\n', b'\n\n') ),
+                      self.write("puzzles.gz",  data, gzip.open),
+                      self.write("puzzles.bz2", data, bz2.open),
+                      self.write("puzzles.xz",  data, lzma.open) ]
+        self.assertEqual( [ compression_open(filename) for filename in filenames ],
+                          [ None, None, gzip.open, bz2.open, lzma.open ] )
+        for filename in filenames :
+            self.assertEqual( list( read_puzzles(filename) ), self.puzzles )
+            self.assertEqual( list( read_puzzles(filename, 3, 6) ), self.puzzles[3:6] )
+            self.assertEqual( list( read_puzzles(filename, 8) ), self.puzzles[8:] )
+
+        self.assertRaises( OSError, read_puzzles, os.path.join(self.tmpdir.name, "no_such_file") )
+
+    def solve_batch(self, *args) :
+        ''' Returns (exit status, [] of stdout lines) of running
+        dinkum_sudoku_solve_batch.py with args
+        '''
+        script = os.path.join( os.path.dirname( os.path.abspath(__file__) ), "bin", "dinkum_sudoku_solve_batch.py" )
+        env = dict( os.environ, PYTHONPATH=os.pathsep.join(sys.path) )
+        result = subprocess.run( [sys.executable, script] + list(args),
+                                 stdout=subprocess.PIPE, env=env, universal_newlines=True )
+        return (result.returncode, result.stdout.splitlines())
+
+    def test_solve_batch(self) :
+        kato   = dinkum.sudoku.board.Board( dinkum.sudoku.board.Test_board.kato_spec_lrl )
+        puzzle = ''.join( [ str(cell.value) for cell in kato.cells ] )
+        self.assertTrue( kato.solve() )
+        solution = ''.join( [ str(cell.value) for cell in kato.cells ] )
+
+        # Cell 0's row holds 1-9, it can't be anything
+        dead = "012345678900000000" + '0' * 63
+        filename = self.write("dead.txt", (dead + '\n' + puzzle + '\n').encode())
+        for args in ( [], ["--scalar"], ["--engine", ENGINE_DLX] ) :
+            self.assertEqual( self.solve_batch("-j", "0", filename, *args),
+                              (1, [ "unsolvable", solution ]) )
+
+        # Lines of the wrong length in what looked fixed width are
+        # errors, the rest are still solved
+        data = ( puzzle + '\n' + puzzle[:-1] + '\n' + '1' + puzzle + '\n' + puzzle + '\n' ).encode()
+        self.assertEqual( len(data) % RECORD_SIZE, 0 )
+        (status, lines) = self.solve_batch("-j", "0", self.write("shifted.txt", data))
+        self.assertEqual( status, 1 )
+        self.assertEqual( [ lines[0], lines[3] ], [ solution, solution ] )
+        self.assertTrue( lines[1].startswith("error: ") and lines[2].startswith("error: ") )
+
+
+if __name__ == "__main__" :
+    # Run the unittests
+    unittest.main()
@@ -0,0 +1,471 @@
+#!/usr/bin/env python3
+# dinkum/sudoku/puzzle_formats.py
+''' Parses 9x9 sudoku puzzles in the common interchange formats.
+
+    FORMAT_LINE          one puzzle per line, 81 chars of 1-9 with . or 0
+                         for blanks.  Lines starting with # are comments.
+    FORMAT_SDM           SadMan .sdm, one puzzle per line.  Same as FORMAT_LINE
+    FORMAT_SDK           SadMan .sdk, a grid of 9 lines of 9 values.  Lines
+                         starting with # or [ are skipped, and | - + and
+                         spaces between values are allowed.
+    FORMAT_CSV           a puzzle column and maybe a solution column.  With
+                         a header they are the columns named puzzle/quizzes
+                         and solution/solutions, otherwise the first two.
+    FORMAT_PENCIL_MARKS  a grid of 9 lines of 9 cells, each cell all the
+                         values it could be, e.g. 4 or 1679.  A single value
+                         is a solved cell.  Borders of | - + . : ' * are allowed.
+
+Each puzzle comes back as a ParsedPuzzle with the values in bytes,
+ready for Board.from_trusted().  The file is read once, a line at a
+time, and the line format is converted with a bytes.translate(), not
+a python int() per char.  Errors are ExcBadPuzzleInput, their message
+starts with <source>:<line>:<col>: of the bad char.
+
+Some useful functions:
+    parse_puzzles(lines, fmt, source)  generator of ParsedPuzzle
+    read_puzzle_file(filename, fmt)    generator of ParsedPuzzle
+    line_values(line)                  bytes of values of an 81 char line
+    format_of(filename, first_line)    guesses a file's FORMAT_xxx
+'''
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc Uses public trusted_state(), masks_typecode() and CHAR_VALUES_TABLE
+# 2026-10-18 tc ParsedPuzzle.board() raises ExcUnsolvable if the candidates leave a cell nothing
+
+from dinkum.sudoku             import * # All package wide def's
+from dinkum.sudoku.board       import Board, BoardState, trusted_state, masks_typecode
+from dinkum.sudoku.geometry    import DEFAULT_GEOMETRY, CHAR_VALUES_TABLE, BAD_CHAR_VALUE
+from dinkum.sudoku.puzzle_file import compression_open
+
+import array
+import collections
+import csv
+import os
+
+# What parse_puzzles() can parse
+FORMAT_LINE         = "line"
+FORMAT_SDM          = "sdm"
+FORMAT_SDK          = "sdk"
+FORMAT_CSV          = "csv"
+FORMAT_PENCIL_MARKS = "pencil_marks"
+
+ALL_FORMATS = (FORMAT_LINE, FORMAT_SDM, FORMAT_SDK, FORMAT_CSV, FORMAT_PENCIL_MARKS)
+
+# key: filename extension value: FORMAT_xxx
+_FORMAT_OF_EXTENSION = { ".sdm" : FORMAT_SDM,
+                         ".sdk" : FORMAT_SDK,
+                         ".csv" : FORMAT_CSV }
+
+# CSV header names, lower case
+_CSV_PUZZLE_NAMES   = ("puzzle",   "puzzles",   "quiz", "quizzes")
+_CSV_SOLUTION_NAMES = ("solution", "solutions")
+
+# What can be between values of a grid, see _parse_grids()
+_SDK_SEPARATORS    = frozenset(" \t|-+")
+_PENCIL_SEPARATORS = frozenset(" \t|-+.:'*=")
+
+class ParsedPuzzle(collections.namedtuple('ParsedPuzzle', 'values candidates solution position')) :
+    ''' A puzzle from parse_puzzles()
+
+        values      bytes of every cell's value in raster order, 0 for unsolved
+        candidates  None, or for FORMAT_PENCIL_MARKS, a tuple of every cell's
+                    possibles_mask from the pencil marks, 0 if solved
+        solution    None, or for FORMAT_CSV with a solution column,
+                    bytes of the solution's values
+        position    <source>:<line> where the puzzle starts
+    '''
+    __slots__ = ()
+
+    def board(self, name=None, desc="") :
+        ''' Returns a new Board of the puzzle.  It's possibles are
+        no more than the candidates.
+
+        raise ExcBadPuzzleInput on a duplicated value
+        raise ExcUnsolvable if an unsolved cell can't be anything,
+        e.g. it's candidates are all solved in it's row
+        '''
+        state = trusted_state(self.values, DEFAULT_GEOMETRY)
+        if self.candidates is not None :
+            masks = array.array( masks_typecode(DEFAULT_GEOMETRY) )
+            masks.frombytes(state.possibles_masks)
+            for (cell_num, candidates) in enumerate(self.candidates) :
+                if not self.values[cell_num] :
+                    masks[cell_num] &= candidates
+                    if not masks[cell_num] :
+                        raise ExcUnsolvable()
+            state = BoardState(state.values, masks.tobytes())
+        return Board(state, name, desc, DEFAULT_GEOMETRY)
+
+
+def line_values(line, source=None, line_num=1, col_offset=0) :
+    ''' Returns bytes of the values of line, NUM_CELLS chars of 1-9
+    with . or 0 for blanks, without any whitespace.
+
+    raise ExcBadPuzzleInput if it's the wrong length or has a bad char.
+    The message gives source, line_num and col, 1 based, of the bad char,
+    just the col if source is None.  col_offset is added to the col,
+    i.e. where line starts in it's line.
+    '''
+    if len(line) != NUM_CELLS :
+        raise ExcBadPuzzleInput( "%s: %d chars, should be %d" %
+                                 (_where(source, line_num, col_offset + 1), len(line), NUM_CELLS) )
+
+    values = line.encode('ascii', 'replace').translate(CHAR_VALUES_TABLE)
+    bad_char_num = values.find(BAD_CHAR_VALUE)
+    if bad_char_num >= 0 :
+        raise ExcBadPuzzleInput( "%s: bad char: %r" %
+                                 (_where(source, line_num, col_offset + bad_char_num + 1), line[bad_char_num]) )
+    return values
+
+
+def _where(source, line_num, col_num) :
+    ''' Returns where an error is for it's message '''
+    if source is None :
+        return "col %d" % col_num
+    return "%s:%d:%d" % (source, line_num, col_num)
+
+
+def format_of(filename, first_line="") :
+    ''' Returns the FORMAT_xxx filename is probably in.  From it's
+    extension (after any .gz .bz2 .xz) if that says, else from
+    first_line, it's first line with a digit that isn't a comment.
+    '''
+    (root, extension) = os.path.splitext( filename.lower() )
+    if extension in (".gz", ".bz2", ".xz") :
+        extension = os.path.splitext(root)[1]
+    if extension in _FORMAT_OF_EXTENSION :
+        return _FORMAT_OF_EXTENSION[extension]
+
+    first_line = first_line.strip()
+    if ',' in first_line :
+        return FORMAT_CSV
+    if len(first_line) == NUM_CELLS :
+        return FORMAT_LINE
+
+    # A row of pencil marks is 9 runs of digits, some longer than 1
+    tokens = ''.join( [ ' ' if char in _PENCIL_SEPARATORS else char for char in first_line ] ).split()
+    if len(tokens) == RCB_SIZE and any( [ len(token) > 1 for token in tokens ] ) :
+        return FORMAT_PENCIL_MARKS
+    return FORMAT_SDK
+
+
+def parse_puzzles(lines, fmt=FORMAT_LINE, source="<string>") :
+    ''' generator which yields a ParsedPuzzle for every puzzle in lines,
+    an iterable of str lines, e.g. an open file, in format fmt, one of
+    ALL_FORMATS.  source names lines in error messages.
+
+    raise ExcBadPuzzleInput on the first bad puzzle
+    '''
+    if fmt in (FORMAT_LINE, FORMAT_SDM) :
+        return _parse_line_format(lines, source)
+    if fmt == FORMAT_CSV :
+        return _parse_csv(lines, source)
+    if fmt == FORMAT_SDK :
+        return _parse_grids(lines, source, _SDK_SEPARATORS, False)
+    if fmt == FORMAT_PENCIL_MARKS :
+        return _parse_grids(lines, source, _PENCIL_SEPARATORS, True)
+    raise ValueError( "Unknown puzzle format: %s" % fmt )
+
+
+def read_puzzle_file(filename, fmt=None) :
+    ''' generator which yields a ParsedPuzzle for every puzzle in
+    filename, which may be gzip, bz2 or xz compressed.  If fmt is None,
+    it's picked by format_of().
+
+    raise ExcBadPuzzleInput on the first bad puzzle
+    '''
+    opener = compression_open(filename) or open
+    with opener(filename, 'rt', encoding='ascii', errors='replace') as file :
+        if fmt is None :
+            # Peek as far as the first line with a value
+            first_lines = []
+            for line in file :
+                first_lines.append(line)
+                if _has_value(line) :
+                    break
+            fmt   = format_of( filename, first_lines[-1] if first_lines else "" )
+            lines = _chained(first_lines, file)
+        else :
+            lines = file
+
+        yield from parse_puzzles(lines, fmt, filename)
+
+
+def _has_value(line) :
+    ''' True if line has a digit and isn't a comment '''
+    stripped = line.strip()
+    return bool(stripped) and stripped[0] not in "#[" and any( [ char.isdigit() for char in stripped ] )
+
+
+def _chained(first_lines, file) :
+    yield from first_lines
+    yield from file
+
+
+def _parse_line_format(lines, source) :
+    for (line_num, line) in enumerate(lines, 1) :
+        stripped = line.strip()
+        if not stripped or stripped[0] == '#' :
+            continue
+        col_offset = line.index(stripped[0])
+        yield ParsedPuzzle( line_values(stripped, source, line_num, col_offset),
+                            None, None, "%s:%d" % (source, line_num) )
+
+
+def _parse_csv(lines, source) :
+    reader = csv.reader(lines)
+    puzzle_col   = 0
+    solution_col = 1
+    first_row    = True
+    for row in reader :
+        line_num = reader.line_num
+        if not row or not ''.join(row).strip() :
+            continue
+
+        # Header?
+        if first_row :
+            first_row = False
+            names = [ field.strip().lower() for field in row ]
+            if any( [ name in _CSV_PUZZLE_NAMES for name in names ] ) :
+                puzzle_col   = [ idx for (idx, name) in enumerate(names) if name in _CSV_PUZZLE_NAMES ][0]
+                solution_col = ([ idx for (idx, name) in enumerate(names) if name in _CSV_SOLUTION_NAMES ] + [None])[0]
+                continue
+
+        if puzzle_col >= len(row) :
+            raise ExcBadPuzzleInput( "%s:%d: no field %d for the puzzle" % (source, line_num, puzzle_col + 1) )
+        values = _csv_field_values(row, puzzle_col, source, line_num)
+
+        solution = None
+        if solution_col is not None and solution_col < len(row) and row[solution_col].strip() :
+            solution = _csv_field_values(row, solution_col, source, line_num)
+
+        yield ParsedPuzzle( values, None, solution, "%s:%d" % (source, line_num) )
+
+
+def _csv_field_values(row, col, source, line_num) :
+    ''' Returns line_values() of field col of csv row.
+    The col of errors is where it would be without quotes.
+    '''
+    field = row[col]
+    col_offset = sum( [ len(field) + 1 for field in row[:col] ] )
+    stripped = field.strip()
+    if stripped :
+        col_offset += field.index(stripped[0])
+    return line_values(stripped, source, line_num, col_offset)
+
+
+def _parse_grids(lines, source, separators, pencil_marks) :
+    ''' generator of a ParsedPuzzle for every 9 rows of grid in lines.
+    A row is a line with values, a line of just separators (or blank)
+    is skipped as are lines starting with # or [.
+
+    Each value of a SDK grid is one char, a . or 0 is a blank.  Each
+    value of a pencil mark grid is a run of the digits 1-9.
+    '''
+    values       = bytearray()
+    candidates   = []
+    start_line   = None
+    for (line_num, line) in enumerate(lines, 1) :
+        stripped = line.strip()
+        if not stripped or stripped[0] in "#[" :
+            continue
+
+        row_start = len(values)
+        mask      = 0   # of the pencil mark so far
+        for (col_num, char) in enumerate(line.rstrip('\r\n'), 1) :
+            value = CHAR_VALUES_TABLE[ ord(char) ] if ord(char) < 128 else BAD_CHAR_VALUE
+            if pencil_marks and 1 <= value <= RCB_SIZE :
+                mask |= 1 << value
+                continue
+            if mask :
+                _add_pencil_mark(values, candidates, mask)
+                mask = 0
+
+            if char in separators :
+                continue
+            if value == BAD_CHAR_VALUE or pencil_marks :
+                raise ExcBadPuzzleInput( "%s:%d:%d: bad char: %r" % (source, line_num, col_num, char) )
+            values.append(value)
+        if mask :
+            _add_pencil_mark(values, candidates, mask)
+
+        num_row_values = len(values) - row_start
+        if not num_row_values :
+            continue   # A border
+        if num_row_values != RCB_SIZE :
+            raise ExcBadPuzzleInput( "%s:%d: %d values, should be %d" %
+                                     (source, line_num, num_row_values, RCB_SIZE) )
+
+        if start_line is None :
+            start_line = line_num
+        if len(values) == NUM_CELLS :
+            yield ParsedPuzzle( bytes(values), tuple(candidates) if pencil_marks else None,
+                                None, "%s:%d" % (source, start_line) )
+            values     = bytearray()
+            candidates = []
+            start_line = None
+
+    if values :
+        raise ExcBadPuzzleInput( "%s:%d: %d rows, should be %d" %
+                                 (source, start_line, len(values) // RCB_SIZE, RCB_SIZE) )
+
+
+def _add_pencil_mark(values, candidates, mask) :
+    ''' Adds the cell with pencil mark mask to values and candidates.
+    A single value is a solved cell.
+    '''
+    if mask & (mask - 1) :
+        values.append(0)
+        candidates.append(mask)
+    else :
+        values.append( mask.bit_length() - 1 )
+        candidates.append(0)
+
+
+# Test code
+import unittest
+import gzip
+import tempfile
+import dinkum.sudoku.board
+
+class Test_puzzle_formats(unittest.TestCase):
+
+    puzzle   = "4.....8.5.3..........7......2.....6.....8.4......1.......6.3.7.5..2.....1.4......"
+    solution = "417369825632158947958724316825437169791586432346912758289643571573291684164875293"
+
+    def values(self, puzzle) :
+        return bytes( [ 0 if c == '.' else int(c) for c in puzzle ] )
+
+    def grid(self, puzzle, row_sep="", col_sep="") :
+        ''' Returns puzzle as lines of a grid '''
+        lines = []
+        for row_num in range(RCB_SIZE) :
+            if row_num and row_num % 3 == 0 and row_sep :
+                lines.append(row_sep + '\n')
+            row = puzzle[row_num * RCB_SIZE : (row_num+1) * RCB_SIZE]
+            lines.append( col_sep.join( [ row[0:3], row[3:6], row[6:9] ] ) + '\n' )
+        return lines
+
+    def test_line_format(self) :
+        self.assertEqual( line_values(self.puzzle), self.values(self.puzzle) )
+        self.assertEqual( line_values(self.puzzle.replace('.', '0')), self.values(self.puzzle) )
+
+        lines = [ "# a comment\n", "\n", "  " + self.puzzle + "\n", self.solution.replace('1', '0') + "\n" ]
+        puzzles = list( parse_puzzles(lines, FORMAT_SDM, "corpus.sdm") )
+        self.assertEqual( len(puzzles), 2 )
+        self.assertEqual( puzzles[0].values, self.values(self.puzzle) )
+        self.assertEqual( puzzles[0].position, "corpus.sdm:3" )
+        self.assertIsNone( puzzles[0].candidates )
+        self.assertEqual( puzzles[0].board(), dinkum.sudoku.board.Board( self.puzzle.replace('.', '0') ) )
+
+        # Errors say where
+        with self.assertRaises(ExcBadPuzzleInput) as context :
+            list( parse_puzzles( [ "\n", "  " + self.puzzle[:10] + 'x' + self.puzzle[11:] ], FORMAT_LINE, "f" ) )
+        self.assertEqual( context.exception.message, "f:2:13: bad char: 'x'" )
+        with self.assertRaises(ExcBadPuzzleInput) as context :
+            line_values(self.puzzle[1:])
+        self.assertEqual( context.exception.message, "col 1: 80 chars, should be 81" )
+
+    def test_csv(self) :
+        lines = [ "id,quizzes,solutions\n",
+                  "1,%s,%s\n" % (self.puzzle.replace('.', '0'), self.solution),
+                  "2,\"%s\",\n" % self.puzzle ]
+        puzzles = list( parse_puzzles(lines, FORMAT_CSV, "k.csv") )
+        self.assertEqual( [ p.values for p in puzzles ], [ self.values(self.puzzle) ] * 2 )
+        self.assertEqual( puzzles[0].solution, self.values(self.solution) )
+        self.assertIsNone( puzzles[1].solution )
+        self.assertEqual( puzzles[1].position, "k.csv:3" )
+
+        # No header, puzzle then solution
+        puzzles = list( parse_puzzles( [ "%s,%s\n" % (self.puzzle, self.solution) ], FORMAT_CSV ) )
+        self.assertEqual( puzzles[0].solution, self.values(self.solution) )
+
+        with self.assertRaises(ExcBadPuzzleInput) as context :
+            list( parse_puzzles( [ "puzzle,solution\n", "%s,%s\n" % (self.puzzle, self.solution[:-1] + 'z') ],
+                                 FORMAT_CSV, "k.csv" ) )
+        self.assertEqual( context.exception.message, "k.csv:2:163: bad char: 'z'" )
+
+    def test_sdk(self) :
+        lines = [ "#A Some author\n", "[Puzzle]\n" ] + self.grid(self.puzzle)
+        puzzles = list( parse_puzzles(lines, FORMAT_SDK, "p.sdk") )
+        self.assertEqual( len(puzzles), 1 )
+        self.assertEqual( puzzles[0].values, self.values(self.puzzle) )
+        self.assertEqual( puzzles[0].position, "p.sdk:3" )
+
+        # With borders
+        lines = self.grid(self.puzzle, "------+-------+------", " | ")
+        self.assertEqual( list( parse_puzzles(lines, FORMAT_SDK) )[0].values, self.values(self.puzzle) )
+
+        # Errors
+        lines = self.grid(self.puzzle)
+        lines[4] = lines[4][:3] + 'x' + lines[4][4:]
+        with self.assertRaises(ExcBadPuzzleInput) as context :
+            list( parse_puzzles(lines, FORMAT_SDK, "p.sdk") )
+        self.assertEqual( context.exception.message, "p.sdk:5:4: bad char: 'x'" )
+
+        lines = self.grid(self.puzzle)
+        lines[2] = lines[2][1:]
+        with self.assertRaises(ExcBadPuzzleInput) as context :
+            list( parse_puzzles(lines, FORMAT_SDK, "p.sdk") )
+        self.assertEqual( context.exception.message, "p.sdk:3: 8 values, should be 9" )
+
+        with self.assertRaises(ExcBadPuzzleInput) as context :
+            list( parse_puzzles(self.grid(self.puzzle)[:5], FORMAT_SDK, "p.sdk") )
+        self.assertEqual( context.exception.message, "p.sdk:1: 5 rows, should be 9" )
+
+    def test_pencil_marks(self) :
+        board = dinkum.sudoku.board.Board( self.puzzle.replace('.', '0') )
+        board.cells[1].remove_from_possibles(1)  # More than the givens say
+
+        # Write it out as pencil marks
+        lines = [ ".-------------------.\n" ]
+        for row in board.rows :
+            tokens = [ str(cell.value) if cell.value else
+                       ''.join( [ str(v) for v in range(1, 10) if cell.possibles_mask & (1 << v) ] )
+                       for cell in row ]
+            lines.append( "| %s | %s | %s |\n" % tuple( [ ' '.join(tokens[i:i+3]) for i in (0, 3, 6) ] ) )
+        lines.append( "'-------------------'\n" )
+
+        puzzles = list( parse_puzzles(lines, FORMAT_PENCIL_MARKS, "pm") )
+        self.assertEqual( len(puzzles), 1 )
+        self.assertEqual( puzzles[0].values, bytes( [ cell.value for cell in board.cells ] ) )
+        self.assertEqual( puzzles[0].candidates, tuple( [ cell.possibles_mask for cell in board.cells ] ) )
+        self.assertEqual( puzzles[0].board(), board )
+        self.assertEqual( format_of("pm.txt", lines[1]), FORMAT_PENCIL_MARKS )
+
+        # Pencil marks that contradict the givens, row 0 has a 4
+        candidates = list(puzzles[0].candidates)
+        candidates[1] = 1 << 4
+        self.assertRaises( ExcUnsolvable, puzzles[0]._replace(candidates=tuple(candidates)).board )
+
+        lines[3] = lines[3].replace('|', 'x', 1)
+        with self.assertRaises(ExcBadPuzzleInput) as context :
+            list( parse_puzzles(lines, FORMAT_PENCIL_MARKS, "pm") )
+        self.assertEqual( context.exception.message, "pm:4:1: bad char: 'x'" )
+
+    def test_read_puzzle_file(self) :
+        self.assertEqual( format_of("a.sdk"), FORMAT_SDK )
+        self.assertEqual( format_of("a.csv.gz"), FORMAT_CSV )
+        self.assertEqual( format_of("a.txt", self.puzzle), FORMAT_LINE )
+        self.assertEqual( format_of("a.txt", "quizzes,solutions"), FORMAT_CSV )
+        self.assertEqual( format_of("a", "4.. ... 8.5"), FORMAT_SDK )
+        self.assertEqual( format_of("a", "123 456 789"), FORMAT_SDK )
+        self.assertEqual( format_of("a", "| 4 1679 12679 | 139 2369 269 | 8 1239 5 |"), FORMAT_PENCIL_MARKS )
+        self.assertRaises( ValueError, parse_puzzles, [], "no-such-format" )
+
+        with tempfile.TemporaryDirectory() as tmpdir :
+            for (basename, text) in [ ("p.sdk", ''.join( self.grid(self.puzzle) )),
+                                      ("p.grid", "#A Someone\n\n" + ''.join( self.grid(self.puzzle, "---+---+---", "|") )),
+                                      ("p.txt", "\n" + self.puzzle + "\n"),
+                                      ("p.csv", "puzzle,solution\n%s,%s\n" % (self.puzzle, self.solution)) ] :
+                for opener in (open, gzip.open) :
+                    filename = os.path.join(tmpdir, basename + (".gz" if opener is gzip.open else ""))
+                    with opener(filename, 'wt') as file :
+                        file.write(text)
+                    puzzles = list( read_puzzle_file(filename) )
+                    self.assertEqual( [ p.values for p in puzzles ], [ self.values(self.puzzle) ] )
+
+
+if __name__ == "__main__" :
+    # Run the unittests
+    unittest.main()
@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+# dinkum/sudoku/rating.py
+''' Rates how hard a sudoku puzzle is for a person to solve.
+
+rate(board) solves a copy of board the way a person would.  The
+deduction strategies (see dinkum.sudoku.strategies) are tried cheapest
+first.  After any strategy makes progress, we go back to the cheapest.
+So a costly strategy is only used when nothing cheaper works.  If no
+strategy works and the board isn't solved, a person would have to guess.
+
+The Rating it returns has:
+    score           number, bigger is harder.  Each unsolved cell
+                    of the puzzle costs 1, each step costs the cost of
+                    it's strategy, and each cell still unsolved when we
+                    had to guess costs guess_cost.
+    category        one of DIFFICULTIES
+    hardest         name of the most costly strategy used,
+                    None if no strategy was needed
+    steps           {} key: strategy name  value: # of times it made progress
+                    Only strategies that were used, cheapest first.
+                    One step can solve many cells, e.g. naked_singles
+                    fills in every single it can find.
+    needs_guessing  True if the strategies couldn't finish the board
+    num_unsolved    # of cells still unsolved when we had to guess,
+                    0 if we didn't
+
+The category comes from the hardest strategy needed:
+    easy      singles
+    medium    + locked candidates, pairs and triples
+    hard      + fish, XY-Wing and quads
+    fiendish  guessing
+
+A puzzle with no solution, or more than one, gets a rating that
+means nothing.  rate() only notices the former if a strategy trips
+over it, in which case it raises ExcUnsolvable.  Use
+board.count_solutions() first if you aren't sure it has one.
+'''
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc Removed unused import of dinkum.sudoku
+
+from dinkum.sudoku.strategies import DEFAULT_STRATEGIES
+
+import collections
+
+# Easiest first.  Each difficulty but the last can be solved without
+# guessing by the DEFAULT_STRATEGIES which cost at most it's max cost.
+DIFFICULTY_EASY     = "easy"      # singles
+DIFFICULTY_MEDIUM   = "medium"    # + locked candidates, pairs and triples
+DIFFICULTY_HARD     = "hard"      # + fish, XY-Wing and quads
+DIFFICULTY_FIENDISH = "fiendish"  # guessing
+
+DIFFICULTIES = (DIFFICULTY_EASY, DIFFICULTY_MEDIUM, DIFFICULTY_HARD, DIFFICULTY_FIENDISH)
+DIFFICULTY_MAX_COSTS = (2, 6, None)  # indexed like DIFFICULTIES, fiendish has none
+
+# What each cell left to guess adds to the score
+guess_cost = 20
+
+
+class Rating(collections.namedtuple('Rating',
+                                    'score category hardest steps needs_guessing num_unsolved')) :
+    ''' What rate() returns, see module doc '''
+    __slots__ = ()
+
+    def __str__(self) :
+        ''' e.g. "62 medium naked_pairs hidden_singles:12,naked_pairs:1" '''
+        steps_str = ','.join( [ "%s:%d" % name_and_count for name_and_count in self.steps.items() ] )
+        return "%d %s %s %s" % (self.score, self.category, self.hardest or '-', steps_str or '-')
+
+
+def difficulty_of_cost(cost) :
+    ''' Returns which of DIFFICULTIES a puzzle is that
+    needs a strategy that costs cost.  None cost is no strategy.
+    '''
+    for (difficulty, max_cost) in zip(DIFFICULTIES, DIFFICULTY_MAX_COSTS) :
+        if cost is None or max_cost is None or cost <= max_cost :
+            return difficulty
+    return DIFFICULTY_FIENDISH
+
+
+def rate(board, strategies=None) :
+    ''' Returns the Rating of board, see module doc.
+    board isn't changed.
+
+    strategies is an iterable of Strategy's to use, None
+    is DEFAULT_STRATEGIES.  See dinkum.sudoku.strategies
+
+    raises ExcUnsolvable if board is found to have no solution.
+    '''
+    if strategies is None :
+        strategies = DEFAULT_STRATEGIES
+    else :
+        strategies = tuple( sorted(strategies, key=lambda strategy : strategy.cost) )
+
+    work  = board.clone()
+    steps = [0] * len(strategies)
+    num_blanks = work.num_unsolved()
+
+    # Cheapest that makes progress, over and over
+    while not work.is_solved() :
+        for (strategy_num, strategy) in enumerate(strategies) :
+            num_changes = work.num_changes
+            strategy.apply(work)
+            if work.num_changes != num_changes :
+                steps[strategy_num] += 1
+                break
+        else :
+            break  # Nothing worked, time to guess
+
+    # Tally it up
+    used = [ (strategy, num_steps) for (strategy, num_steps) in zip(strategies, steps) if num_steps ]
+    hardest = used[-1][0] if used else None
+
+    num_unsolved   = work.num_unsolved()
+    needs_guessing = num_unsolved != 0
+    score = ( num_blanks +
+              sum( [ strategy.cost * num_steps for (strategy, num_steps) in used ] ) +
+              guess_cost * num_unsolved )
+
+    if needs_guessing :
+        category = DIFFICULTY_FIENDISH
+    else :
+        category = difficulty_of_cost( hardest.cost if hardest else None )
+
+    return Rating( score, category,
+                   hardest.name if hardest else None,
+                   collections.OrderedDict( [ (strategy.name, num_steps) for (strategy, num_steps) in used ] ),
+                   needs_guessing, num_unsolved )
+
+
+# Test code
+import unittest
+import dinkum.sudoku.board
+
+class Test_rating(unittest.TestCase):
+
+    def test_difficulty_of_cost(self) :
+        self.assertEqual( difficulty_of_cost(None), DIFFICULTY_EASY   )
+        self.assertEqual( difficulty_of_cost(2),    DIFFICULTY_EASY   )
+        self.assertEqual( difficulty_of_cost(3),    DIFFICULTY_MEDIUM )
+        self.assertEqual( difficulty_of_cost(6),    DIFFICULTY_MEDIUM )
+        self.assertEqual( difficulty_of_cost(11),   DIFFICULTY_HARD   )
+
+    def test_easy(self) :
+        board  = dinkum.sudoku.board.Board(dinkum.sudoku.board.Test_board.kato_spec_lrl)
+        rating = rate(board)
+        self.assertFalse( board.is_solved() )  # We weren't changed
+        self.assertFalse( rating.needs_guessing )
+        self.assertEqual( rating.num_unsolved, 0 )
+        self.assertIn   ( rating.category, DIFFICULTIES[:-1] )
+        self.assertEqual( difficulty_of_cost( [ s.cost for s in DEFAULT_STRATEGIES if s.name == rating.hardest ][0] ),
+                          rating.category )
+        self.assertEqual( list(rating.steps)[-1], rating.hardest )
+
+        # Presolved needs nothing
+        rating = rate( dinkum.sudoku.board.Board(dinkum.sudoku.board.Test_board.full_spec_lrl) )
+        self.assertEqual( rating, Rating(0, DIFFICULTY_EASY, None, {}, False, 0) )
+        self.assertEqual( str(rating), "0 easy - -" )
+
+    def test_strategies_matter(self) :
+        # Needs more than singles and hidden pairs/triples
+        board = dinkum.sudoku.board.Board(
+            "100000569492056108056109240009640801064010000218035604040500016905061402621000005")
+        full = rate(board)
+        self.assertFalse( full.needs_guessing )
+
+        basic = rate( board, [ s for s in DEFAULT_STRATEGIES if s.cost <= 4 ] )
+        self.assertTrue   ( basic.needs_guessing )
+        self.assertEqual  ( basic.category, DIFFICULTY_FIENDISH )
+        self.assertGreater( basic.score, full.score )
+        self.assertEqual  ( basic.score, board.num_unsolved() +
+                            sum( [ s.cost * basic.steps[s.name] for s in DEFAULT_STRATEGIES if s.name in basic.steps ] ) +
+                            guess_cost * basic.num_unsolved )
+
+    def test_guessing(self) :
+        rating = rate( dinkum.sudoku.board.Board(dinkum.sudoku.board.Test_board.hardest_spec_str) )
+        self.assertTrue ( rating.needs_guessing )
+        self.assertEqual( rating.category, DIFFICULTY_FIENDISH )
+        self.assertGreater( rating.num_unsolved, 0 )
+        self.assertGreaterEqual( rating.score, guess_cost * rating.num_unsolved )
+
+
+if __name__ == "__main__" :
+    # Run the unittests
+    unittest.main()
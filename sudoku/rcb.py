@@ -13,9 +13,18 @@ Each RCB is a [] of cells.
 #               so don't have to maintain it incrementally
 #               users build_unsolved_value_possibles() when
 #               they need it.  Remove cell_possibles_changed()
-
-from dinkum.sudoku      import * # All package wide def's
-from dinkum.sudoku.cell import Cell, CellToSolve
+# 2026-10-18 tc Added solved_values_mask and hidden_singles()
+#               possibles manipulated as bitmasks
+# 2026-10-18 tc raise ExcUnsolvable rather than assert on unsolvable
+# 2026-10-18 tc remove_mask_from_possibles() bumps board.num_changes
+# 2026-10-18 tc __slots__
+# 2026-10-18 tc boards other than 9x9.  See geometry
+# 2026-10-18 tc other_rcbs() doesn't build cell.rcbs
+
+from dinkum.sudoku         import * # All package wide def's
+from dinkum.sudoku.bitmask import *
+from dinkum.sudoku.cell    import Cell, CellToSolve
+from dinkum.sudoku.geometry import DEFAULT_GEOMETRY
 
 class RCB(list) :
     ''' Represents a row, column, or block.
@@ -26,17 +35,26 @@ class RCB(list) :
 
       self            a [] of Cells in the row/column/block
       unsolved_cells  a set of cells in self that are not solved
+      solved_values_mask bitmask of the values of the solved cells
+                      See dinkum.sudoku.bitmask
 
     some funcs:
       initial_cell_placement  Should be called to initially populate the rcb
       a_cell_was_solved       Should be called when a cell in the rcb was solved
       remove_from_possibles   Removes a value as a possible solution
+      hidden_singles          finds values only one cell can provide
       build_unsolved_value_possibles constructs {} key: possible value
                                                    value: set of cells with value in possibles
 
       [x] gets/sets cells[x]
       iterators iterator over cells[]
+
+      geometry  The layout of our board, see dinkum.sudoku.geometry
+                DEFAULT_GEOMETRY (9x9) if we don't have a board
+
+    A Board has 3*RCB_SIZE of us, __slots__ keeps us small.
     '''
+    __slots__ = ( 'rcb_type', 'board', 'rcb_num', 'unsolved_cells', 'solved_values_mask' )
 
     def __init__(self, rcb_type, board, rcb_num) :
         '''Creates an empty RCB
@@ -49,6 +67,7 @@ class RCB(list) :
 
         self                     [] of our Cells
         unsolved_cells           set of cells in self that are not solved
+        solved_values_mask       bitmask of values of our solved cells
 
         unsolved_value_possibles {} of sets of our cells 
                                  key: cell value
@@ -61,16 +80,24 @@ class RCB(list) :
 
         self.board = board
 
+        rcb_size = self.geometry.rcb_size
         self.rcb_num = rcb_num
-        assert self.rcb_num in range(RCB_SIZE)
+        assert self.rcb_num in range(rcb_size)
 
         # make a place for the cells themselves
-        super().__init__( [None] * RCB_SIZE )
+        super().__init__( [None] * rcb_size )
 
         # We currently don't have any cells, merely a place
         # to put them.  When populated via initial_cell_placement(),
         # the following will be populated with Cell values
         self.unsolved_cells = set()
+        self.solved_values_mask = 0
+
+
+    @property
+    def geometry(self) :
+        ''' The Geometry of our board, DEFAULT_GEOMETRY if no board '''
+        return self.board.geometry if self.board else DEFAULT_GEOMETRY
 
 
     def initial_cell_placement(self, cell) :
@@ -124,6 +151,7 @@ class RCB(list) :
 
         # remove solved_cell from unsolved_cells
         self.unsolved_cells.remove(solved_cell)
+        self.solved_values_mask |= 1 << solved_value
 
         # Remove solved_cell.value as a possibility for all other
         # cells in our RCB.  Also rebuilds unsolved_value_possibles
@@ -151,22 +179,23 @@ class RCB(list) :
         if value isn't one of our possible_values, we
         silently return an empty set.
 
+        raises ExcUnsolvable if a Cell is left with no possible_values
+
         The details:
 
         iterates thru unsolved_cells( sans except_cells )
              if cell.remove_from_possibles(values) removed something:
-                 if 0 cell.possible_values left, assertion error    
+                 if 0 cell.possible_values left, raise ExcUnsolvable
 
         return set(CellToSolve)
         '''
 
         # Convert any non-iterable argument in an iterable
         # value?  or values?
-        values = value_or_values # Assume it's iterable, ie values
         try:
-            iter(value_or_values)
+            values = iter(value_or_values)
         except TypeError :
-            values = [value_or_values] # wrong assumption, it was a single value
+            values = [value_or_values] # it was a single value
                                        # Make a single item iterable
         except_cells = except_cell_or_cells # Assume it's iterable, ie values
         try:
@@ -175,41 +204,105 @@ class RCB(list) :
             except_cells = [except_cell_or_cells] # wrong assumption, it was a single value
                                             # Make a single item iterable
 
-        # Check our assumptions                                            
+        # Check our assumptions and build the mask of values to remove
+        mask = 0
         for value in values :
-            assert value in Cell.all_cell_values
+            assert value in self.geometry.all_cell_values
+            mask |= 1 << value
         assert len(except_cells) > 0
         assert [ cell in self for cell in except_cells ]
 
+        return self.remove_mask_from_possibles(mask, except_cells)
+
+
+    def remove_mask_from_possibles(self, mask, except_cells) :
+        ''' Same as remove_from_possibles() except the values to remove
+        are given as a bitmask (see dinkum.sudoku.bitmask) and
+        except_cells must be a container of Cells.
+
+        returns a (possibly empty) set of CellToSolve's
+        '''
+
         # What we return
         cells_to_solve = set()
 
+        # If the board is being searched, changes must be recorded
+        # See Board.undo_trail()
+        # Every change is counted in board.num_changes
+        board = self.board
+        trail = board.trail if board else None
+
         # iterates thru unsolved_cells sans except_cells
-        #    Cell.remove_from_possibles(value)
+        #    removes mask from possibles
         #    accumulates set(CellsToSolve)
+        keep_mask = ~mask
         for cell in self.unsolved_cells :
-            if cell not in except_cells :
-                if cell.remove_from_possibles(values) :
-                    # cell's possible_values changed
-                    num_remaining_possibles = len(cell.possible_values)
-
-                    # this would mean it could never be solved
-                    assert (num_remaining_possibles != 0) 
-                    
-                    # Solvable?
-                    if num_remaining_possibles == 1 :
-                        # Yes, tell caller to solve it
-                        sole_remaining_possible_value = list(cell.possible_values)[0]
-                        cells_to_solve.add ( CellToSolve(cell, sole_remaining_possible_value ) )
+            possibles_mask = cell.possibles_mask
+            if possibles_mask & mask and cell not in except_cells :
+                # cell's possible_values change
+                if board :
+                    board.num_changes += 1
+                if trail is not None :
+                    trail.append( (cell, cell.value, possibles_mask) )
+                possibles_mask &= keep_mask
+                cell.possibles_mask = possibles_mask
+
+                # this would mean it could never be solved
+                if possibles_mask == 0 :
+                    raise ExcUnsolvable()
+
+                # Solvable?
+                if possibles_mask & (possibles_mask-1) == 0 :
+                    # Yes, tell caller to solve it
+                    cells_to_solve.add ( CellToSolve(cell, sole_value(possibles_mask) ) )
 
         # Tell caller some solvable cells
-        return cells_to_solve ;
+        return cells_to_solve
+
+
+    def hidden_singles(self) :
+        ''' Returns a set of CellToSolve for every unsolved value
+        that can only be provided by a single cell in the RCB.
+
+        raises ExcUnsolvable if some unsolved value can't be provided
+        by any cell.
+
+        The unsolved cell's possibles_mask are accumulated into
+        values seen at least once and values seen more than once.
+        The values seen exactly once are the hidden singles.
+        '''
+        seen_once = 0
+        seen_more = 0
+        for cell in self.unsolved_cells :
+            possibles_mask = cell.possibles_mask
+            seen_more |= seen_once & possibles_mask
+            seen_once |= possibles_mask
+
+        # If there is an unsolved value with no cell to
+        # provide it, something is broken as it can't be solved
+        if seen_once | self.solved_values_mask != self.geometry.all_values_mask :
+            raise ExcUnsolvable()
+
+        # What we return
+        cells_to_solve = set()
+
+        hidden_mask = seen_once & ~seen_more
+        if hidden_mask :
+            for cell in self.unsolved_cells :
+                cell_hidden_mask = cell.possibles_mask & hidden_mask
+                if cell_hidden_mask :
+                    # Normally one value, but a cell can (wrongly) be
+                    # the sole provider of several.  Let solve_cells() sort it out
+                    for value in mask_to_values(cell_hidden_mask) :
+                        cells_to_solve.add( CellToSolve(cell, value) )
+
+        return cells_to_solve
 
 
     def unsolved_values(self) :
         ''' returns a set of values to be solved
         '''
-        return Cell.all_cell_values - self.solved_values()
+        return set(self.geometry.all_cell_values) - self.solved_values()
 
 
     def solved_values(self) :
@@ -232,11 +325,12 @@ class RCB(list) :
         # Used for error messages
         id_str = "%s[%d]" % (RCB_NAME[self.rcb_type], self.rcb_num)
         
-        assert len(self) == RCB_SIZE,                                           \
+        rcb_size = self.geometry.rcb_size
+        assert len(self) == rcb_size,                                           \
             "%s: Wrong number of cells." % id_str
 
         # Look at each cell
-        for idx in range(RCB_SIZE) :
+        for idx in range(rcb_size) :
             cell = self[idx] 
 
             # Make sure it exists
@@ -250,6 +344,9 @@ class RCB(list) :
                 our_unsolved_cells.add(cell)
         assert our_unsolved_cells == self.unsolved_cells
 
+        # Verify the solved values
+        assert self.solved_values_mask == values_to_mask(self.solved_values())
+
         # Verify unsolved_value_possibles
         our_unsolved_value_possibles = self.build_unsolved_value_possibles()
 
@@ -268,7 +365,7 @@ class RCB(list) :
         self.solved_cells() & self.unsolved_cells == set()
 
         # solved_values + unsolved_values = all possible values with no overlap
-        self.solved_values() | self.unsolved_values() == Cell.all_cell_values
+        self.solved_values() | self.unsolved_values() == self.geometry.all_cell_values
         self.solved_values() & self.unsolved_values() == set()
 
 
@@ -283,7 +380,7 @@ class RCB(list) :
         # Put any unsolved cell whose possible value
         # could be value in unsolved_value_possible[value]
         for cell in self.unsolved_cells :
-            for value in cell.possible_values :
+            for value in mask_to_values(cell.possibles_mask) :
                 if value in ret_unsolved_value_possibles :
                     ret_unsolved_value_possibles[value].add(cell)
                 else :
@@ -360,10 +457,14 @@ class RCB(list) :
         This generally only happens in unittest code.
 
         '''
+        # Not cell.rcbs, which builds a tuple
         returned_list = []
-        for rcb in [r for r in cell.rcbs if r != self ] :
-            if rcb is not None and rcb is not self :
-                returned_list.append(rcb)
+        if cell.row is not None and cell.row is not self :
+            returned_list.append(cell.row)
+        if cell.col is not None and cell.col is not self :
+            returned_list.append(cell.col)
+        if cell.blk is not None and cell.blk is not self :
+            returned_list.append(cell.blk)
 
         return returned_list
 
@@ -472,7 +573,7 @@ class RCB(list) :
         #               6  6           6  6
 
         ret_str += indent_str + "%*s" % (label_width,"Possibles:") + "\n"
-        for value in Cell.all_cell_values :
+        for value in sorted(self.geometry.all_cell_values) :
             # Build a line to print
             possibles_line = indent_str + ' ' * label_width
 
@@ -544,7 +645,7 @@ class RCB(list) :
 
         for value in our_unsolved_values :
             # Get the possible cells that provide this value
-            cells = self.unsolved_value_possibles[value]
+            cells = unsolved_value_possibles[value]
 
             ret_str += "%s%d: " % (secondary_indent_str, value)
 
@@ -623,7 +724,7 @@ class Test_rcb(unittest.TestCase):
 
         # Adjust our self
         rcb.unsolved_cells = set()
-        rcb.unsolved_value_possibles = rcb.build_unsolved_value_possibles()
+        rcb.solved_values_mask = ALL_VALUES_MASK
 
         # Make sure life is good
         rcb.sanity_check()
@@ -663,10 +764,7 @@ class Test_rcb(unittest.TestCase):
 
             # adjust rcb
             rcb.unsolved_cells.add ( cell )
-        
-
-        # Rebuild unsolved_value_possibles
-        rcb.unsolved_value_possibles = rcb.build_unsolved_value_possibles()
+        rcb.solved_values_mask &= ~values_to_mask(unsolved_cell_values)
 
         # Make sure life is good
         rcb.sanity_check()
@@ -957,6 +1055,27 @@ class Test_rcb(unittest.TestCase):
         rcb.sanity_check()
 
 
+    def test_hidden_singles(self) :
+        # Nothing hidden when every cell can provide every value
+        rcb = self.all_unsolved_rcb_for_test(RCB_TYPE_ROW)
+        self.assertEqual( rcb.hidden_singles(), set() )
+
+        # Nothing to solve in a solved rcb
+        rcb = self.all_solved_rcb_for_test(RCB_TYPE_ROW)
+        self.assertEqual( rcb.hidden_singles(), set() )
+
+        # Only rcb[7] can provide 4
+        rcb = self.partially_solved_rcb_for_test(RCB_TYPE_BLK, [2, 5, 7])
+        #  rcb[2]:9, rcb[5]:3, rcb[7]:4 were unsolved
+        rcb[2].remove_from_possibles(4)
+        rcb[5].remove_from_possibles(4)
+        self.assertEqual( rcb.hidden_singles(), set([ CellToSolve(rcb[7], 4) ]) )
+
+        # A value nobody can provide is broken
+        rcb[7].remove_from_possibles(4)
+        self.assertRaises( ExcUnsolvable, rcb.hidden_singles )
+
+
     def test_remove_from_possibles(self) :
         # Note: Most of the actual operation testing is in
         #       test_a_cell_was_solved().  It was too hard
@@ -972,7 +1091,7 @@ class Test_rcb(unittest.TestCase):
         rcb = self.all_solved_rcb_for_test(RCB_TYPE_ROW)
         ret = rcb.remove_from_possibles( 5,  [rcb[0], rcb[3]] )
         self.assertEqual ( ret,                          set() )
-        self.assertEqual ( rcb.unsolved_value_possibles, {}    )
+        self.assertEqual ( rcb.build_unsolved_value_possibles(), {} )
         rcb.sanity_check()
 
         # Remove a possiblity that doesn't cause any other cells to be solved
@@ -6,12 +6,28 @@ statistics about solving a sudoku Board.
 
 # 2019-12-09 tc Initial
 # 2020-02-24 tc Made comply with dinkum_python_run_unittests
+# 2026-10-18 tc Added num_changes
+# 2026-10-18 tc Added per technique and search counters
 
 class Stats :
     ''' Holds statistics about solving a
     sudoku Board:
         solve_start_time_secs  When solve() called
         solve_time_secs        How long Board.solve() ran
+        num_solve_passes       How many times the deduction loop ran
+        num_changes            How many Cell values/possibles solve() changed
+
+    These are only collected if Board.collect_stats is set, otherwise
+    they are None.  See start_detail():
+        technique_calls        {} key: strategy name  value: # of times run
+        technique_secs         {} ditto               value: secs it ran
+        technique_cells_solved {} ditto               value: # of cells it solved
+        num_candidates_eliminated  possible values the strategies removed
+        num_guesses            values tried by solve()'s search
+        num_backtracks         guesses that were undone
+        max_search_depth       most guesses in effect at once
+        num_boards_allocated   Boards constructed during solve()
+    The search counters are only kept by ENGINE_SEARCH.
 
     Subtraction of two Stats is supported to compute
     the change in statistics
@@ -24,6 +40,31 @@ class Stats :
         self.solve_time_secs       = None # How long it ran
         self.num_solve_passes      = None # How many time the
                                           # solve() loop ran
+        self.num_changes           = None # Board.num_changes during solve()
+
+        # Only if Board.collect_stats, see start_detail()
+        self.technique_calls           = None # {} key: strategy name
+        self.technique_secs            = None #    ditto
+        self.technique_cells_solved    = None #    ditto
+        self.num_candidates_eliminated = None
+        self.num_guesses               = None
+        self.num_backtracks            = None
+        self.max_search_depth          = None
+        self.num_boards_allocated      = None
+
+
+    def start_detail(self) :
+        ''' Zeros the counters only collected if Board.collect_stats,
+        ready to be counted by a solve().
+        '''
+        self.technique_calls           = {}
+        self.technique_secs            = {}
+        self.technique_cells_solved    = {}
+        self.num_candidates_eliminated = 0
+        self.num_guesses               = 0
+        self.num_backtracks            = 0
+        self.max_search_depth          = 0
+        self.num_boards_allocated      = 0
 
 
     def __sub__(self, other) :
@@ -44,15 +85,19 @@ class Stats :
         # TypeError is typically from trying to subtract
         # a None entry, we just leave the returned value as None
         # which is set in the constructor.
-        for (ret_member_name,
-             self_member_value,
-             other_member_value) in zip ( vars(ret_class),
-                                          vars(self) .values(),
-                                          vars(other).values())  :
+        # other may have been pickled before some members existed
+        for name in vars(ret_class) :
+            self_member_value  = getattr(self,  name, None)
+            other_member_value = getattr(other, name, None)
             try :
-                setattr(ret_class, ret_member_name,
-                        self_member_value - other_member_value)
-            except TypeError :
+                if isinstance(self_member_value, dict) :
+                    # Key by key, a missing key is 0
+                    difference = dict( [ (key, self_member_value.get(key, 0) - other_member_value.get(key, 0))
+                                         for key in set(self_member_value) | set(other_member_value) ] )
+                else :
+                    difference = self_member_value - other_member_value
+                setattr(ret_class, name, difference)
+            except (TypeError, AttributeError) :
                 pass
         
         # All done
@@ -65,7 +110,13 @@ class Stats :
         ret_str = "" # what we return
 
         for (name, value) in vars(self).items() :
-            ret_str += "%s: %s\n" % (name, str(value))
+            if isinstance(value, dict) :
+                # One line per key, e.g. per strategy
+                ret_str += "%s:\n" % name
+                for key in sorted(value) :
+                    ret_str += "    %s: %s\n" % (key, str(value[key]))
+            else :
+                ret_str += "%s: %s\n" % (name, str(value))
         return ret_str
 
 
@@ -94,6 +145,9 @@ class Test_stats(unittest.TestCase):
         stat.solve_start_time_secs = 5732222.83215
         stat.solve_time_secs       = 18.234
         stat.num_solve_passes      = 50
+        stat.num_changes           = 1234
+        stat.start_detail()
+        stat.technique_secs["naked_singles"] = 0.25
        
         results = stat - stat
 
@@ -101,6 +155,8 @@ class Test_stats(unittest.TestCase):
         for value in vars(results).values() :
             if isinstance(value, float) :
                 self.assertAlmostEqual( value, 0.0, 4)
+            elif isinstance(value, dict) :
+                self.assertEqual( list(value.values()), [0.0] * len(value) )
             else :
                 self.assertEqual( value, 0 )
 
@@ -139,6 +195,40 @@ class Test_stats(unittest.TestCase):
         # Just make sure it runs
         s = str(Stats())
 
+        stat = Stats()
+        stat.start_detail()
+        stat.technique_secs["naked_singles"] = 0.5
+        self.assertIn( "technique_secs:\n    naked_singles: 0.5\n", str(stat) )
+        self.assertIn( "num_guesses: 0\n", str(stat) )
+
+    def test_detail(self) :
+        stat = Stats()
+        stat.start_detail()
+        for name in ( "technique_calls", "technique_secs", "technique_cells_solved" ) :
+            self.assertEqual( getattr(stat, name), {} )
+        self.assertEqual( stat.num_guesses, 0 )
+
+        # dicts subtract key by key
+        later = Stats()
+        later.start_detail()
+        stat .technique_calls.update( { "naked_singles" : 3, "x_wing" : 1 } )
+        later.technique_calls.update( { "naked_singles" : 10, "hidden_singles" : 2 } )
+        later.num_guesses = 7
+        delta = later - stat
+        self.assertEqual( delta.technique_calls, { "naked_singles" : 7, "hidden_singles" : 2, "x_wing" : -1 } )
+        self.assertEqual( delta.num_guesses, 7 )
+
+        # One pickled before they existed
+        old = Stats()
+        for name in ( "technique_calls", "num_guesses" ) :
+            delattr(old, name)
+        old.solve_time_secs = 1.0
+        later.solve_time_secs = 3.0
+        delta = later - old
+        self.assertEqual( delta.solve_time_secs, 2.0 )
+        self.assertIsNone( delta.technique_calls )
+        self.assertIsNone( delta.num_guesses )
+
 if __name__ == "__main__" :
     # Run the unittests
     unittest.main()
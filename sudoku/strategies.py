@@ -0,0 +1,766 @@
+#!/usr/bin/env python3
+# dinkum/sudoku/strategies.py
+''' The deduction techniques Board.solve_by_deduction() uses.
+
+Each technique is a subclass of Strategy with:
+    name        short unique name, e.g. "x_wing"
+    cost        rough relative cost of one apply() on a 9x9 board
+    apply(board)
+                Looks for the technique everywhere on board, solving
+                cells and removing possibles as it goes.  Returns the
+                number of cells solved.  Whether it changed anything
+                at all is told by board.num_changes.
+                raises ExcUnsolvable if board is found to have no solution.
+
+Strategies are registered by name with @register_strategy.
+make_strategies() returns them sorted cheapest first, which is
+the order Board._deduce() tries them in.  It starts back at the
+cheapest after any strategy changes the board, so an expensive
+strategy only runs when every cheaper one is stuck.
+
+The registered strategies, cheapest first:
+    naked_singles         cell with one possible value
+    hidden_singles        value only one cell in a row/col/blk can provide
+    pointing_pairs        value in a blk only in one row/col, so not
+                          elsewhere in that row/col
+    box_line_reduction    value in a row/col only in one blk, so not
+                          elsewhere in that blk
+    hidden_pairs_triples  2 (3) values only 2 (3) cells in a row/col/blk
+                          can provide.  See Board.solve_possibles_from_matching_cells()
+    naked_pairs           2 cells in a row/col/blk with the same 2 possibles
+    naked_triples         3 cells ... 3 possibles between them
+    x_wing                a value in 2 rows limited to the same 2 cols
+                          (or vice versa)
+    xy_wing               pivot {x,y} sees wings {x,z} and {y,z}, so
+                          z is not in any cell seeing both wings
+    naked_quads           4 cells ... 4 possibles between them
+    hidden_quads          4 values only 4 cells in a row/col/blk can provide
+    swordfish             x_wing with 3 rows and cols
+
+class StrategyScheduler decides the order, see it's doc.  Board
+makes one per solve(), or several Boards can share one so what's
+learned on one puzzle is used on the next.
+'''
+
+# 2026-10-18 tc Initial
+# 2026-10-18 tc Added StrategyScheduler
+# 2026-10-18 tc run_pass() can fill in per technique Stats
+
+from dinkum.sudoku         import * # All package wide def's
+from dinkum.sudoku.bitmask import *
+from dinkum.sudoku.cell    import CellToSolve
+
+import functools
+import itertools
+import time
+
+
+class Strategy :
+    ''' Base class of a deduction technique.  See module doc. '''
+    name = None
+    cost = None
+
+    def apply(self, board) :
+        ''' Applies the technique to board.  See module doc '''
+        raise NotImplementedError
+
+    def __repr__(self) :
+        return "<Strategy %s cost:%s>" % (self.name, self.cost)
+
+
+# Every registered Strategy subclass.  key: name
+_strategy_classes = {}
+
+def register_strategy(strategy_class) :
+    ''' Class decorator which makes strategy_class available
+    to make_strategies() under strategy_class.name
+    '''
+    assert strategy_class.name not in _strategy_classes, "Duplicate strategy: %s" % strategy_class.name
+    _strategy_classes[strategy_class.name] = strategy_class
+    return strategy_class
+
+
+def all_strategy_names() :
+    ''' Returns [] of every registered strategy name, cheapest first '''
+    return [ strategy.name for strategy in make_strategies() ]
+
+
+def make_strategies(names=None) :
+    ''' Returns a tuple of Strategy objects, cheapest first.
+    names is an iterable of strategy names, None means all of them.
+
+    raises KeyError on an unknown name.
+    '''
+    if names is None :
+        names = _strategy_classes.keys()
+    strategies = [ _strategy_classes[name]() for name in names ]
+    return tuple( sorted(strategies, key=lambda strategy : strategy.cost) )
+
+
+def remove_mask_from_cells(cells, mask) :
+    ''' Removes the values in mask from the possibles of every cell in cells.
+
+    Returns a set of CellToSolve for any cell left with one possible.
+    raises ExcUnsolvable if a cell is left with none.
+    '''
+    cells_to_solve = set()
+    for cell in cells :
+        if cell.remove_mask_from_possibles(mask) :
+            possibles_mask = cell.possibles_mask
+            if possibles_mask == 0 :
+                raise ExcUnsolvable()
+            if possibles_mask & (possibles_mask-1) == 0 :
+                cells_to_solve.add( CellToSolve(cell, sole_value(possibles_mask)) )
+    return cells_to_solve
+
+
+def _idx_mask_of_value(rcb, value_mask) :
+    ''' Returns int with bit (1 << idx) set for every rcb[idx]
+    which has value_mask in it's possibles
+    '''
+    idx_mask = 0
+    for (idx, cell) in enumerate(rcb) :
+        if cell.possibles_mask & value_mask :
+            idx_mask |= 1 << idx
+    return idx_mask
+
+
+def _idxs(idx_mask) :
+    ''' Returns [] of every idx with bit (1 << idx) set in idx_mask '''
+    return [ idx for idx in range(idx_mask.bit_length()) if idx_mask & (1 << idx) ]
+
+
+def _num_candidates(board) :
+    ''' Returns # of possible values left in all of board's unsolved cells '''
+    return sum( [ popcount(cell.possibles_mask) for cell in board.unsolved_cells ] )
+
+
+def _num_idxs(idx_mask) :
+    ''' Returns number of bits set in idx_mask.
+    Not popcount(), which ignores bit 0 (there is no value 0)
+    '''
+    return bin(idx_mask).count('1')
+
+
+@register_strategy
+class NakedSingles(Strategy) :
+    name = "naked_singles"
+    cost = 1
+
+    def apply(self, board) :
+        return board.solve_cells_with_single_possible_value()
+
+
+@register_strategy
+class HiddenSingles(Strategy) :
+    name = "hidden_singles"
+    cost = 2
+
+    def apply(self, board) :
+        return board.solve_rcbs_with_single_possible_value_solution()
+
+
+class _LockedCandidates(Strategy) :
+    ''' If every cell that can provide a value in one of rcb_types
+    shares another rcb, no other cell in that rcb can have the value.
+    '''
+    rcb_types = None
+
+    def apply(self, board) :
+        cells_to_solve = set()
+        for rcb_type in self.rcb_types :
+            for rcb in board.rcb(rcb_type) :
+                if len(rcb.unsolved_cells) < 2 :
+                    continue
+
+                for (value, cells) in rcb.build_unsolved_value_possibles().items() :
+                    if len(cells) < 2 :
+                        continue   # hidden single, somebody else's job
+                    first_cell = next(iter(cells))
+                    for other_rcb in first_cell.common_rcbs(cells) :
+                        if other_rcb is not rcb :
+                            cells_to_solve |= other_rcb.remove_mask_from_possibles(1 << value, cells)
+
+        return board.solve_cells(cells_to_solve)
+
+
+@register_strategy
+class PointingPairs(_LockedCandidates) :
+    name = "pointing_pairs"
+    cost = 3
+    rcb_types = (RCB_TYPE_BLK, )
+
+
+@register_strategy
+class BoxLineReduction(_LockedCandidates) :
+    name = "box_line_reduction"
+    cost = 3
+    rcb_types = (RCB_TYPE_ROW, RCB_TYPE_COL)
+
+
+@register_strategy
+class HiddenPairsTriples(Strategy) :
+    name = "hidden_pairs_triples"
+    cost = 4
+
+    def apply(self, board) :
+        return board.solve_possibles_from_matching_cells()
+
+
+class _NakedSubset(Strategy) :
+    ''' size cells in an rcb with only size possibles between them.
+    Those values can't be in any other cell of the rcb.
+    '''
+    size = None
+
+    def apply(self, board) :
+        size = self.size
+        cells_to_solve = set()
+        for rcb in board.rcbs :
+            if len(rcb.unsolved_cells) <= size :
+                continue
+
+            candidates = [ cell for cell in rcb if cell.possibles_mask and popcount(cell.possibles_mask) <= size ]
+            for subset in itertools.combinations(candidates, size) :
+                mask = 0
+                for cell in subset :
+                    mask |= cell.possibles_mask
+                if popcount(mask) == size :
+                    cells_to_solve |= rcb.remove_mask_from_possibles(mask, subset)
+
+        return board.solve_cells(cells_to_solve)
+
+
+@register_strategy
+class NakedPairs(_NakedSubset) :
+    name = "naked_pairs"
+    cost = 5
+    size = 2
+
+
+@register_strategy
+class NakedTriples(_NakedSubset) :
+    name = "naked_triples"
+    cost = 6
+    size = 3
+
+
+@register_strategy
+class NakedQuads(_NakedSubset) :
+    name = "naked_quads"
+    cost = 9
+    size = 4
+
+
+class _HiddenSubset(Strategy) :
+    ''' size values which only size cells in an rcb can provide.
+    Those cells can't be any other value.
+    '''
+    size = None
+
+    def apply(self, board) :
+        size = self.size
+        cells_to_solve = set()
+        for rcb in board.rcbs :
+            if len(rcb.unsolved_cells) <= size :
+                continue
+
+            # Where each unsolved value can go.  key:value value:idx_mask
+            value_idx_masks = {}
+            for value in mask_to_values( board.geometry.all_values_mask & ~rcb.solved_values_mask ) :
+                idx_mask = _idx_mask_of_value(rcb, 1 << value)
+                if _num_idxs(idx_mask) <= size :
+                    value_idx_masks[value] = idx_mask
+
+            for values in itertools.combinations(value_idx_masks, size) :
+                idx_mask = 0
+                for value in values :
+                    idx_mask |= value_idx_masks[value]
+
+                num_cells = _num_idxs(idx_mask)
+                if num_cells < size :
+                    raise ExcUnsolvable()  # size values won't fit
+                if num_cells == size :
+                    other_values_mask = board.geometry.all_values_mask & ~values_to_mask(values)
+                    cells = [ rcb[idx] for idx in _idxs(idx_mask) ]
+                    cells_to_solve |= remove_mask_from_cells(cells, other_values_mask)
+
+        return board.solve_cells(cells_to_solve)
+
+
+@register_strategy
+class HiddenQuads(_HiddenSubset) :
+    name = "hidden_quads"
+    cost = 10
+    size = 4
+
+
+class _Fish(Strategy) :
+    ''' For a value, size rows where it can only be in
+    the same size cols.  Each of those cols has the value in one
+    of those rows, so no other cell in the cols can have it.
+    Same with rows and cols swapped.
+    '''
+    size = None
+
+    def apply(self, board) :
+        size = self.size
+        cells_to_solve = set()
+        for value in mask_to_values(board.geometry.all_values_mask) :
+            value_mask = 1 << value
+            for (base_rcbs, cover_rcbs) in [ (board.rows, board.cols), (board.cols, board.rows) ] :
+                # rows(cols) the value could go in 2..size places
+                # idx of a row is a col_num and vice versa
+                lines = []
+                for rcb in base_rcbs :
+                    if rcb.solved_values_mask & value_mask :
+                        continue
+                    idx_mask = _idx_mask_of_value(rcb, value_mask)
+                    if 2 <= _num_idxs(idx_mask) <= size :
+                        lines.append( (rcb, idx_mask) )
+
+                for fish in itertools.combinations(lines, size) :
+                    cover_mask = 0
+                    for (rcb, idx_mask) in fish :
+                        cover_mask |= idx_mask
+                    if _num_idxs(cover_mask) == size :
+                        fish_cells = set( [ cell for (rcb, idx_mask) in fish for cell in rcb ] )
+                        for idx in _idxs(cover_mask) :
+                            cells_to_solve |= cover_rcbs[idx].remove_mask_from_possibles(value_mask, fish_cells)
+
+        return board.solve_cells(cells_to_solve)
+
+
+@register_strategy
+class XWing(_Fish) :
+    name = "x_wing"
+    cost = 7
+    size = 2
+
+
+@register_strategy
+class Swordfish(_Fish) :
+    name = "swordfish"
+    cost = 11
+    size = 3
+
+
+@register_strategy
+class XYWing(Strategy) :
+    name = "xy_wing"
+    cost = 8
+
+    def apply(self, board) :
+        cells_to_solve = set()
+        cells = board.cells
+        peers = board.geometry.cell_peers
+
+        for pivot in sorted(board.unsolved_cells, key=lambda cell : cell.cell_num) :
+            pivot_mask = pivot.possibles_mask
+            if popcount(pivot_mask) != 2 :
+                continue
+
+            # Wings share exactly one value with pivot
+            wings = []
+            for cell_num in peers[pivot.cell_num] :
+                wing_mask = cells[cell_num].possibles_mask
+                if popcount(wing_mask) == 2 and popcount(wing_mask & pivot_mask) == 1 :
+                    wings.append(cells[cell_num])
+
+            for (wing1, wing2) in itertools.combinations(wings, 2) :
+                (mask1, mask2) = (wing1.possibles_mask, wing2.possibles_mask)
+                z_mask = mask1 & ~pivot_mask
+                if (mask2 & ~pivot_mask) != z_mask or (mask1 & pivot_mask) == (mask2 & pivot_mask) :
+                    continue
+                if popcount(mask1) != 2 or popcount(mask2) != 2 :
+                    continue  # changed underneath us
+
+                # Either wing1 or wing2 is z.  Whoever sees both can't be
+                seers = set(peers[wing1.cell_num]) & set(peers[wing2.cell_num])
+                cells_to_solve |= remove_mask_from_cells( [ cells[cell_num] for cell_num in seers ], z_mask )
+
+        return board.solve_cells(cells_to_solve)
+
+
+# Every registered strategy, cheapest first
+DEFAULT_STRATEGIES = make_strategies()
+
+
+class StrategyScheduler :
+    ''' Runs deduction Strategy's for Board._deduce() in the order
+    which has paid off best so far.
+
+    For each strategy we measure how many eliminations (changes to
+    the board, see Board.num_changes) it makes per microsecond of run
+    time.  run_pass() tries strategies in order of that yield, best
+    first, until one changes the board.  Before a strategy has been
+    measured much, it's yield is guessed from it's cost, so we start
+    out cheapest first.
+
+    A strategy which hasn't changed the board in skip_after calls
+    in a row is skipped.  Every skip_after skips, it gets run anyway
+    to see if it's become useful.  Skipping trades a little deduction
+    power (which solve()'s search makes up for) for not confirming
+    every stall with the most expensive strategies.  skip_after of
+    None never skips.
+
+    A scheduler can be shared by many Boards, e.g. a batch of
+    puzzles, see Board.scheduler.  The measurements accumulate.
+
+    data:
+        strategies     tuple of Strategy's we schedule
+        calls          [] of times strategies[i].apply() was run
+        skips          [] of times strategies[i] was skipped
+        usecs          [] of microseconds strategies[i].apply() ran
+        eliminations   [] of board changes strategies[i].apply() made
+    '''
+
+    # How much the guess from cost counts, in calls
+    prior_calls          = 4
+    prior_usecs_per_cost = 10.0
+
+    # How many passes between reordering
+    reorder_every = 8
+
+    def __init__(self, strategies=None, skip_after=50) :
+        ''' strategies is iterable of Strategy's, None is DEFAULT_STRATEGIES '''
+        self.strategies = tuple(strategies) if strategies is not None else DEFAULT_STRATEGIES
+        self.skip_after = skip_after
+
+        num_strategies = len(self.strategies)
+        self.calls        = [0]   * num_strategies
+        self.skips        = [0]   * num_strategies
+        self.usecs        = [0.0] * num_strategies
+        self.eliminations = [0]   * num_strategies
+
+        self._fruitless      = [0] * num_strategies  # calls in a row w/o a change
+        self._skips_in_a_row = [0] * num_strategies
+        self._num_passes     = 0
+
+        # indexes into strategies, in the order we try them
+        # Unmeasured, yield_per_usec() goes down as cost goes up
+        self._order = sorted(range(num_strategies), key=lambda strategy_num : self.strategies[strategy_num].cost)
+
+
+    def yield_per_usec(self, strategy_num) :
+        ''' Returns estimated eliminations/usec of strategies[strategy_num] '''
+        prior_calls = self.prior_calls
+        cost        = self.strategies[strategy_num].cost
+        return ( (self.eliminations[strategy_num] + prior_calls) /
+                 (self.usecs[strategy_num] + prior_calls * cost * self.prior_usecs_per_cost) )
+
+
+    def order(self) :
+        ''' Returns [] of our strategies in the order run_pass() tries them '''
+        return [ self.strategies[strategy_num] for strategy_num in self._order ]
+
+
+    def _reorder(self) :
+        ''' Sorts _order by yield, best first '''
+        self._order.sort(key=lambda strategy_num : -self.yield_per_usec(strategy_num))
+
+
+    def run_pass(self, board, stats=None) :
+        ''' Applies our strategies to board, best yield first,
+        until one of them changes the board.
+
+        stats, if not None, is a Stats whose per technique counters
+        are bumped, see Stats.start_detail().
+
+        Returns True if board was changed, False if no strategy could.
+        raises ExcUnsolvable if board is found to have no solution.
+        '''
+        apply = self._apply if stats is None else functools.partial(self._apply_counted, stats)
+
+        self._num_passes += 1
+        if self._num_passes % self.reorder_every == 0 :
+            self._reorder()
+
+        skip_after = self.skip_after
+        for strategy_num in self._order :
+            # Skip it?
+            if skip_after is not None and self._fruitless[strategy_num] >= skip_after :
+                if self._skips_in_a_row[strategy_num] < skip_after :
+                    self._skips_in_a_row[strategy_num] += 1
+                    self.skips[strategy_num] += 1
+                    continue
+                self._skips_in_a_row[strategy_num] = 0  # Try it again
+
+            if apply(strategy_num, board) :
+                return True
+
+        return False
+
+
+    def _apply(self, strategy_num, board) :
+        ''' Runs strategies[strategy_num] on board and measures it.
+        Returns True if board was changed.  A board found to be
+        unsolvable counts as a change.
+        '''
+        num_changes_before = board.num_changes
+        unsolvable = False
+        start_time = time.perf_counter()
+        try :
+            self.strategies[strategy_num].apply(board)
+        except ExcUnsolvable :
+            unsolvable = True
+            raise
+        finally :
+            num_changes = board.num_changes - num_changes_before + unsolvable
+            self.usecs[strategy_num] += (time.perf_counter() - start_time) * 1e6
+            self.calls[strategy_num] += 1
+            self.eliminations[strategy_num] += num_changes
+            self._fruitless[strategy_num] = 0 if num_changes else self._fruitless[strategy_num] + 1
+
+        return num_changes != 0
+
+
+    def _apply_counted(self, stats, strategy_num, board) :
+        ''' _apply(), which see, and count what it did in Stats stats '''
+        name = self.strategies[strategy_num].name
+        num_unsolved_before   = len(board.unsolved_cells)
+        num_candidates_before = _num_candidates(board)
+        start_time = time.perf_counter()
+        try :
+            return self._apply(strategy_num, board)
+        finally :
+            stats.technique_secs[name] = ( stats.technique_secs.get(name, 0.0) +
+                                           time.perf_counter() - start_time )
+            stats.technique_calls[name] = stats.technique_calls.get(name, 0) + 1
+            stats.technique_cells_solved[name] = ( stats.technique_cells_solved.get(name, 0) +
+                                                   num_unsolved_before - len(board.unsolved_cells) )
+            stats.num_candidates_eliminated += num_candidates_before - _num_candidates(board)
+
+
+    def __str__(self) :
+        ''' Human readable measurements, one line per strategy in order '''
+        #               123456789.123456789.12345
+        ret_str = "%-22s %8s %8s %12s %12s %12s\n" % ("strategy", "calls", "skips",
+                                                     "usecs", "eliminations", "elims/usec")
+        for strategy_num in self._order :
+            ret_str += "%-22s %8d %8d %12.1f %12d %12.4f\n" % (self.strategies[strategy_num].name,
+                                                           self.calls[strategy_num],
+                                                           self.skips[strategy_num],
+                                                           self.usecs[strategy_num],
+                                                           self.eliminations[strategy_num],
+                                                           self.yield_per_usec(strategy_num))
+        return ret_str
+
+
+# Test code
+import unittest
+import dinkum.sudoku.board
+
+class Test_strategies(unittest.TestCase):
+
+    def setUp(self) :
+        # All cells unsolved with all values possible
+        self.board = dinkum.sudoku.board.Board(None, "strategies")
+
+    def remove(self, cell_nums, values) :
+        ''' removes values from possibles of all cell_nums '''
+        for cell_num in cell_nums :
+            self.board.cells[cell_num].remove_from_possibles(values)
+
+    def set_possibles(self, cell_num, values) :
+        self.board.cells[cell_num].possible_values = set(values)
+
+    def has(self, cell_num, value) :
+        return value in self.board.cells[cell_num].possible_values
+
+    def apply(self, name) :
+        ''' applies strategy name, returns True if board changed '''
+        (strategy, ) = make_strategies( [name] )
+        num_changes = self.board.num_changes
+        strategy.apply(self.board)
+        return self.board.num_changes != num_changes
+
+    def test_registry(self) :
+        names = all_strategy_names()
+        self.assertEqual( names[:2], ["naked_singles", "hidden_singles"] )
+        for name in [ "pointing_pairs", "box_line_reduction", "naked_quads", "hidden_quads",
+                      "x_wing", "swordfish", "xy_wing" ] :
+            self.assertIn( name, names )
+
+        costs = [ strategy.cost for strategy in DEFAULT_STRATEGIES ]
+        self.assertEqual( costs, sorted(costs) )
+
+        self.assertEqual( [ s.name for s in make_strategies( ["x_wing", "naked_singles"] ) ],
+                          [ "naked_singles", "x_wing" ] )
+        with self.assertRaises(KeyError) :
+            make_strategies( ["guess"] )
+        with self.assertRaises(AssertionError) :
+            register_strategy(XWing)
+
+    def test_pointing_pairs(self) :
+        # 5 in blk 0 only in row 0
+        self.remove( [9,10,11, 18,19,20], 5 )
+        self.assertTrue( self.apply("pointing_pairs") )
+        for cell_num in range(3,9) :
+            self.assertFalse( self.has(cell_num, 5) )
+        self.assertTrue( self.has(27, 5) )
+
+    def test_box_line_reduction(self) :
+        # 5 in row 0 only in blk 0
+        self.remove( range(3,9), 5 )
+        self.assertTrue( self.apply("box_line_reduction") )
+        for cell_num in [9,10,11, 18,19,20] :
+            self.assertFalse( self.has(cell_num, 5) )
+        self.assertTrue( self.has(12, 5) )
+
+    def test_naked_pairs(self) :
+        self.set_possibles( 0, [1,2] )
+        self.set_possibles( 8, [1,2] )
+        self.assertTrue( self.apply("naked_pairs") )
+        for cell_num in range(1,8) :
+            self.assertFalse( self.has(cell_num, 1) or self.has(cell_num, 2) )
+        self.assertTrue( self.has(9, 1) )
+
+    def test_naked_quads(self) :
+        for (cell_num, values) in [ (0,[1,2]), (3,[2,3]), (6,[3,4]), (8,[1,4]) ] :
+            self.set_possibles( cell_num, values )
+        self.assertFalse( self.apply("naked_triples") )
+        self.assertTrue ( self.apply("naked_quads") )
+        for cell_num in [1,2,4,5,7] :
+            for value in [1,2,3,4] :
+                self.assertFalse( self.has(cell_num, value) )
+        self.assertTrue( self.has(0, 1) )
+
+    def test_hidden_quads(self) :
+        # 1-4 only in cells 0,3,6,8 of row 0
+        self.remove( [1,2,4,5,7], [1,2,3,4] )
+        self.assertTrue( self.apply("hidden_quads") )
+        for cell_num in [0,3,6,8] :
+            self.assertEqual( self.board.cells[cell_num].possible_values, set([1,2,3,4]) )
+
+        # 1-4 in only 3 cells is a contradiction
+        self.remove( [8], [1,2,3,4] )
+        with self.assertRaises(ExcUnsolvable) :
+            self.apply("hidden_quads")
+
+    def test_x_wing(self) :
+        # 5 in rows 1 and 4 only in cols 2 and 7
+        self.remove( [ row*9 + col for row in [1,4] for col in range(9) if col not in [2,7] ], 5 )
+        self.assertTrue( self.apply("x_wing") )
+        for row in [0,2,3,5,6,7,8] :
+            self.assertFalse( self.has(row*9+2, 5) )
+            self.assertFalse( self.has(row*9+7, 5) )
+            self.assertTrue ( self.has(row*9+0, 5) )
+        self.assertTrue( self.has(1*9+2, 5) )
+
+    def test_swordfish(self) :
+        # 5 in rows 0,3,6 only in cols 1,4,7
+        for (row, cols) in [ (0,[1,4]), (3,[4,7]), (6,[1,7]) ] :
+            self.remove( [ row*9 + col for col in range(9) if col not in cols ], 5 )
+        self.assertFalse( self.apply("x_wing") )
+        self.assertTrue ( self.apply("swordfish") )
+        for row in [1,2,4,5,7,8] :
+            for col in [1,4,7] :
+                self.assertFalse( self.has(row*9+col, 5) )
+        self.assertTrue( self.has(0*9+1, 5) )
+        self.assertTrue( self.has(1*9+0, 5) )
+
+    def test_xy_wing(self) :
+        self.set_possibles(  0, [1,2] )  # pivot
+        self.set_possibles(  4, [1,3] )  # wing, same row
+        self.set_possibles( 18, [2,3] )  # wing, same col and blk
+        self.assertTrue( self.apply("xy_wing") )
+
+        # See both wings
+        for cell_num in [1,2, 21,22,23] :
+            self.assertFalse( self.has(cell_num, 3) )
+        # Don't
+        for cell_num in [5, 9, 27] :
+            self.assertTrue( self.has(cell_num, 3) )
+
+    def test_deduce_uses_them(self) :
+        # A puzzle that singles and hidden pairs/triples can't finish
+        puzzle = dinkum.sudoku.board.Board(
+            "100000569492056108056109240009640801064010000218035604040500016905061402621000005")
+
+        basic = dinkum.sudoku.board.Board(puzzle)
+        basic.strategies = make_strategies( ["naked_singles", "hidden_singles", "hidden_pairs_triples"] )
+        basic.solve_by_deduction()
+
+        full = dinkum.sudoku.board.Board(puzzle)
+        full.solve_by_deduction()
+        self.assertLess( full.num_unsolved(), basic.num_unsolved() )
+        self.assertTrue( full.is_solved() )
+        self.assertTrue( full.is_subset_of( dinkum.sudoku.board.Board(puzzle).solve() ) )
+
+
+class _FakeBoard :
+    num_changes = 0
+
+class _FakeStrategy(Strategy) :
+    ''' Makes changes_per_call changes to a _FakeBoard per apply() '''
+    def __init__(self, name, cost, changes_per_call) :
+        self.name = name
+        self.cost = cost
+        self.changes_per_call = changes_per_call
+
+    def apply(self, board) :
+        board.num_changes += self.changes_per_call
+
+class Test_scheduler(unittest.TestCase):
+
+    def test_initial_order(self) :
+        scheduler = StrategyScheduler()
+        self.assertEqual( [ s.cost for s in scheduler.order() ],
+                          [ s.cost for s in DEFAULT_STRATEGIES ] )
+
+    def test_reorder_by_yield(self) :
+        cheap_useless  = _FakeStrategy("cheap_useless",  1, 0)
+        pricey_useful  = _FakeStrategy("pricey_useful", 20, 5)
+        scheduler = StrategyScheduler( [pricey_useful, cheap_useless], skip_after=None )
+        self.assertEqual( scheduler.order(), [cheap_useless, pricey_useful] )
+
+        board = _FakeBoard()
+        for i in range(2 * scheduler.reorder_every) :
+            self.assertTrue( scheduler.run_pass(board) )
+        self.assertEqual( scheduler.order(), [pricey_useful, cheap_useless] )
+        self.assertEqual( scheduler.skips, [0, 0] )
+        self.assertIn( "pricey_useful", str(scheduler) )
+
+    def test_skip_and_probe(self) :
+        useless = _FakeStrategy("useless", 1, 0)
+        scheduler = StrategyScheduler( [useless], skip_after=3 )
+        board = _FakeBoard()
+        for i in range(3) :
+            self.assertFalse( scheduler.run_pass(board) )
+        self.assertEqual( (scheduler.calls, scheduler.skips), ([3], [0]) )
+
+        # skipped 3 times, then tried again
+        for i in range(4) :
+            scheduler.run_pass(board)
+        self.assertEqual( (scheduler.calls, scheduler.skips), ([4], [3]) )
+
+    def test_unsolvable_counts(self) :
+        board = dinkum.sudoku.board.Board(None, "unsolvable")
+        for cell_num in [1,2,4,5,7] :
+            board.cells[cell_num].remove_from_possibles( [1,2,3,4] )
+        board.cells[8].remove_from_possibles( [1,2,3,4] )
+        scheduler = StrategyScheduler( make_strategies( ["hidden_quads"] ) )
+        with self.assertRaises(ExcUnsolvable) :
+            scheduler.run_pass(board)
+        self.assertEqual( (scheduler.calls, scheduler.eliminations), ([1], [1]) )
+
+    def test_shared_by_boards(self) :
+        scheduler = StrategyScheduler()
+        calls = 0
+        for spec in [ dinkum.sudoku.board.Test_board.kato_spec_lrl,
+                      dinkum.sudoku.board.Test_board.hardest_spec_str ] :
+            board = dinkum.sudoku.board.Board(spec)
+            board.scheduler = scheduler
+            solved = board.solve()
+            self.assertTrue( solved and solved.is_solved() )
+            self.assertTrue( board.is_subset_of(solved) )
+
+            # Measurements accumulate across boards
+            self.assertGreater( sum(scheduler.calls), calls )
+            calls = sum(scheduler.calls)
+
+
+if __name__ == "__main__" :
+    # Run the unittests
+    unittest.main()
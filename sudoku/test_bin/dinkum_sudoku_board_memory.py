@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+#filename: dinkum_sudoku_board_memory.py
+#path: sudoku/test_bin/
+#repo: http://github.com/dinkumsoftware/dinkum.git
+'''
+Measures the cost of keeping sudoku Boards around.
+For a few sample boards, prints:
+    bytes/board   memory held by each Board, as seen by tracemalloc
+    boards/sec    how fast Board() constructs them
+
+EXIT STATUS
+    0  Normal
+    3  Some kind of exception thrown
+'''
+
+# 2026-10-18 tc Initial
+
+import sys, os, traceback, argparse
+import time
+import tracemalloc
+
+from   dinkum.sudoku.board import *
+import dinkum.sudoku.test_data.test_puzzles
+
+ret_val_good             = 0
+ret_val_exception_raised = 3
+
+
+def main() :
+    parser = argparse.ArgumentParser(description="Reports bytes/Board and Board() constructions/sec")
+    parser.add_argument("-n", "--num_boards", type=int,
+                        help="How many Boards to build for each sample",
+                        default=1000 )
+    args = parser.parse_args()
+
+    # What we construct from
+    kato = dinkum.sudoku.test_data.test_puzzles.all_known_puzzle_names["kato_puzzle"]
+    samples = [ ("Board()",           lambda : Board(None, "empty") ),
+                ("Board(kato input)", lambda : Board(kato.input_board) ),
+                ("Board(kato soln)",  lambda : Board(kato.solution_board) ),
+              ]
+
+    #       123456789.123456789.12345
+    print ("%-20s %12s %12s" % ("", "bytes/board", "boards/sec") )
+    for (name, construct) in samples :
+        print ("%-20s %12.0f %12.0f" % (name,
+                                       bytes_per_board(construct, args.num_boards),
+                                       boards_per_sec (construct, args.num_boards) ) )
+
+    return ret_val_good
+
+
+def bytes_per_board(construct, num_boards) :
+    ''' Returns average number of bytes still allocated per board
+    after calling construct() num_boards times and keeping the results.
+    '''
+    construct()  # Get any one time allocations out of the way
+
+    tracemalloc.start()
+    bytes_at_start = tracemalloc.get_traced_memory()[0]
+
+    boards = [ construct() for i in range(num_boards) ]
+
+    bytes_held = tracemalloc.get_traced_memory()[0] - bytes_at_start
+    tracemalloc.stop()
+
+    del boards
+    return bytes_held / num_boards
+
+
+def boards_per_sec(construct, num_boards) :
+    ''' Returns how many times/sec construct() can be called.
+    Not done under tracemalloc, which slows things down a lot.
+    '''
+    start_time = time.perf_counter()
+    for i in range(num_boards) :
+        construct()
+    return num_boards / (time.perf_counter() - start_time)
+
+
+if __name__ == '__main__':
+    try:
+        # Invoke the actual program
+        # We pass back to OS whatever it returns
+        main_return = main()
+
+        # Pass back to the OS the proper exit code. 0 is good
+        sys.exit( main_return)
+
+    except KeyboardInterrupt as e: # Ctrl-C
+        raise e
+    except SystemExit as e: # sys.exit()
+        raise e
+    except Exception as e:
+        print ('ERROR: uncaught EXCEPTION. Msg after traceback.')
+        traceback.print_exc()    # stack dump (which prints err msg)
+        os._exit(ret_val_exception_raised)
@@ -0,0 +1,141 @@
+#!/usr/bin/env python3
+#filename: dinkum_sudoku_scaling.py
+#path: sudoku/test_bin/
+#repo: http://github.com/dinkumsoftware/dinkum.git
+'''
+Measures how Board() construction and solve() scale with board size.
+
+For each board size, builds --num_puzzles puzzles by shuffling a
+solved board and blanking --blank_fraction of it's cells.  Every
+puzzle is solved with every engine.  Prints average milliseconds for:
+    construct    Board(list of rows)
+    <engine>     Board.solve(engine)
+
+The shuffles are seeded with --seed, so runs are repeatable.
+Much above the default --blank_fraction, the 25x25 puzzles can
+take minutes to search.
+
+EXIT STATUS
+    0  Normal
+    1  Some puzzle wasn't solved
+    3  Some kind of exception thrown
+'''
+
+# 2026-10-18 tc Initial
+
+import sys, os, traceback, argparse
+import time
+import random
+
+from   dinkum.sudoku.board import *
+
+ret_val_good             = 0
+ret_val_some_not_solved  = 1
+ret_val_exception_raised = 3
+
+
+def main() :
+    parser = argparse.ArgumentParser(description="Reports Board() and solve() times vs board size")
+    parser.add_argument("-n", "--num_puzzles", type=int,
+                        help="How many puzzles of each size",
+                        default=5 )
+    parser.add_argument("-b", "--blank_fraction", type=float,
+                        help="Fraction of cells to blank out",
+                        default=0.4 )
+    parser.add_argument("-s", "--seed", type=int,
+                        help="Random seed",
+                        default=1 )
+    parser.add_argument("--sizes", type=int, nargs='+',
+                        help="Board sizes (rcb_size) to measure",
+                        default=[4, 6, 9, 16, 25] )
+    parser.add_argument("-e", "--engines", nargs='+',
+                        help="Solution engines to time",
+                        choices=ALL_ENGINES,
+                        default=list(ALL_ENGINES) )
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+
+    #                  123456789.123456789.
+    print ("%-12s %12s" % ("size", "construct") +
+           "".join( [ " %12s" % engine for engine in args.engines ] ) + "   (msecs)" )
+
+    we_solved_all_puzzles = True  # Forever the optimist
+    for rcb_size in args.sizes :
+        geometry = geometry_for_rcb_size(rcb_size)
+        puzzles  = [ make_puzzle(geometry, args.blank_fraction, rng) for i in range(args.num_puzzles) ]
+
+        construct_secs = 0.0
+        solve_secs     = dict( [ (engine, 0.0) for engine in args.engines ] )
+        for puzzle in puzzles :
+            start_time = time.perf_counter()
+            board = Board(puzzle, "scaling", "", geometry)
+            construct_secs += time.perf_counter() - start_time
+
+            for engine in args.engines :
+                board_to_solve = board.clone()
+                start_time = time.perf_counter()
+                solved = board_to_solve.solve(engine)
+                solve_secs[engine] += time.perf_counter() - start_time
+                we_solved_all_puzzles &= bool(solved)
+
+        msecs_per_puzzle = 1000.0 / len(puzzles)
+        print ("%-12s %12.3f" % (geometry.name, construct_secs * msecs_per_puzzle) +
+               "".join( [ " %12.3f" % (solve_secs[engine] * msecs_per_puzzle) for engine in args.engines ] ) )
+
+    return ret_val_good if we_solved_all_puzzles else ret_val_some_not_solved
+
+
+def solved_rows(geometry, rng) :
+    ''' Returns list of row-lists of a randomly shuffled solved board
+    with geometry.  Uses random.Random rng.
+
+    Starts with a pattern that is always solved and shuffles
+    the rows within each band of blks, the bands, the cols within
+    each stack of blks, the stacks, and the values.  None of those
+    break a solution.
+    '''
+    (h, w, n) = (geometry.blk_height, geometry.blk_width, geometry.rcb_size)
+
+    def shuffled(seq) :
+        seq = list(seq)
+        rng.shuffle(seq)
+        return seq
+
+    # A band is blk_height rows of blks, a stack is blk_width cols of them
+    row_nums = [ band*h + r for band in shuffled(range(n//h)) for r in shuffled(range(h)) ]
+    col_nums = [ stack*w + c for stack in shuffled(range(n//w)) for c in shuffled(range(w)) ]
+    values   = [0] + shuffled(range(1, n+1))
+
+    return [ [ values[ (w*(r%h) + r//h + c) % n + 1 ] for c in col_nums ] for r in row_nums ]
+
+
+def make_puzzle(geometry, blank_fraction, rng) :
+    ''' Returns list of row-lists of a puzzle with geometry.
+    blank_fraction of it's cells are unsolved.  It may
+    have more than one solution.
+    '''
+    rows = solved_rows(geometry, rng)
+    n    = geometry.rcb_size
+    for cell_num in rng.sample( range(geometry.num_cells), int(geometry.num_cells * blank_fraction) ) :
+        rows[cell_num // n][cell_num % n] = 0
+    return rows
+
+
+if __name__ == '__main__':
+    try:
+        # Invoke the actual program
+        # We pass back to OS whatever it returns
+        main_return = main()
+
+        # Pass back to the OS the proper exit code. 0 is good
+        sys.exit( main_return)
+
+    except KeyboardInterrupt as e: # Ctrl-C
+        raise e
+    except SystemExit as e: # sys.exit()
+        raise e
+    except Exception as e:
+        print ('ERROR: uncaught EXCEPTION. Msg after traceback.')
+        traceback.print_exc()    # stack dump (which prints err msg)
+        os._exit(ret_val_exception_raised)
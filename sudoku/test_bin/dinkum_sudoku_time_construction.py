@@ -3,19 +3,22 @@
 #path: sudoku/test-bin/
 #repo: http://github.com/dinkumsoftware/dinkum.git
 '''
-Times copy constructor for Board.
+Times copy constructor, clone(), and copy.deepcopy() of a Board.
 Prints results
 
 EXIT STATUS
     0  Normal
 '''
 
-import sys
+import sys, os, traceback
 import time
 from   dinkum.sudoku.board import *
 import dinkum.sudoku.test_data.test_puzzles
 
 # 2020-02-01 tc Initial
+# 2026-10-18 tc Added clone().  Restart the clock for each measurement
+
+ret_val_exception_raised = 3
 
 def main() :
     # How many to time
@@ -44,7 +47,23 @@ def main() :
     #       123456789.123456789.1234567
     print ("Board(bd_to_copy):         %0.0f microseconds" % execution_time_in_usecs)
 
+    # Get the execution time of board.clone()
+    start_time = time.process_time()
+    num_constructions = 0
+    while num_constructions < num_constructions_to_time :
+        num_constructions += 1
+        bd_to_copy.clone()
+    end_time = time.process_time()
+
+    # Compute the number of microsecondssecs per construction
+    execution_time_in_usecs = ((end_time-start_time) / num_constructions_to_time) * 1.0e6
+
+    # Report it in microseconds
+    #       123456789.123456789.1234567
+    print ("bd_to_copy.clone():        %0.0f microseconds" % execution_time_in_usecs)
+
     # Get the execution time of copy.deepcopy(board)
+    start_time = time.process_time()
     num_constructions = 0
     while num_constructions < num_constructions_to_time :
         num_constructions += 1
@@ -8,6 +8,7 @@ The class SolvedPuzzle will contain:
     constructed input Board
     answer Board
     string output of answer Board
+    rating of the input board, see dinkum.sudoku.rating
 
     all_known_puzzles is a [] of all puzzles in this module.
     Some may not have a solution recorded and/or aren't currently
@@ -21,8 +22,13 @@ The class SolvedPuzzle will contain:
 
     all_known_puzzles_names is a {} of all_known_puzzles.  Key:name Value:SolvedPuzzle
 
-    Performs a couple of sanity checks which trigger a
-    failed assertion on any errors.
+    The puzzles are read from known_puzzles.txt, which lives beside us.
+    See load_puzzles() for it's format.  No Boards are built until a
+    SolvedPuzzle's input_board or solution_board is first used, so
+    importing us only costs reading the file.
+
+load_puzzles(filename) returns [] of SolvedPuzzle from any file
+in that format.
 
 read/write_prior_stats() return (or write) a {} to/from a file
 which is keyed by puzzle_name and the value is last written sudoku.Stats
@@ -41,13 +47,17 @@ of that puzzle, regardless of whether the puzzle is solved or not
 # 2019-12-10 tc move import testing of solvability to unittests
 #               fixed bug in pre_solved and real_easy
 # 2019-12-16 tc Solved the saturday globe
+# 2026-10-18 tc kato_puzzle solved by search.  empty has multiple solutions
+# 2026-10-18 tc test_solvability() counts solutions of the unsolved
+# 2026-10-18 tc SolvedPuzzle.rating
+# 2026-10-18 tc Boards built lazily.  Puzzles read from known_puzzles.txt
 
-from copy                import deepcopy
 import pickle
 import os
 
 from dinkum.sudoku       import *
 from dinkum.sudoku.board import Board
+from dinkum.sudoku.rating import rate
 from dinkum.sudoku.stats import *
 
 class SolvedPuzzle :
@@ -56,7 +66,8 @@ class SolvedPuzzle :
     for input board.  The name for the solution_board is
     <input_name>-solution.
 
-    Constructs and remembers input_board and solution_board.
+    input_board and solution_board are constructed the first
+    time they are used, and remembered.
     '''
 
     def __init__(self, name, desc, input_spec, solution_spec) :
@@ -68,187 +79,101 @@ class SolvedPuzzle :
         solution_spec       ditto
 
         Keeps a copy of it's arguments, plus
-        input_board     Board(input_spec)
+        input_board     Board(input_spec), built on first use
         solution_name   Name of solution board
         solution_description Same description as input_board
-        solution_board  Board(solution_spec)
+        solution_board  Board(solution_spec), built on first use
+        rating          rate() of input_spec, worked out the
+                        first time it's asked for
         '''
 
         self.name          = name
         self.desc          = desc
         self.solution_name = name + "-solution"
 
-        self.input_spec = input_spec
-        self.input_board = Board(input_spec, name, desc)
-
-        self.solution_spec  = solution_spec
-        self.solution_board = Board(solution_spec,
-                                    self.solution_name, self.input_board.description )
-
+        self.input_spec    = input_spec
+        self.solution_spec = solution_spec
 
-# all_known_[un]solved_puzzles are lists of all puzzles that
-# are solved or unsolved.  They will be combined later to
-# form all_known_puzzles
-all_known_solved_puzzles = []
-all_known_unsolved_puzzles = []
+        # Built when first asked for
+        self._input_board    = None
+        self._solution_board = None
+        self._rating         = None
 
-# Each puzzle definition below must add the puzzle to
-# one of these lists
-
-# Define some puzzles        
-# *** empty
-empty_row  = [0]*RCB_SIZE
-input_spec = [ deepcopy(empty_row) for i in range(RCB_SIZE)]
-desc="No initial values, unsolvable"
-
-empty = SolvedPuzzle("empty", desc, input_spec, None)
-all_known_unsolved_puzzles.append(empty)
-
-
-
-# *** pre_solved
-desc= "All cells filled in initially"
-input_spec =   [[3, 4, 6, 1, 2, 7, 9, 5, 8], 
-                [7, 0, 5, 6, 9, 4, 1, 3, 2], 
-                [2, 1, 9, 3, 8, 5, 4, 6, 7], 
-                [4, 6, 2, 5, 3, 1, 8, 7, 9], 
-                [9, 3, 1, 2, 7, 8, 6, 4, 5], 
-                [8, 5, 7, 9, 4, 6, 2, 1, 3], 
-                [5, 9, 8, 4, 1, 3, 7, 2, 6],
-                [6, 2, 4, 7, 5, 9, 3, 8, 1],
-                [1, 7, 3, 8, 6, 2, 5, 9, 4]]
-
-solution_spec= [[3, 4, 6, 1, 2, 7, 9, 5, 8], 
-                [7, 8, 5, 6, 9, 4, 1, 3, 2], 
-                [2, 1, 9, 3, 8, 5, 4, 6, 7], 
-                [4, 6, 2, 5, 3, 1, 8, 7, 9], 
-                [9, 3, 1, 2, 7, 8, 6, 4, 5], 
-                [8, 5, 7, 9, 4, 6, 2, 1, 3], 
-                [5, 9, 8, 4, 1, 3, 7, 2, 6],
-                [6, 2, 4, 7, 5, 9, 3, 8, 1],
-                [1, 7, 3, 8, 6, 2, 5, 9, 4]]
-pre_solved = SolvedPuzzle("pre_solved", desc, input_spec, solution_spec)
-all_known_solved_puzzles.append(pre_solved)
-
-
-
-
-# *** real_easy
-desc="only one cell to solve"
-real_easy  =      [[0, 4, 6, 1, 2, 7, 9, 5, 8], 
-                   [7, 8, 5, 6, 9, 4, 1, 3, 2], 
-                   [2, 1, 9, 3, 0, 5, 4, 6, 7], 
-                   [4, 6, 2, 0, 3, 1, 8, 7, 9], 
-                   [9, 3, 0, 2, 7, 8, 6, 4, 5], 
-                   [8, 5, 7, 9, 4, 6, 2, 1, 3], 
-                   [5, 9, 8, 4, 0, 3, 7, 2, 6],
-                   [6, 2, 4, 7, 5, 9, 3, 8, 1],
-                   [1, 7, 3, 8, 6, 2, 5, 9, 4]]
-
-real_easy_ans = [[3, 4, 6, 1, 2, 7, 9, 5, 8],
-                 [7, 8, 5, 6, 9, 4, 1, 3, 2],
-                 [2, 1, 9, 3, 8, 5, 4, 6, 7],
-                 [4, 6, 2, 5, 3, 1, 8, 7, 9],
-                 [9, 3, 1, 2, 7, 8, 6, 4, 5],
-                 [8, 5, 7, 9, 4, 6, 2, 1, 3],
-                 [5, 9, 8, 4, 1, 3, 7, 2, 6],
-                 [6, 2, 4, 7, 5, 9, 3, 8, 1],
-                 [1, 7, 3, 8, 6, 2, 5, 9, 4]]
-real_easy = SolvedPuzzle("real_easy", desc, real_easy, real_easy_ans)
-all_known_solved_puzzles.append(real_easy)
-
-# ***
-name="globe_mon_2019_12_02"
-desc="Boston Globe mon, 2019-12-02, www.sudoku.com"
-puzzle_in  = '''
-001 605 400
-028 000 760
-000 080 000
-
-600 804 005
-072 000 940
-100 209 008
-
-000 050 000
-057 000 310
-009 106 200
-'''
+    @property
+    def input_board(self) :
+        ''' Board(input_spec).  The same Board every time, so
+        anything done to it, e.g. solve(), sticks.
+        '''
+        if self._input_board is None :
+            self._input_board = Board(self.input_spec, self.name, self.desc)
+        return self._input_board
+
+    @property
+    def solution_board(self) :
+        ''' Board(solution_spec).  The same Board every time. '''
+        if self._solution_board is None :
+            self._solution_board = Board(self.solution_spec, self.solution_name, self.desc)
+        return self._solution_board
+
+    @property
+    def rating(self) :
+        ''' dinkum.sudoku.rating.Rating of input_spec.
+        raises ExcUnsolvable if a strategy finds it has no solution.
+        '''
+        if self._rating is None :
+            # input_board may have been solved by now
+            self._rating = rate( Board(self.input_spec, self.name, self.desc) )
+        return self._rating
 
-puzzle_ans = '''
-731 695 482
-528 413 769
-964 782 531
 
-693 874 125
-872 561 943
-145 239 678
+def load_puzzles(filename) :
+    ''' Returns [] of SolvedPuzzle, one for every puzzle in filename.
+    Each line of the file is:
+        <name> <puzzle> <solution> <description to end of line>
+    puzzle and solution are a boards worth of values (e.g. 81) in raster
+    order, as Board() takes as a str, without whitespace.  A blank is
+    0 or .  A solution of - means none is recorded.  Blank lines and
+    lines starting with # are ignored.
 
-216 357 894
-457 928 316
-389 146 257
-'''
-puzzle = SolvedPuzzle(name, desc, puzzle_in, puzzle_ans)
-all_known_solved_puzzles.append(puzzle)
+    Only the lines are split, the puzzles aren't checked
+    until their Boards are built.
 
+    raises ExcBadPuzzleInput if a line is missing a field.
+    '''
+    puzzles = []
+    with open(filename) as puzzle_file :
+        for (line_num, line) in enumerate(puzzle_file, 1) :
+            line = line.strip()
+            if not line or line.startswith('#') :
+                continue
 
-# ***
-name="globe_sat_2019_11_02"
-desc="Boston Globe sat, 2019-11-02, www.sudoku.com"
-puzzle_in  = '''
-001 603 000
-900 047 010
-000 000 700
+            fields = line.split(None, 3)
+            if len(fields) < 3 :
+                raise ExcBadPuzzleInput( "%s:%d: Need <name> <puzzle> <solution> [description]" %
+                                         (filename, line_num) )
+            (name, input_str, solution_str) = fields[:3]
+            desc = fields[3] if len(fields) > 3 else ""
 
-390 025 600
-000 000 000
-004 360 059
+            puzzles.append( SolvedPuzzle(name, desc, input_str.replace('.', '0'),
+                                         None if solution_str == '-' else solution_str.replace('.', '0')) )
+    return puzzles
 
-003 000 000
-040 170 006
-000 206 500
-'''
 
-puzzle_ans = '''
-781 653 942
-962 847 315
-435 912 768
+def known_puzzles_filename() :
+    ''' returns the filename all_known_puzzles are read from '''
+    return os.path.join( os.path.dirname(__file__), "known_puzzles.txt" )
 
-398 425 671
-156 789 423
-274 361 859
 
-623 594 187
-549 178 236
-817 236 594
-'''
-puzzle = SolvedPuzzle(name, desc, puzzle_in, puzzle_ans)
-all_known_solved_puzzles.append(puzzle)
-
-
-# ***
-name="kato_puzzle"
-desc="Sample in https://www.codewars.com/kata/hard-sudoku-solver-1/train/python"
-puzzle_in = [[0, 0, 6, 1, 0, 0, 0, 0, 8], 
-             [0, 8, 0, 0, 9, 0, 0, 3, 0], 
-             [2, 0, 0, 0, 0, 5, 4, 0, 0], 
-             [4, 0, 0, 0, 0, 1, 8, 0, 0], 
-             [0, 3, 0, 0, 7, 0, 0, 4, 0], 
-             [0, 0, 7, 9, 0, 0, 0, 0, 3], 
-             [0, 0, 8, 4, 0, 0, 0, 0, 6], 
-             [0, 2, 0, 0, 5, 0, 0, 8, 0], 
-             [1, 0, 0, 0, 0, 2, 5, 0, 0]]
-
-puzzle_ans = [[3, 4, 6, 1, 2, 7, 9, 5, 8], 
-              [7, 8, 5, 6, 9, 4, 1, 3, 2], 
-              [2, 1, 9, 3, 8, 5, 4, 6, 7], 
-              [4, 6, 2, 5, 3, 1, 8, 7, 9], 
-              [9, 3, 1, 2, 7, 8, 6, 4, 5], 
-              [8, 5, 7, 9, 4, 6, 2, 1, 3], 
-              [5, 9, 8, 4, 1, 3, 7, 2, 6],
-              [6, 2, 4, 7, 5, 9, 3, 8, 1],
-              [1, 7, 3, 8, 6, 2, 5, 9, 4]]
-puzzle = SolvedPuzzle(name, desc, puzzle_in, puzzle_ans)
-all_known_unsolved_puzzles.append(puzzle) # Can't solve it yet
+# all_known_[un]solved_puzzles are lists of all puzzles that
+# are solved or unsolved, i.e. have no solution recorded.
+# They are combined to form all_known_puzzles
+all_known_solved_puzzles   = []
+all_known_unsolved_puzzles = []
+for sp in load_puzzles( known_puzzles_filename() ) :
+    if sp.solution_spec is not None :
+        all_known_solved_puzzles.append(sp)
+    else :
+        all_known_unsolved_puzzles.append(sp)
 
 # All the puzzles we know about
 all_known_puzzles = all_known_solved_puzzles + all_known_unsolved_puzzles
@@ -310,6 +235,8 @@ class Test_test_puzzles(unittest.TestCase) :
     def test_simple_construction(self) :
         name = "whatever"
         desc = "who knows?"
+        kato = all_known_puzzle_names["kato_puzzle"]
+        (input_spec, solution_spec) = (kato.input_spec, kato.solution_spec)
         sp = SolvedPuzzle(name, desc, input_spec, solution_spec) 
     
         self.assertEqual (name,             sp.name         )
@@ -321,6 +248,48 @@ class Test_test_puzzles(unittest.TestCase) :
         self.assertEqual (input_spec,     sp.input_spec     )
         self.assertEqual (solution_spec,  sp.solution_spec  )
 
+    def test_lazy(self) :
+        kato = all_known_puzzle_names["kato_puzzle"]
+        sp = SolvedPuzzle("lazy", "", kato.input_spec, kato.solution_spec)
+        self.assertIsNone( sp._input_board    )
+        self.assertIsNone( sp._solution_board )
+
+        # Built once, then remembered
+        self.assertIs( sp.input_board, sp.input_board )
+        self.assertIsNone( sp._solution_board )
+        self.assertEqual( sp.input_board.name, "lazy" )
+        self.assertTrue ( sp.solution_board.is_solved() )
+        self.assertEqual( sp.solution_board.name, "lazy-solution" )
+
+    def test_load_puzzles(self) :
+        import tempfile
+        with tempfile.NamedTemporaryFile("w", suffix=".txt") as puzzle_file :
+            puzzle_file.write( "# a comment\n\n" )
+            puzzle_file.write( "one %s %s The kato puzzle, again\n" %
+                               ( all_known_puzzle_names["kato_puzzle"].input_spec.replace('0', '.'),
+                                 all_known_puzzle_names["kato_puzzle"].solution_spec ) )
+            puzzle_file.write( "two %s -\n" % ("0" * NUM_CELLS) )
+            puzzle_file.flush()
+
+            (one, two) = load_puzzles(puzzle_file.name)
+            self.assertEqual( (one.name, one.desc), ("one", "The kato puzzle, again") )
+            self.assertEqual( one.input_board, all_known_puzzle_names["kato_puzzle"].input_board )
+            self.assertEqual( (two.name, two.desc, two.solution_spec), ("two", "", None) )
+
+            puzzle_file.write( "three %s\n" % ("0" * NUM_CELLS) )
+            puzzle_file.flush()
+            with self.assertRaises(ExcBadPuzzleInput) as context :
+                load_puzzles(puzzle_file.name)
+            self.assertIn( ":5:", context.exception.message )
+
+    def test_rating(self) :
+        for sp in all_known_puzzles :
+            self.assertIs( sp.rating, sp.rating )  # Only rated once
+            self.assertEqual( sp.rating.needs_guessing, sp.rating.category == "fiendish" )
+
+        self.assertEqual( all_known_puzzle_names["pre_solved"].rating.category, "easy"     )
+        self.assertEqual( all_known_puzzle_names["empty"     ].rating.category, "fiendish" )
+
     def test_all_known_puzzle_names(self) :
         # Make sure every puzzle is in the dictionary
         for sp in all_known_puzzles :
@@ -349,7 +318,21 @@ class Test_test_puzzles(unittest.TestCase) :
 
             # Verify we can't solvable the unsolvable
             for sp in all_known_unsolved_puzzles :
+                # No solution_spec means multiple solutions
+                num_solutions = Board(sp.input_spec).count_solutions()
+                self.assertEqual (num_solutions, 2 if sp.solution_spec is None else 0, sp.name)
+
                 our_solution = sp.input_board.solve()
+
+                # solve() returns the first solution it finds, so a puzzle
+                # with multiple solutions, i.e. no solution_spec, gets solved.
+                # Make sure it's legit
+                if our_solution and sp.solution_spec is None :
+                    self.assertTrue (sp.input_board.is_subset_of(our_solution))
+                    for rcb in our_solution.rcbs :
+                        self.assertEqual (rcb.solved_values(), set(range(1, RCB_SIZE+1)))
+                    continue
+
                 if our_solution :
                     # we just solved an unsolvable puzzle
                     # print out it's value so they can edit in the solution